@@ -1,6 +1,9 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = "dev-secret-key-change-me"
@@ -81,10 +84,11 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # CORS (dev)
 CORS_ALLOW_ALL_ORIGINS = True
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "support.auth.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -93,10 +97,32 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 20,
 }
 
-# Channels (dev)
+# Serve the hot ticket routes (list/detail, replies, seen, staff_reply) through async wrappers that
+# broadcast on the event loop (support/async_views.py). False: plain DRF views on the same URLs.
+SUPPORT_ASYNC_VIEWS = True
+
+# Ticket full-text search (support/search.py). Falls back to icontains when the FTS5 table is unavailable.
+SUPPORT_SEARCH_BACKEND = "support.search.SQLiteFTS5Backend"
+
+# Idempotency-Key replay window for ticket / reply POSTs (support/idempotency.py)
+SUPPORT_IDEMPOTENCY_TTL = timedelta(hours=24)
+
+# Token → user snapshots for REST and WebSocket auth (support/auth.py): an in-process LRU of
+# SUPPORT_AUTH_CACHE_SIZE entries kept SUPPORT_AUTH_CACHE_TTL seconds, and optionally a CACHES alias
+# shared by the workers. Saves and token deletes evict at once; other processes may lag by up to the TTL.
+SUPPORT_AUTH_CACHE_TTL = 30
+SUPPORT_AUTH_CACHE_SIZE = 10000
+SUPPORT_AUTH_SHARED_CACHE = None
+
+# Channels: a SQLite (WAL) file shared by every daphne process on the host, so a reply posted on one
+# worker reaches sockets on the others (support/channel_layer.py). channels.layers.InMemoryChannelLayer
+# works for a single process only.
 CHANNEL_LAYERS = {
     "default": {
-        "BACKEND": "channels.layers.InMemoryChannelLayer",
+        "BACKEND": "support.channel_layer.SQLiteChannelLayer",
+        "CONFIG": {
+            "path": os.environ.get("CHANNEL_LAYER_PATH", str(BASE_DIR / "channels.sqlite3")),
+        },
     }
 }
 
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from .models import AiLibraryItem, FAQ, FAQCategory, Profile, Ticket, TicketCategory, TicketReply, VocEntry
+from .search import get_search_backend
 
 
 @admin.register(FAQCategory)
@@ -27,9 +28,18 @@ class TicketCategoryAdmin(admin.ModelAdmin):
 class TicketAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "user", "category", "status", "created_at")
     list_filter = ("status", "category")
-    search_fields = ("title", "body", "user__email", "user__username")
+    # title/body go through the full-text index (support/search.py) instead of icontains scans.
+    search_fields = ("user__email", "user__username")
     ordering = ("-created_at",)
 
+    def get_search_results(self, request, queryset, search_term):
+        base = queryset
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            ids = [hit.ticket_id for hit in get_search_backend().search(search_term, 1000)]
+            queryset = queryset | base.filter(id__in=ids)
+        return queryset, may_have_duplicates
+
 
 @admin.register(TicketReply)
 class TicketReplyAdmin(admin.ModelAdmin):
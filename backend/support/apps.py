@@ -5,6 +5,9 @@ class SupportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "support"
 
+    def ready(self):
+        from . import signals  # noqa: F401
+
 
 
 
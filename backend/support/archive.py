@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import datetime
+import json
+import zlib
+from collections import defaultdict
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from . import duplicates, search
+from .models import (
+    AiLibraryItem,
+    ArchivedAttachment,
+    ArchivedTicket,
+    InboxCounter,
+    Ticket,
+    TicketAttachment,
+    TicketNote,
+    TicketReply,
+    TicketReplyAttachment,
+    TicketTagAssignment,
+    User,
+)
+
+# Archive tier for long-CLOSED tickets (`archive_tickets`).
+# One ArchivedTicket per ticket: the ticket row and every dependent row (replies, attachments,
+# reply attachments, notes, tag assignments) in Django's "python" serialization, JSON-encoded and
+# zlib-compressed. Attachment files stay in storage; ArchivedAttachment keeps their public URLs alive.
+# - rehydrate(): in-memory Ticket with its relations pre-populated, for read-only detail views
+# - restore(): puts the rows back into the hot tables (a user reply to an archived ticket)
+
+FORMAT_VERSION = 1
+# Insertion order for restore(): parents before children.
+_MODELS = [Ticket, TicketReply, TicketAttachment, TicketReplyAttachment, TicketNote, TicketTagAssignment]
+
+
+class _ArchiveEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder truncates to milliseconds; restored rows must keep their exact timestamps.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _encode(doc: dict) -> bytes:
+    raw = json.dumps(doc, cls=_ArchiveEncoder, ensure_ascii=False, separators=(",", ":"))
+    return zlib.compress(raw.encode("utf-8"), 9)
+
+
+def _decode(data) -> dict:
+    return json.loads(zlib.decompress(bytes(data)).decode("utf-8"))
+
+
+def archive_batch(ticket_ids) -> int:
+    """
+    Move the given tickets into ArchivedTicket in one transaction: a fixed number of reads for the
+    whole batch, bulk inserts, then one cascading delete (signals.py drops the tickets from the
+    change feed, inbox counters and search index). Returns the number archived.
+    """
+    with transaction.atomic():
+        tickets = list(Ticket.objects.filter(id__in=list(ticket_ids)).select_for_update())
+        if not tickets:
+            return 0
+        ids = [t.id for t in tickets]
+        rows = defaultdict(list)
+        for reply in TicketReply.objects.filter(ticket_id__in=ids):
+            rows[reply.ticket_id].append(reply)
+        for model in (TicketAttachment, TicketNote, TicketTagAssignment):
+            for obj in model.objects.filter(ticket_id__in=ids):
+                rows[obj.ticket_id].append(obj)
+        reply_attachments = defaultdict(list)
+        for att in TicketReplyAttachment.objects.filter(reply__ticket_id__in=ids).select_related("reply"):
+            reply_attachments[att.reply.ticket_id].append(att)
+        ai_items = defaultdict(list)
+        for item_id, tid in AiLibraryItem.objects.filter(ticket_id__in=ids).values_list("id", "ticket_id"):
+            ai_items[tid].append(item_id)
+
+        archived, files = [], []
+        for ticket in tickets:
+            objects = [ticket, *rows[ticket.id], *reply_attachments[ticket.id]]
+            doc = {
+                "v": FORMAT_VERSION,
+                "objects": serializers.serialize("python", objects),
+                # AiLibraryItem.ticket is SET_NULL: remember the links so restore() can put them back.
+                "ai_library_items": ai_items[ticket.id],
+            }
+            archived.append(
+                ArchivedTicket(
+                    ticket_id=ticket.id,
+                    user_id=ticket.user_id,
+                    title=ticket.title,
+                    closed_at=ticket.updated_at,
+                    data=_encode(doc),
+                )
+            )
+            for att in [o for o in objects if isinstance(o, (TicketAttachment, TicketReplyAttachment))]:
+                files.append(
+                    ArchivedAttachment(
+                        public_id=att.public_id,
+                        archived_ticket_id=ticket.id,
+                        file=att.file.name,
+                        original_name=att.original_name,
+                        content_type=att.content_type,
+                    )
+                )
+        ArchivedTicket.objects.bulk_create(archived)
+        ArchivedAttachment.objects.bulk_create(files)
+        Ticket.objects.filter(id__in=ids).delete()
+    return len(tickets)
+
+
+def _load(archived: ArchivedTicket) -> tuple[dict, list]:
+    doc = _decode(archived.data)
+    objects = [d.object for d in serializers.deserialize("python", doc["objects"], ignorenonexistent=True)]
+    return doc, objects
+
+
+def _prefetched(instance, name: str, objs: list):
+    """Populate instance.<name>.all() from memory, exactly as prefetch_related() would."""
+    qs = getattr(instance, name).all()
+    qs._result_cache = list(objs)
+    qs._prefetch_done = True
+    if not hasattr(instance, "_prefetched_objects_cache"):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[name] = qs
+
+
+def rehydrate(archived: ArchivedTicket, newest_first: bool = False) -> Ticket:
+    """
+    Unsaved Ticket rebuilt from the archive, with replies / attachments / notes / tag assignments
+    served from memory so TicketSerializer and AdminTicketSerializer work unchanged.
+    newest_first: order replies like _newest_replies_prefetch() (for ?replies_limit).
+    """
+    by_model = defaultdict(list)
+    for obj in _load(archived)[1]:
+        by_model[type(obj)].append(obj)
+    ticket = by_model[Ticket][0]
+
+    authors = User.objects.select_related("profile").in_bulk({r.author_id for r in by_model[TicketReply] if r.author_id})
+    reply_attachments = defaultdict(list)
+    for att in by_model[TicketReplyAttachment]:
+        reply_attachments[att.reply_id].append(att)
+    replies = sorted(by_model[TicketReply], key=lambda r: (r.created_at, r.id), reverse=newest_first)
+    for reply in replies:
+        reply.author = authors.get(reply.author_id)
+        _prefetched(reply, "attachments", reply_attachments[reply.id])
+
+    _prefetched(ticket, "replies", replies)
+    _prefetched(ticket, "attachments", by_model[TicketAttachment])
+    _prefetched(ticket, "notes", sorted(by_model[TicketNote], key=lambda n: (n.created_at, n.id)))
+    _prefetched(ticket, "tag_assignments", by_model[TicketTagAssignment])
+    return ticket
+
+
+def _drop_dangling(objects: list) -> list:
+    """
+    Rows whose FK targets disappeared while archived: nullable FKs (author, assignee, category, ...)
+    are cleared, rows with a required FK (e.g. a tag assignment to a deleted tag) are skipped.
+    """
+    present = defaultdict(set)
+    for obj in objects:
+        present[type(obj)].add(obj.pk)
+    wanted = defaultdict(set)
+    for obj in objects:
+        for f in obj._meta.concrete_fields:
+            value = getattr(obj, f.attname) if f.many_to_one else None
+            if value is not None and value not in present[f.related_model]:
+                wanted[f.related_model].add(value)
+    for model, pks in wanted.items():
+        present[model] |= set(model._default_manager.filter(pk__in=pks).values_list("pk", flat=True))
+
+    kept = []
+    for obj in objects:
+        keep = True
+        for f in obj._meta.concrete_fields:
+            value = getattr(obj, f.attname) if f.many_to_one else None
+            if value is None or value in present[f.related_model]:
+                continue
+            if f.null:
+                setattr(obj, f.attname, None)
+            else:
+                keep = False
+        if keep:
+            kept.append(obj)
+        else:
+            present[type(obj)].discard(obj.pk)
+    return kept
+
+
+def restore(archived: ArchivedTicket) -> Ticket:
+    """Move an archived ticket back into the hot tables (same ids) and return it."""
+    with transaction.atomic():
+        doc, objects = _load(archived)
+        objects = _drop_dangling(sorted(objects, key=lambda o: _MODELS.index(type(o))))
+        # Raw saves keep ids and timestamps; Ticket.save()'s bookkeeping is redone explicitly below.
+        for obj in objects:
+            obj.save_base(raw=True)
+        ticket = next(o for o in objects if isinstance(o, Ticket))
+
+        InboxCounter.move([], [ticket.inbox_state()])
+        search.index_ticket(ticket, created=True)
+        duplicates.fingerprint(ticket, created=True)
+        for obj in objects:
+            if isinstance(obj, TicketReply):
+                search.index_child("reply", obj, created=True)
+            elif isinstance(obj, TicketNote):
+                search.index_child("note", obj, created=True)
+        AiLibraryItem.objects.filter(id__in=doc.get("ai_library_items") or [], ticket__isnull=True).update(ticket=ticket)
+        archived.delete()
+    return Ticket.objects.get(id=ticket.id)
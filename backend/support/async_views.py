@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.urls import URLPattern
+
+# ASGI-native entry points for the hot ticket routes (settings.SUPPORT_ASYNC_VIEWS).
+# Under daphne a sync DRF view costs one thread hop for the view and another for response.render().
+# The wrappers run the unchanged viewset action (auth, ORM, serializer, render) in a single
+# thread-sensitive hop; its broadcasts are sent by realtime.py's dispatcher on the event loop.
+# Django 4.2's async ORM is no shortcut here: every a*() query is its own sync_to_async hop.
+
+ASYNC_ROUTES = frozenset(
+    {
+        "ticket-list",  # GET list, POST create
+        "ticket-detail",
+        "ticket-replies",
+        "ticket-seen",
+        "admin-ticket-staff-reply",
+    }
+)
+
+
+def _plain(response):
+    """Rendered DRF Response → HttpResponse, so the ASGI handler does not hop back to render it."""
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+def _run(view, request, args, kwargs):
+    response = view(request, *args, **kwargs)
+    if callable(getattr(response, "render", None)):
+        response = _plain(response.render())
+    return response
+
+
+def async_view(view):
+    """Async wrapper around a DRF view function (`ViewSet.as_view(...)`)."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        return await sync_to_async(_run)(view, request, args, kwargs)
+
+    # django's csrf_exempt() would wrap the coroutine in a sync function; DRF views are exempt anyway.
+    wrapper.csrf_exempt = True
+    wrapper.sync_view = view
+    return wrapper
+
+
+def asyncify(urlpatterns, enabled: bool = True) -> list:
+    """
+    urlpatterns with the ASYNC_ROUTES callbacks wrapped by async_view() (enabled=False unwraps them
+    again, e.g. to benchmark both variants side by side).
+    """
+    out = []
+    for p in urlpatterns:
+        if isinstance(p, URLPattern) and p.name in ASYNC_ROUTES:
+            view = getattr(p.callback, "sync_view", p.callback)
+            p = URLPattern(p.pattern, async_view(view) if enabled else view, p.default_args, p.name)
+        out.append(p)
+    return out
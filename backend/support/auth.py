@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+# Token → user for REST requests (CachedTokenAuthentication) and WebSocket connects (consumers.py).
+# A hit rebuilds a fresh User from a snapshot of its column values: no query, and no object shared
+# between requests. Snapshots stay in an in-process LRU for SUPPORT_AUTH_CACHE_TTL seconds and, with
+# SUPPORT_AUTH_SHARED_CACHE naming a Django cache, there too, so other workers start warm.
+# signals.py evicts a user's entry when their Token is deleted or their User row is saved; other
+# processes drop their in-process copy when it expires, so the TTL bounds how long they may lag.
+#
+# The snapshot leaves out the password hash (it may sit in a shared cache) and the Profile: views
+# read-modify-write request.user.profile, so it must come from the database, not from up to a TTL ago.
+# The restored User has password deferred, so save() writes only the loaded columns.
+
+User = get_user_model()
+
+
+_SNAPSHOT_EXCLUDE = {"password"}
+
+
+def _snapshot(token: Token) -> tuple:
+    user = token.user
+    fields = [f.attname for f in user._meta.concrete_fields if f.attname not in _SNAPSHOT_EXCLUDE]
+    return token.created, {name: getattr(user, name) for name in fields}
+
+
+def _restore(key: str, snapshot: tuple) -> tuple:
+    created, user_values = snapshot
+    user = User.from_db(User.objects.db, list(user_values), list(user_values.values()))
+    return user, Token(key=key, user=user, created=created)
+
+
+class _TokenCache:
+    """Token key → (user id, deadline, snapshot), least recently used first."""
+
+    def __init__(self):
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        self._keys_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every eviction: a snapshot read from the database before one is not stored.
+        self._generation = 0
+
+    @staticmethod
+    def _ttl() -> float:
+        return getattr(settings, "SUPPORT_AUTH_CACHE_TTL", 30)
+
+    @staticmethod
+    def _shared():
+        alias = getattr(settings, "SUPPORT_AUTH_SHARED_CACHE", None)
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _shared_key(key: str) -> str:
+        # Token keys are credentials; the shared cache only sees a digest.
+        return "support:auth:v2:" + hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    return entry[2]
+                self._drop(key)
+        shared = self._shared()
+        if shared is None:
+            return None
+        found = shared.get(self._shared_key(key))
+        if found is None:
+            return None
+        user_id, deadline, snapshot = found
+        self._remember(key, user_id, deadline, snapshot)
+        return snapshot
+
+    def load(self, key: str):
+        """Snapshot of the token's user from the database (None: no such token), remembered for the TTL."""
+        generation = self._generation
+        try:
+            token = Token.objects.select_related("user").get(key=key)
+        except Token.DoesNotExist:
+            return None
+        snapshot = _snapshot(token)
+        deadline = time.time() + self._ttl()
+        if generation == self._generation:
+            self._remember(key, token.user_id, deadline, snapshot)
+            shared = self._shared()
+            if shared is not None:
+                shared.set(self._shared_key(key), (token.user_id, deadline, snapshot), self._ttl())
+        return snapshot
+
+    def _remember(self, key: str, user_id: int, deadline: float, snapshot: tuple):
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (user_id, deadline, snapshot)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > getattr(settings, "SUPPORT_AUTH_CACHE_SIZE", 10000):
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[0])
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_user[entry[0]]
+
+    def evict(self, keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._drop(key)
+        shared = self._shared()
+        if shared is not None and keys:
+            shared.delete_many([self._shared_key(key) for key in keys])
+
+    def evict_user(self, user_id: int):
+        with self._lock:
+            keys = set(self._keys_by_user.get(user_id, ()))
+        if self._shared() is not None:
+            keys.update(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+        self.evict(keys)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+
+_cache = _TokenCache()
+
+
+def authenticate_token(key: str | None):
+    """(user, token) for a token key, or None. Only a cache miss queries (one Token+User join)."""
+    if not key:
+        return None
+    snapshot = _cache.get(key) or _cache.load(key)
+    return _restore(key, snapshot) if snapshot is not None else None
+
+
+def evict_token(key: str):
+    _cache.evict([key])
+
+
+def evict_user(user_id: int):
+    """
+    Drop the user's cached token now and again on commit, so a request that read the old row while the
+    writing transaction was open cannot leave it cached.
+    """
+    _cache.evict_user(user_id)
+    transaction.on_commit(lambda: _cache.evict_user(user_id))
+
+
+def clear():
+    _cache.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication answered from the token cache (settings.REST_FRAMEWORK)."""
+
+    def authenticate_credentials(self, key):
+        found = authenticate_token(key)
+        if found is None:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        user, token = found
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return user, token
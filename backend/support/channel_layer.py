@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+
+from channels.exceptions import ChannelFull
+from channels.layers import BaseChannelLayer
+
+# Channel layer shared by every daphne/runworker process on one host, through a SQLite file in WAL mode
+# (settings.CHANNEL_LAYERS). No broker process: senders INSERT, and each process runs one reader task per
+# inbox that moves its rows into in-memory queues. An inbox is the part of a channel name up to "!"
+# (new_channel() gives every process its own), so a process polls one index range, not one per socket.
+# Messages are stored as JSON, so they must be JSON-serializable (realtime.py's events are).
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channel_message (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    inbox TEXT NOT NULL,
+    expires REAL NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS channel_message_inbox ON channel_message (inbox, id);
+CREATE INDEX IF NOT EXISTS channel_message_channel ON channel_message (channel, expires);
+CREATE INDEX IF NOT EXISTS channel_message_expires ON channel_message (expires);
+CREATE TABLE IF NOT EXISTS channel_group (
+    group_name TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    inbox TEXT NOT NULL,
+    joined REAL NOT NULL,
+    PRIMARY KEY (group_name, channel)
+);
+CREATE INDEX IF NOT EXISTS channel_group_channel ON channel_group (channel);
+CREATE INDEX IF NOT EXISTS channel_group_joined ON channel_group (joined);
+"""
+
+
+class _LoopState:
+    """Per event loop: buffered messages by channel, pending receive() calls and reader tasks by inbox."""
+
+    def __init__(self):
+        self.queues: dict[str, asyncio.Queue] = {}
+        self.receivers: dict[str, int] = {}
+        self.readers: dict[str, asyncio.Task] = {}
+
+
+class SQLiteChannelLayer(BaseChannelLayer):
+    """
+    CONFIG: path (required), expiry=60, group_expiry=86400, capacity=100, channel_capacity=None,
+    poll_interval=0.02 (seconds an idle reader waits at most between checks), batch=100.
+    """
+
+    extensions = ["groups", "flush"]
+
+    HOUSEKEEPING_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path,
+        expiry=60,
+        group_expiry=86400,
+        capacity=100,
+        channel_capacity=None,
+        poll_interval=0.02,
+        batch=100,
+        **kwargs,
+    ):
+        super().__init__(expiry=expiry, capacity=capacity, channel_capacity=channel_capacity, **kwargs)
+        self.channel_capacity = self.compile_capacities(self.channel_capacity)
+        self.path = str(path)
+        self.group_expiry = group_expiry
+        self.poll_interval = poll_interval
+        self.batch = batch
+        self.client_prefix = uuid.uuid4().hex[:12]
+        self._local = threading.local()
+        self._states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._next_housekeeping = 0.0
+
+    # Storage (blocking; called through _db)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    async def _db(self, fn, *args):
+        return await asyncio.to_thread(fn, self._conn, *args)
+
+    def _housekeeping(self, conn, now: float):
+        if now < self._next_housekeeping:
+            return
+        self._next_housekeeping = now + self.HOUSEKEEPING_INTERVAL
+        with conn:
+            # Like InMemoryChannelLayer: a channel that let a message expire is gone from its groups.
+            conn.execute(
+                "DELETE FROM channel_group WHERE channel IN (SELECT channel FROM channel_message WHERE expires < ?)", (now,)
+            )
+            conn.execute("DELETE FROM channel_message WHERE expires < ?", (now,))
+            conn.execute("DELETE FROM channel_group WHERE joined < ?", (now - self.group_expiry,))
+
+    def _insert(self, get_conn, targets: list[tuple[str, str]], body: str, strict: bool):
+        """
+        Queue `body` on every (channel, inbox) in `targets` that is below capacity, in one write transaction.
+        strict: raise ChannelFull instead of skipping a full channel (send(); group_send() drops silently).
+        """
+        conn = get_conn()
+        now = time.time()
+        self._housekeeping(conn, now)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            channels = [channel for channel, _inbox in targets]
+            queued = dict(
+                conn.execute(
+                    f"SELECT channel, COUNT(*) FROM channel_message WHERE channel IN ({','.join('?' * len(channels))})"
+                    " AND expires >= ? GROUP BY channel",
+                    (*channels, now),
+                ).fetchall()
+            )
+            rows = []
+            for channel, inbox in targets:
+                if queued.get(channel, 0) >= self.get_capacity(channel):
+                    if strict:
+                        raise ChannelFull(channel)
+                    continue
+                rows.append((channel, inbox, now + self.expiry, body))
+            conn.executemany("INSERT INTO channel_message (channel, inbox, expires, body) VALUES (?, ?, ?, ?)", rows)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _take(self, get_conn, inbox: str) -> list[tuple[str, float, str]]:
+        """Remove and return up to `batch` queued (channel, expires, body) rows of `inbox`, oldest first."""
+        conn = get_conn()
+        # Read-only check first: under WAL it takes no lock, so idle readers never contend with writers.
+        if conn.execute("SELECT 1 FROM channel_message WHERE inbox = ? LIMIT 1", (inbox,)).fetchone() is None:
+            return []
+        with conn:
+            rows = conn.execute(
+                "DELETE FROM channel_message WHERE id IN "
+                "(SELECT id FROM channel_message WHERE inbox = ? ORDER BY id LIMIT ?) RETURNING id, channel, expires, body",
+                (inbox, self.batch),
+            ).fetchall()
+        return [row[1:] for row in sorted(rows)]
+
+    # Channel layer API
+
+    async def send(self, channel, message):
+        assert isinstance(message, dict), "message is not a dict"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+        assert "__asgi_channel__" not in message
+        await self._db(self._insert, [(channel, self.non_local_name(channel))], json.dumps(message), True)
+
+    async def receive(self, channel):
+        """
+        Next message on `channel`. Waiting receive() calls on the same inbox share one reader task that
+        polls the table (backing off to poll_interval while idle) and hands rows out by channel.
+        """
+        assert self.valid_channel_name(channel)
+        state = self._state()
+        inbox = self.non_local_name(channel)
+        queue = state.queues.setdefault(channel, asyncio.Queue())
+        state.receivers[inbox] = state.receivers.get(inbox, 0) + 1
+        reader = state.readers.get(inbox)
+        if reader is None or reader.done():
+            state.readers[inbox] = asyncio.ensure_future(self._read(state, inbox))
+        try:
+            while True:
+                expires, message = await queue.get()
+                if expires >= time.time():
+                    return message
+        finally:
+            state.receivers[inbox] -= 1
+            if queue.empty() and state.queues.get(channel) is queue:
+                del state.queues[channel]
+
+    async def _read(self, state: _LoopState, inbox: str):
+        delay = 0.001
+        while state.receivers.get(inbox):
+            rows = await self._db(self._take, inbox)
+            for channel, expires, body in rows:
+                state.queues.setdefault(channel, asyncio.Queue()).put_nowait((expires, json.loads(body)))
+            if rows:
+                delay = 0.001
+                continue
+            self._drop_expired(state)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.poll_interval)
+        state.readers.pop(inbox, None)
+
+    @staticmethod
+    def _drop_expired(state: _LoopState):
+        """Buffers of channels nobody receives on any more (closed sockets) empty out as messages expire."""
+        now = time.time()
+        for channel, queue in list(state.queues.items()):
+            while not queue.empty() and queue._queue[0][0] < now:
+                queue.get_nowait()
+            if queue.empty() and not queue._getters:
+                del state.queues[channel]
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = self._states[loop] = _LoopState()
+        return state
+
+    async def new_channel(self, prefix="specific."):
+        return f"{prefix}{self.client_prefix}!{uuid.uuid4().hex}"
+
+    # Groups extension
+
+    async def group_add(self, group, channel):
+        assert self.valid_group_name(group), "Group name not valid"
+        assert self.valid_channel_name(channel), "Channel name not valid"
+
+        def add(get_conn):
+            with get_conn() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO channel_group (group_name, channel, inbox, joined) VALUES (?, ?, ?, ?)",
+                    (group, channel, self.non_local_name(channel), time.time()),
+                )
+
+        await self._db(add)
+
+    async def group_discard(self, group, channel):
+        assert self.valid_channel_name(channel), "Invalid channel name"
+        assert self.valid_group_name(group), "Invalid group name"
+
+        def discard(get_conn):
+            with get_conn() as conn:
+                conn.execute("DELETE FROM channel_group WHERE group_name = ? AND channel = ?", (group, channel))
+
+        await self._db(discard)
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        assert self.valid_group_name(group), "Invalid group name"
+        body = json.dumps(message)
+
+        def send(get_conn):
+            targets = get_conn().execute(
+                "SELECT channel, inbox FROM channel_group WHERE group_name = ? AND joined >= ?",
+                (group, time.time() - self.group_expiry),
+            ).fetchall()
+            if targets:
+                self._insert(get_conn, targets, body, False)
+
+        await self._db(send)
+
+    # Flush extension
+
+    async def flush(self):
+        def flush(get_conn):
+            with get_conn() as conn:
+                conn.execute("DELETE FROM channel_message")
+                conn.execute("DELETE FROM channel_group")
+
+        await self._db(flush)
+        self._states = weakref.WeakKeyDictionary()
+
+    async def close(self):
+        pass
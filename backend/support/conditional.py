@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils.cache import patch_vary_headers
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import TicketChangeLog
+
+# Conditional GET for the polled ticket endpoints (TicketDetailPage every 5s, admin inbox every 8s).
+# Validators come from TicketChangeLog, which gets a row for every ticket / reply / note / tag /
+# attachment write (signals.py and the bulk actions): one indexed query decides between
+# `304 Not Modified` and running the queryset + serializer.
+
+
+def _latest_seq_per_ticket():
+    return Subquery(TicketChangeLog.objects.filter(ticket_id=OuterRef("pk")).order_by("-seq").values("seq")[:1])
+
+
+def ticket_validator(tickets, pk):
+    """(updated_at, latest change seq) for one ticket in `tickets`, or None if it is not there."""
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    return tickets.filter(pk=pk).annotate(seq=_latest_seq_per_ticket()).values_list("updated_at", "seq").first()
+
+
+def tickets_validator(tickets):
+    """Aggregate validator for a small ticket set (a user's own tickets)."""
+    row = tickets.order_by().annotate(seq=_latest_seq_per_ticket()).aggregate(
+        n=Count("id"), updated=Max("updated_at"), seq=Max("seq")
+    )
+    return row["n"], row["updated"], row["seq"]
+
+
+def inbox_validator():
+    """Any inbox change moves the global change-log head."""
+    return TicketChangeLog.objects.order_by("-seq").values_list("seq", flat=True).first()
+
+
+def make_etag(request, *parts) -> str:
+    """Weak ETag over the validator, the caller and the full path (page, filters and view params change the body)."""
+    raw = "|".join(str(p) for p in (request.user.pk, request.get_full_path(), *parts))
+    return 'W/"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def not_modified(request, etag: str):
+    """304 response if If-None-Match matches `etag`, else None."""
+    header = request.META.get("HTTP_IF_NONE_MATCH") or ""
+    tags = [t.strip() for t in header.split(",") if t.strip()]
+    if "*" in tags or etag in tags or etag[2:] in tags:
+        return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return None
+
+
+def with_etag(response, etag: str):
+    response["ETag"] = etag
+    # Browsers revalidate on every poll (If-None-Match) instead of reusing the body blindly.
+    response["Cache-Control"] = "private, no-cache"
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+def conditional(request, validator, render):
+    """
+    Shared flow: `validator` None → plain render(); otherwise 304 on a match, or render() with the ETag.
+    The validator is read before rendering, so a concurrent write can only cause an extra 200, never a stale 304.
+    """
+    if validator is None:
+        return render()
+    etag = make_etag(request, validator)
+    return not_modified(request, etag) or with_etag(render(), etag)
+
@@ -1,55 +1,161 @@
 from __future__ import annotations
 
+import asyncio
 from urllib.parse import parse_qs
 
 from asgiref.sync import sync_to_async
+from channels.consumer import get_handler_name
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from django.contrib.auth.models import AnonymousUser
-from rest_framework.authtoken.models import Token
-
-from .models import Profile, Ticket
+from . import auth
+from .models import RealtimeEvent, Ticket
+from .serializers import _profile_of
 
 
 @sync_to_async
 def _get_user_from_token(token_key: str | None):
-    if not token_key:
-        return AnonymousUser()
-    try:
-        return Token.objects.select_related("user").get(key=token_key).user
-    except Token.DoesNotExist:
+    # Same token cache as the REST API: a reconnect with a known token does not query.
+    found = auth.authenticate_token(token_key)
+    if found is None or not found[0].is_active:
         return AnonymousUser()
+    return found[0]
 
 
 @sync_to_async
 def _ticket_allowed(ticket_id: int, user):
+    if not getattr(user, "is_authenticated", False):
+        return None
     try:
-        t = Ticket.objects.select_related("user").get(id=ticket_id)
+        t = Ticket.objects.only("id", "user_id").get(id=ticket_id)
     except Ticket.DoesNotExist:
         return None
-    if not getattr(user, "is_authenticated", False):
-        return None
     if user.is_staff or user.is_superuser:
         return t
     return t if t.user_id == user.id else None
 
 
+@sync_to_async
+def _unread_summary(user_id: int):
+    return Ticket.unread_summary(user_id)
+
+
 @sync_to_async
 def _author_payload(user):
     if not getattr(user, "is_authenticated", False):
         return {"id": None, "name": "익명", "avatar_url": "", "is_staff": False}
-    Profile.objects.get_or_create(user=user)
-    p = user.profile
+    p = _profile_of(user)
     name = (p.display_name or user.get_full_name() or getattr(user, "email", "") or user.get_username()).strip() or "사용자"
     return {"id": user.id, "name": name, "avatar_url": p.avatar_url or "", "is_staff": bool(getattr(user, "is_staff", False))}
 
 
-class TicketChatConsumer(AsyncJsonWebsocketConsumer):
+@sync_to_async
+def _replay_events(stream: str, last_seq: int, limit: int):
+    return RealtimeEvent.replay(stream, last_seq, limit)
+
+
+class _ReplayMixin:
+    """
+    `?last_seq=<seq>` on connect: the stream's RealtimeEvent outbox entries after it are sent before live
+    events, or {"type": "resync"} when they are no longer all retained (the client refetches instead).
+    Outgoing events carry their `seq`; live copies of events already replayed are dropped.
+    """
+
+    REPLAY_LIMIT = 200
+    replayed = frozenset()
+
+    async def replay(self, stream: str, query: dict):
+        raw = (query.get("last_seq") or [""])[0]
+        if not raw.isdigit():
+            return
+        events = await _replay_events(stream, int(raw), self.REPLAY_LIMIT)
+        if events is None:
+            await self.send_json({"type": "resync"})
+            return
+        self.replayed = set()
+        for event in events:
+            await getattr(self, get_handler_name(event))(event)
+            self.replayed.add(event["seq"])
+
+    def is_replayed(self, event) -> bool:
+        return event.get("seq") in self.replayed
+
+
+class _TypingPresence:
+    """
+    Typing state of one user on one ticket, shared by that user's sockets in this process: the room sees
+    "any of them typing", and at most one change per TicketChatConsumer.TYPING_INTERVAL.
+    """
+
+    def __init__(self, key, channel_layer, group_name: str, ticket_id: int, author: dict):
+        self.key = key
+        self.channel_layer = channel_layer
+        self.group_name = group_name
+        self.ticket_id = ticket_id
+        self.author = author
+        self.sockets = set()  # channel names of the user's open sockets
+        self.typing = set()  # ... of those currently typing
+        self.sent = False
+        self.sent_at = float("-inf")
+        self.flush = None
+
+    def set(self, channel_name: str, is_typing: bool):
+        if is_typing:
+            self.typing.add(channel_name)
+        else:
+            self.typing.discard(channel_name)
+        if self.flush is None and bool(self.typing) != self.sent:
+            delay = max(0.0, self.sent_at + TicketChatConsumer.TYPING_INTERVAL - asyncio.get_running_loop().time())
+            self.flush = asyncio.ensure_future(self._flush(delay))
+
+    async def leave(self, channel_name: str):
+        self.sockets.discard(channel_name)
+        if self.sockets:
+            self.set(channel_name, False)
+            return
+        _typing_presences.pop(self.key, None)
+        if self.flush:
+            self.flush.cancel()
+        if self.sent:
+            await self._send(False)
+
+    async def _flush(self, delay: float):
+        if delay:
+            await asyncio.sleep(delay)
+        self.flush = None
+        # Changes made while waiting collapse into the latest state; true→false→true sends nothing.
+        if bool(self.typing) != self.sent:
+            await self._send(bool(self.typing))
+
+    async def _send(self, is_typing: bool):
+        self.sent = is_typing
+        self.sent_at = asyncio.get_running_loop().time()
+        await self.channel_layer.group_send(
+            self.group_name,
+            {"type": "ticket.typing", "ticket_id": self.ticket_id, "author": self.author, "is_typing": is_typing},
+        )
+
+
+_typing_presences: dict[tuple, _TypingPresence] = {}
+
+
+class TicketChatConsumer(_ReplayMixin, AsyncJsonWebsocketConsumer):
     """
-    WebSocket room per ticket: ws://.../ws/tickets/<ticket_id>/?token=<DRF Token>
+    WebSocket room per ticket: ws://.../ws/tickets/<ticket_id>/?token=<DRF Token>[&last_seq=<seq>]
     - staff: can join any ticket
-    - user: can join only their own ticket
+    - user: can join only their own ticket; also gets `unread` summaries for all of their tickets
+    - last_seq: replay the reply/seen events missed since then (see _ReplayMixin)
+    - typing: coalesced per (user, ticket) across the user's sockets in this process (_TypingPresence);
+      at most one state change per TYPING_INTERVAL is fanned out, and a socket stops counting as typing
+      TYPING_TIMEOUT seconds after its last `typing: true` or when it disconnects
     """
 
+    TYPING_INTERVAL = 1.0
+    TYPING_TIMEOUT = 5.0
+
+    author = None  # _author_payload(user), computed once at connect
+    _typing = None  # this user's _TypingPresence on the ticket
+    _typing_expiry = None
+
     async def connect(self):
         self.ticket_id = int(self.scope["url_route"]["kwargs"]["ticket_id"])
         qs = parse_qs((self.scope.get("query_string") or b"").decode("utf-8"))
@@ -61,15 +167,36 @@ class TicketChatConsumer(AsyncJsonWebsocketConsumer):
             await self.close(code=4401)
             return
 
+        self.author = await _author_payload(self.user)
         self.group_name = f"ticket_{self.ticket_id}"
         await self.channel_layer.group_add(self.group_name, self.channel_name)
+        # Owner only: staff open tickets of many users.
+        self.user_group_name = f"user_{self.user.id}" if ticket.user_id == self.user.id else None
+        if self.user_group_name:
+            await self.channel_layer.group_add(self.user_group_name, self.channel_name)
+        key = (self.user.id, self.ticket_id)
+        self._typing = _typing_presences.get(key)
+        if self._typing is None:
+            self._typing = _typing_presences[key] = _TypingPresence(
+                key, self.channel_layer, self.group_name, self.ticket_id, self.author
+            )
+        self._typing.sockets.add(self.channel_name)
         await self.accept()
 
         await self.send_json({"type": "hello", "ticket_id": self.ticket_id})
+        if self.user_group_name:
+            await self.send_json({"type": "unread", **await _unread_summary(self.user.id)})
+        await self.replay(self.group_name, qs)
 
     async def disconnect(self, code):
+        if self._typing_expiry:
+            self._typing_expiry.cancel()
         try:
+            if self._typing:
+                await self._typing.leave(self.channel_name)
             await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            if self.user_group_name:
+                await self.channel_layer.group_discard(self.user_group_name, self.channel_name)
         except Exception:
             return
 
@@ -80,22 +207,24 @@ class TicketChatConsumer(AsyncJsonWebsocketConsumer):
             await self.send_json({"type": "pong"})
             return
         if t == "typing":
-            is_typing = bool(content.get("is_typing"))
-            author = await _author_payload(self.user)
-            await self.channel_layer.group_send(
-                self.group_name,
-                {
-                    "type": "ticket.typing",
-                    "ticket_id": self.ticket_id,
-                    "author": author,
-                    "is_typing": is_typing,
-                },
-            )
+            self._want_typing(bool(content.get("is_typing")))
             return
 
+    def _want_typing(self, is_typing: bool):
+        if self._typing_expiry:
+            self._typing_expiry.cancel()
+        self._typing_expiry = (
+            asyncio.get_running_loop().call_later(self.TYPING_TIMEOUT, self._want_typing, False) if is_typing else None
+        )
+        self._typing.set(self.channel_name, is_typing)
+
     async def ticket_reply(self, event):
-        # event: {type: "ticket.reply", reply: {...}, ticket_id: int}
-        await self.send_json({"type": "reply", "ticket_id": event.get("ticket_id"), "reply": event.get("reply")})
+        # event: {type: "ticket.reply", reply: {...}, ticket_id: int, seq: int}
+        if self.is_replayed(event):
+            return
+        await self.send_json(
+            {"type": "reply", "ticket_id": event.get("ticket_id"), "reply": event.get("reply"), "seq": event.get("seq")}
+        )
 
     async def ticket_typing(self, event):
         await self.send_json(
@@ -108,13 +237,21 @@ class TicketChatConsumer(AsyncJsonWebsocketConsumer):
         )
 
     async def ticket_seen(self, event):
-        # event: {type: "ticket.seen", payload: {...}, ticket_id: int}
-        await self.send_json({"type": "seen", "ticket_id": event.get("ticket_id"), **(event.get("payload") or {})})
+        # event: {type: "ticket.seen", payload: {...}, ticket_id: int, seq: int}
+        if self.is_replayed(event):
+            return
+        await self.send_json(
+            {"type": "seen", "ticket_id": event.get("ticket_id"), **(event.get("payload") or {}), "seq": event.get("seq")}
+        )
+
+    async def user_unread(self, event):
+        # event: {type: "user.unread", count: int, ticket_ids: [...]}
+        await self.send_json({"type": "unread", "count": event.get("count", 0), "ticket_ids": event.get("ticket_ids") or []})
 
 
-class AdminInboxConsumer(AsyncJsonWebsocketConsumer):
+class AdminInboxConsumer(_ReplayMixin, AsyncJsonWebsocketConsumer):
     """
-    WebSocket room for staff to monitor all tickets: ws://.../ws/admin/inbox/?token=<DRF Token>
+    WebSocket room for staff to monitor all tickets: ws://.../ws/admin/inbox/?token=<DRF Token>[&last_seq=<seq>]
     """
 
     async def connect(self):
@@ -129,6 +266,7 @@ class AdminInboxConsumer(AsyncJsonWebsocketConsumer):
         self.group_name = "admin_inbox"
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        await self.replay(self.group_name, qs)
 
     async def disconnect(self, code):
         try:
@@ -137,11 +275,23 @@ class AdminInboxConsumer(AsyncJsonWebsocketConsumer):
             pass
 
     async def inbox_ticket_created(self, event):
-        # event: {type: "inbox.ticket_created", ticket: {...}}
-        await self.send_json({"type": "ticket_created", "ticket": event.get("ticket")})
+        # event: {type: "inbox.ticket_created", ticket: {...}, seq: int}
+        if self.is_replayed(event):
+            return
+        await self.send_json({"type": "ticket_created", "ticket": event.get("ticket"), "seq": event.get("seq")})
 
     async def inbox_ticket_updated(self, event):
-        # event: {type: "inbox.ticket_updated", ticket_id: int, delta: {...}}
-        await self.send_json({"type": "ticket_updated", "ticket_id": event.get("ticket_id"), "delta": event.get("delta")})
+        # event: {type: "inbox.ticket_updated", ticket_id: int, delta: {...}, seq: int}
+        if self.is_replayed(event):
+            return
+        await self.send_json(
+            {"type": "ticket_updated", "ticket_id": event.get("ticket_id"), "delta": event.get("delta"), "seq": event.get("seq")}
+        )
+
+    async def inbox_tickets_updated(self, event):
+        # event: {type: "inbox.tickets_updated", updates: [{ticket_id, delta}, ...], seq: int} (bulk actions)
+        if self.is_replayed(event):
+            return
+        await self.send_json({"type": "tickets_updated", "updates": event.get("updates") or [], "seq": event.get("seq")})
 
 
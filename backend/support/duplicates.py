@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from datetime import timedelta
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .search import ngram_terms
+
+# Near-duplicate tickets (`/admin/tickets/<id>/duplicates/`).
+# Each ticket body gets a 64-bit SimHash over its search terms (words, CJK bigrams; see search.py),
+# stored in TicketFingerprint together with BANDS 16-bit slices in indexed columns. Two hashes at most
+# MAX_DISTANCE (= BANDS - 1) bits apart agree on at least one whole band, so candidates come from
+# BANDS index lookups instead of a scan; the exact Hamming distance is checked in Python.
+# Rows are kept current by signals.py; `manage.py rebuild_ticket_fingerprints` recomputes them all
+# (after deploying 0047, or after changing anything that affects simhash()).
+
+BITS = 64
+BANDS = 4
+BAND_BITS = BITS // BANDS
+MAX_DISTANCE = BANDS - 1
+MIN_TERMS = 4  # shorter bodies ("환불해주세요") look alike by construction and are not fingerprinted
+MAX_CHARS = 4000  # fingerprint the opening of long bodies only, so intake cost stays bounded
+CANDIDATES = 200
+
+_MASK = (1 << BITS) - 1
+_BAND_MASK = (1 << BAND_BITS) - 1
+
+
+# Bit-sliced accumulator: hash bit b becomes a _LANE-bit counter lane inside one big int, so a term
+# costs 8 table lookups and one big-int add instead of 64 Python-level bit tests.
+_LANE = 32
+_SPREAD = [[sum(1 << ((8 * k + i) * _LANE) for i in range(8) if byte >> i & 1) for byte in range(256)] for k in range(8)]
+_LANE_MASK = (1 << _LANE) - 1
+
+
+def simhash(text: str) -> int | None:
+    """Unsigned 64-bit SimHash of `text` weighted by term frequency, or None below MIN_TERMS terms."""
+    terms = Counter(term.lower() for term in ngram_terms((text or "")[:MAX_CHARS]))
+    total = sum(terms.values())
+    if total < MIN_TERMS:
+        return None
+    acc = 0
+    for term, weight in terms.items():
+        digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+        acc += weight * sum(_SPREAD[k][byte] for k, byte in enumerate(digest))
+    value = 0
+    for bit in range(BITS):
+        # Bit set when the terms having it outweigh the ones that do not.
+        if 2 * (acc >> (bit * _LANE) & _LANE_MASK) > total:
+            value |= 1 << bit
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK).count("1")
+
+
+def bands(value: int) -> list[int]:
+    return [(value >> (i * BAND_BITS)) & _BAND_MASK for i in range(BANDS)]
+
+
+def _signed(value: int) -> int:
+    """BigIntegerField is signed 64-bit."""
+    return value - (1 << BITS) if value >= 1 << (BITS - 1) else value
+
+
+def fingerprint_fields(value: int) -> dict:
+    return {"simhash": _signed(value), **{f"band{i}": b for i, b in enumerate(bands(value))}}
+
+
+def fingerprint(ticket, created: bool = False) -> None:
+    """(Re)store the ticket's fingerprint; called from signals.py inside the writing transaction."""
+    from .models import TicketFingerprint
+
+    value = simhash(ticket.body)
+    if value is None:
+        if not created:
+            TicketFingerprint.objects.filter(ticket_id=ticket.id).delete()
+        return
+    fields = {"user_id": ticket.user_id, "created_at": ticket.created_at, **fingerprint_fields(value)}
+    if created:
+        TicketFingerprint.objects.create(ticket_id=ticket.id, **fields)
+    else:
+        TicketFingerprint.objects.update_or_create(ticket_id=ticket.id, defaults=fields)
+
+
+def rebuild() -> int:
+    """Recompute every TicketFingerprint from the ticket bodies; returns the number stored."""
+    from .models import Ticket, TicketFingerprint
+
+    total, batch = 0, []
+    TicketFingerprint.objects.all().delete()
+    rows = Ticket.objects.order_by().values_list("id", "user_id", "body", "created_at").iterator(chunk_size=2000)
+    for tid, user_id, body, created_at in rows:
+        value = simhash(body)
+        if value is not None:
+            batch.append(TicketFingerprint(ticket_id=tid, user_id=user_id, created_at=created_at, **fingerprint_fields(value)))
+        if len(batch) >= 1000:
+            total += len(TicketFingerprint.objects.bulk_create(batch))
+            batch = []
+    if batch:
+        total += len(TicketFingerprint.objects.bulk_create(batch))
+    return total
+
+
+def find_duplicates(ticket, days: int, same_user: bool = False, max_distance: int = MAX_DISTANCE) -> list[tuple[int, int]]:
+    """
+    [(ticket_id, distance)] of tickets created within `days` of `ticket` whose body is at most
+    `max_distance` bits away, closest first.
+    """
+    from .models import TicketFingerprint
+
+    value = simhash(ticket.body)
+    if value is None:
+        return []
+    window = timedelta(days=days)
+    qs = TicketFingerprint.objects.filter(
+        reduce(or_, (Q(**{f"band{i}": b}) for i, b in enumerate(bands(value)))),
+        created_at__gte=ticket.created_at - window,
+        created_at__lte=ticket.created_at + window,
+    ).exclude(ticket_id=ticket.id)
+    if same_user:
+        qs = qs.filter(user_id=ticket.user_id)
+    hits = []
+    for ticket_id, other in qs.values_list("ticket_id", "simhash")[:CANDIDATES]:
+        distance = hamming(value, other)
+        if distance <= max_distance:
+            hits.append((distance, -ticket_id))
+    return [(-neg_id, distance) for distance, neg_id in sorted(hits)]
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+# `Idempotency-Key` support for retried POSTs (mobile clients on flaky networks).
+# - first request: claims (user, key) in its own committed transaction, runs the view, stores the response
+# - duplicate after completion: the stored response is replayed (Idempotent-Replayed: true)
+# - duplicate while the first is still running: 409 + Retry-After (the unique constraint decides the winner)
+# - same key, different endpoint or payload: 422
+# 5xx responses and exceptions release the key so the client can retry for real.
+
+HEADER = "HTTP_IDEMPOTENCY_KEY"
+MAX_KEY_LENGTH = 255
+# A claim still unanswered after this long belongs to a crashed worker and may be taken over.
+STALE_CLAIM = timedelta(minutes=2)
+
+
+def ttl() -> timedelta:
+    return getattr(settings, "SUPPORT_IDEMPOTENCY_TTL", timedelta(hours=24))
+
+
+def _fingerprint(request) -> str:
+    data = request.data
+    items = data.lists() if hasattr(data, "lists") else ((k, [v]) for k, v in dict(data).items())
+    normalized = {
+        key: [f"file:{v.name}:{v.size}" if isinstance(v, UploadedFile) else v for v in values]
+        for key, values in items
+    }
+    raw = json.dumps(normalized, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _claim(user, key: str, scope: str, fingerprint: str):
+    """(record, True) if this request owns the key, else (existing record, False)."""
+    for _attempt in range(2):
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(user=user, key=key, scope=scope, fingerprint=fingerprint), True
+        except IntegrityError:
+            existing = IdempotencyKey.objects.filter(user=user, key=key).first()
+            if existing is None:
+                continue  # released between our INSERT and SELECT
+            now = timezone.now()
+            expired = existing.created_at <= now - ttl()
+            abandoned = existing.status_code is None and existing.created_at <= now - STALE_CLAIM
+            if not (expired or abandoned):
+                return existing, False
+            # Compare-and-delete: only one of several concurrent retries gets to take it over.
+            IdempotencyKey.objects.filter(pk=existing.pk, created_at=existing.created_at).delete()
+    return IdempotencyKey.objects.get(user=user, key=key), False
+
+
+def _replay(record: IdempotencyKey, scope: str, fingerprint: str) -> Response:
+    if record.scope != scope or record.fingerprint != fingerprint:
+        return Response(
+            {"detail": "Idempotency-Key was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if record.status_code is None:
+        return Response(
+            {"detail": "A request with this Idempotency-Key is still being processed."},
+            status=status.HTTP_409_CONFLICT,
+            headers={"Retry-After": "1"},
+        )
+    return Response(record.response_data, status=record.status_code, headers={"Idempotent-Replayed": "true"})
+
+
+def idempotent(view_method):
+    """Decorator for POST view methods / actions; requests without the header are untouched."""
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = (request.META.get(HEADER) or "").strip()
+        if not key or request.method != "POST" or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response({"Idempotency-Key": "Too long"}, status=status.HTTP_400_BAD_REQUEST)
+
+        scope = f"{request.method} {request.path}"
+        fingerprint = _fingerprint(request)
+        record, owner = _claim(request.user, key, scope, fingerprint)
+        if not owner:
+            return _replay(record, scope, fingerprint)
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500 or not isinstance(response, Response):
+            record.delete()
+            return response
+        record.status_code = response.status_code
+        record.response_data = response.data
+        record.save(update_fields=["status_code", "response_data"])
+        return response
+
+    return wrapper
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from channels.layers import get_channel_layer
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .models import Ticket, TicketReply
+from .serializers import TicketReplySerializer
+
+# Long-poll fallback for TicketChatConsumer: GET /api/tickets/<id>/wait/?after_reply_id=&timeout=25
+# The request joins the same channel-layer group as the WebSocket (`ticket_<id>`) and returns on the
+# first reply / seen event, or with no events when the timeout runs out. Events have the same shape
+# as the WebSocket messages, so clients reuse their onmessage handler.
+
+DEFAULT_TIMEOUT = 25
+MAX_TIMEOUT = 30
+_EVENT_TYPES = {"ticket.reply", "ticket.seen"}
+
+
+def _timeout(raw) -> float:
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return DEFAULT_TIMEOUT
+    return min(max(value, 0.0), MAX_TIMEOUT)
+
+
+@sync_to_async
+def _authorize(request, pk: int):
+    """(user, ticket, error response) using the REST API's authentication classes."""
+    drf_request = Request(request, authenticators=[cls() for cls in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        user = drf_request.user
+    except APIException as exc:
+        return None, None, JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    if not getattr(user, "is_authenticated", False):
+        return None, None, JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    tickets = Ticket.objects.all() if user.is_staff else Ticket.objects.filter(user=user)
+    ticket = tickets.filter(pk=pk).only("id").first()
+    if ticket is None:
+        return None, None, JsonResponse({"detail": "Not found."}, status=404)
+    return user, ticket, None
+
+
+@sync_to_async
+def _replies_after(request, ticket: Ticket, user, after_id: int) -> list[dict]:
+    """Replies the client missed between its last fetch and joining the group."""
+    qs = (
+        TicketReply.objects.filter(ticket=ticket, id__gt=after_id)
+        .select_related("author__profile")
+        .prefetch_related("attachments")
+        .order_by("created_at", "id")
+    )
+    if not user.is_staff:
+        qs = qs.filter(is_internal=False)
+    data = TicketReplySerializer(qs, many=True, context={"request": request}).data
+    return [{"type": "reply", "ticket_id": ticket.id, "reply": r} for r in data]
+
+
+def _client_event(event: dict, user) -> dict | None:
+    """Channel-layer event → WebSocket-shaped message (None: not for this client)."""
+    if event.get("type") == "ticket.reply":
+        reply = event.get("reply") or {}
+        if reply.get("is_internal") and not user.is_staff:
+            return None
+        return {"type": "reply", "ticket_id": event.get("ticket_id"), "reply": reply}
+    return {"type": "seen", "ticket_id": event.get("ticket_id"), **(event.get("payload") or {})}
+
+
+async def ticket_wait(request, pk: int):
+    """
+    Hold the request until the ticket gets a reply / seen event.
+    - after_reply_id: newest reply id the client has; newer ones are returned at once
+    - timeout: seconds to wait (default 25, max 30); `{"events": []}` when nothing happened
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    user, ticket, error = await _authorize(request, pk)
+    if error is not None:
+        return error
+    layer = get_channel_layer()
+    if layer is None:
+        return JsonResponse({"detail": "Realtime is not configured."}, status=503)
+
+    after = request.GET.get("after_reply_id") or ""
+    if after and not after.isdigit():
+        return JsonResponse({"after_reply_id": "Invalid reply id"}, status=400)
+    deadline = time.monotonic() + _timeout(request.GET.get("timeout"))
+
+    group = f"ticket_{ticket.id}"
+    channel = await layer.new_channel()
+    # Join before the catch-up read: a reply committed in between is then either read or received.
+    await layer.group_add(group, channel)
+    try:
+        events = await _replies_after(request, ticket, user, int(after)) if after else []
+        while not events:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event = await asyncio.wait_for(layer.receive(channel), remaining)
+            except asyncio.TimeoutError:
+                break
+            if event.get("type") in _EVENT_TYPES:
+                message = _client_event(event, user)
+                if message is not None:
+                    events.append(message)
+    finally:
+        await layer.group_discard(group, channel)
+    return JsonResponse({"events": events})
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from support.archive import archive_batch
+from support.models import ArchivedTicket, Ticket, VocEntry
+
+
+class Command(BaseCommand):
+    help = "Move CLOSED tickets untouched for N days into compressed archive storage (ArchivedTicket)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=180, help="Archive tickets closed more than N days ago (default: 180)")
+        parser.add_argument("--batch-size", type=int, default=200, help="Tickets per transaction (default: 200)")
+        parser.add_argument("--limit", type=int, default=0, help="Stop after N tickets (0 = no limit)")
+        parser.add_argument("--dry-run", action="store_true", help="Only count eligible tickets")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        # Tickets referenced by VOC entries stay hot: VOC analytics join on the live ticket rows.
+        eligible = (
+            Ticket.objects.filter(status="CLOSED", updated_at__lt=cutoff)
+            .exclude(Exists(VocEntry.objects.filter(ticket=OuterRef("pk"))))
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if options["dry_run"]:
+            self.stdout.write(f"{eligible.count()} tickets would be archived (closed before {cutoff:%Y-%m-%d}).")
+            return
+
+        total, last_id = 0, 0
+        batch_size = max(1, options["batch_size"])
+        while not options["limit"] or total < options["limit"]:
+            size = batch_size if not options["limit"] else min(batch_size, options["limit"] - total)
+            ids = list(eligible.filter(id__gt=last_id)[:size])
+            if not ids:
+                break
+            last_id = ids[-1]
+            total += archive_batch(ids)
+            self.stdout.write(f"  archived {total} tickets (up to #{last_id})")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {total} tickets; {ArchivedTicket.objects.count()} in archive storage.")
+        )
@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from support.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Create the missing Profile row for every user (one-shot; new users get one from the post_save hook)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        missing = User.objects.filter(profile__isnull=True).values_list("id", flat=True)
+        created = 0
+        batch = []
+        for user_id in missing.iterator():
+            batch.append(Profile(user_id=user_id))
+            if len(batch) >= options["batch_size"]:
+                created += len(Profile.objects.bulk_create(batch, ignore_conflicts=True))
+                batch = []
+        if batch:
+            created += len(Profile.objects.bulk_create(batch, ignore_conflicts=True))
+        self.stdout.write(self.style.SUCCESS(f"Created {created} missing profiles."))
@@ -0,0 +1,140 @@
+import asyncio
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, override_settings
+from django.urls import include, path
+from channels.layers import get_channel_layer
+from rest_framework.authtoken.models import Token
+
+from support import urls as support_urls
+from support.async_views import asyncify
+from support.models import Ticket, TicketCategory, TicketReply
+
+User = get_user_model()
+
+# (label, method, path, actor, payload)
+ENDPOINTS = [
+    ("my tickets", "get", "/api/tickets/", "user", None),
+    ("my ticket detail", "get", "/api/tickets/{ticket}/", "user", None),
+    ("user seen", "post", "/api/tickets/{ticket}/seen/", "user", None),
+    ("user reply", "post", "/api/tickets/{ticket}/replies/", "user", {"body": "bench"}),
+    ("staff reply", "post", "/api/admin/tickets/{ticket}/staff_reply/", "staff", {"body": "bench"}),
+]
+MODES = ("sync", "async")
+
+
+class Command(BaseCommand):
+    help = (
+        "Requests/second of the hot ticket routes as plain DRF views vs the async wrappers "
+        "(support/async_views.py), through Django's ASGI handler in-process. Uses throwaway bench-* users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100, help="Timed requests per endpoint, mode and round (default: 100)")
+        parser.add_argument("--rounds", type=int, default=3, help="Alternating sync/async rounds; medians are reported (default: 3)")
+        parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight (default: 20)")
+        parser.add_argument("--replies", type=int, default=30, help="Seeded replies on the benchmarked ticket (default: 30)")
+        parser.add_argument(
+            "--send-latency",
+            type=float,
+            default=0.0,
+            help="Simulated channel-layer round trip per group_send in ms, e.g. 1-2 for a network broker (default: 0)",
+        )
+
+    def handle(self, *args, **options):
+        staff = User.objects.create_user(username="bench-staff@joody.local", email="bench-staff@joody.local", is_staff=True)
+        category = TicketCategory.objects.create(name="bench")
+        created = [staff]
+        try:
+            ctx = {}
+            for mode in MODES:
+                # An owner and ticket per mode, so both modes read tickets that grew by the same replies.
+                owner = User.objects.create_user(username=f"bench-{mode}@joody.local", email=f"bench-{mode}@joody.local")
+                created.append(owner)
+                ticket = Ticket.objects.create(user=owner, category=category, title="bench", body="bench body")
+                TicketReply.objects.bulk_create(
+                    [TicketReply(ticket=ticket, author=(staff if i % 2 else owner), body=f"reply {i}") for i in range(options["replies"])]
+                )
+                Ticket.objects.filter(id=ticket.id).update(**Ticket.conversation_counter_expressions())
+                ctx[mode] = {
+                    "ticket": ticket.id,
+                    "headers": {
+                        "user": {"authorization": f"Token {Token.objects.create(user=owner).key}"},
+                        "staff": {"authorization": f"Token {Token.objects.get_or_create(user=staff)[0].key}"},
+                    },
+                }
+            results = asyncio.run(self._run_all(ctx, options))
+        finally:
+            Ticket.objects.filter(user__in=created).delete()
+            User.objects.filter(id__in=[u.id for u in created]).delete()
+            category.delete()
+
+        self.stdout.write(f"{'endpoint':<20}{'sync req/s':>12}{'async req/s':>13}{'speedup':>9}")
+        for label, *_rest in ENDPOINTS:
+            sync_rps, async_rps = results[label]["sync"], results[label]["async"]
+            self.stdout.write(f"{label:<20}{sync_rps:>12.1f}{async_rps:>13.1f}{async_rps / sync_rps:>8.2f}x")
+        self.stdout.write(
+            f"(median of {options['rounds']} rounds x {options['requests']} requests, concurrency {options['concurrency']}, "
+            f"send latency {options['send_latency']:g} ms)"
+        )
+
+    async def _run_all(self, ctx, options):
+        layer = get_channel_layer()
+        listeners = []
+        if layer is not None:
+            # One subscriber per group, like an open WebSocket, so group_send has somewhere to deliver.
+            for group in ["admin_inbox", *(f"ticket_{c['ticket']}" for c in ctx.values())]:
+                channel = await layer.new_channel()
+                await layer.group_add(group, channel)
+                listeners.append((group, channel))
+            if options["send_latency"] > 0:
+                layer.group_send = self._delayed(layer.group_send, options["send_latency"] / 1000)
+
+        samples = {label: {mode: [] for mode in MODES} for label, *_rest in ENDPOINTS}
+        try:
+            # Modes alternate round by round so drift (page cache, WAL growth) hits both alike.
+            for _round in range(max(1, options["rounds"])):
+                for mode in MODES:
+                    # ROOT_URLCONF may be any object with `urlpatterns` (a class: resolvers are cached by it).
+                    patterns = asyncify(support_urls.urlpatterns, enabled=(mode == "async"))
+                    urlconf = type(f"{mode.title()}URLConf", (), {"urlpatterns": [path("api/", include(patterns))]})
+                    with override_settings(ROOT_URLCONF=urlconf):
+                        for label, method, url, actor, payload in ENDPOINTS:
+                            url = url.format(ticket=ctx[mode]["ticket"])
+                            headers = ctx[mode]["headers"][actor]
+                            await self._measure(method, url, headers, payload, min(10, options["requests"]), options["concurrency"])
+                            samples[label][mode].append(
+                                await self._measure(method, url, headers, payload, options["requests"], options["concurrency"])
+                            )
+        finally:
+            if layer is not None:
+                layer.__dict__.pop("group_send", None)
+                for group, channel in listeners:
+                    await layer.group_discard(group, channel)
+        return {label: {mode: statistics.median(runs) for mode, runs in by_mode.items()} for label, by_mode in samples.items()}
+
+    @staticmethod
+    def _delayed(group_send, seconds):
+        async def delayed(group, message):
+            await asyncio.sleep(seconds)
+            await group_send(group, message)
+
+        return delayed
+
+    @staticmethod
+    async def _measure(method, url, headers, payload, n, concurrency) -> float:
+        client = AsyncClient()
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with gate:
+                resp = await getattr(client, method)(url, payload or {}, headers=headers)
+                if resp.status_code >= 400:
+                    raise RuntimeError(f"{method.upper()} {url} -> {resp.status_code}: {resp.content[:200]!r}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n)))
+        return n / (time.perf_counter() - started)
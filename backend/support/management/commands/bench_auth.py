@@ -0,0 +1,73 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from support import auth
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request cost of token authentication: DRF TokenAuthentication vs support.auth."
+        "CachedTokenAuthentication cold (miss), from the shared cache only, and warm. Uses a throwaway bench-auth user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000, help="Timed authentications per mode and round (default: 2000)")
+        parser.add_argument("--rounds", type=int, default=5, help="Rounds; medians are reported (default: 5)")
+        parser.add_argument("--shared-cache", default="default", help="CACHES alias for the shared mode (default: default)")
+
+    def handle(self, *args, **options):
+        user = User.objects.create_user(username="bench-auth@joody.local", email="bench-auth@joody.local")
+        try:
+            token = Token.objects.create(user=user).key
+            request = RequestFactory().get("/api/me/", HTTP_AUTHORIZATION=f"Token {token}")
+            drf, cached = TokenAuthentication(), auth.CachedTokenAuthentication()
+
+            def shared_only():
+                auth._cache.clear()  # in-process LRU only; the shared entry stays
+                return cached.authenticate(request)
+
+            def cold():
+                auth.clear()
+                return cached.authenticate(request)
+
+            modes = [
+                ("TokenAuthentication", None, lambda: drf.authenticate(request)),
+                ("cached, miss", None, cold),
+                (f"cached, shared hit ({options['shared_cache']})", options["shared_cache"], shared_only),
+                ("cached, warm", None, lambda: cached.authenticate(request)),
+            ]
+            rows = []
+            for label, shared, fn in modes:
+                # DEBUG off: the timed loops should not pay for Django's query log.
+                with override_settings(SUPPORT_AUTH_SHARED_CACHE=shared, DEBUG=False):
+                    auth.clear()
+                    fn()
+                    reset_queries()
+                    with CaptureQueriesContext(connection) as ctx:
+                        fn()
+                    per_round = []
+                    for _ in range(options["rounds"]):
+                        started = time.perf_counter()
+                        for _ in range(options["requests"]):
+                            fn()
+                        per_round.append((time.perf_counter() - started) / options["requests"] * 1e6)
+                rows.append((label, len(ctx), statistics.median(per_round)))
+        finally:
+            auth.clear()
+            user.delete()
+
+        self.stdout.write(f"{'mode':<36}{'queries':>8}{'us/request':>12}")
+        for label, queries, us in rows:
+            self.stdout.write(f"{label:<36}{queries:>8}{us:>12.1f}")
+        baseline = rows[0][2]
+        self.stdout.write(f"warm cache: {baseline / rows[-1][2]:.1f}x faster than TokenAuthentication per request")
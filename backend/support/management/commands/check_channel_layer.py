@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from support.models import Ticket, TicketCategory
+from support import realtime
+from support.ws_urls import websocket_urlpatterns
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Cross-process check of CHANNEL_LAYERS: a TicketChatConsumer socket in this process must receive "
+        "broadcast_ticket_reply() calls made by a separate process. Uses a throwaway layer-check user."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=20, help="Replies broadcast by the other process (default: 20)")
+        parser.add_argument("--timeout", type=float, default=10.0, help="Seconds to wait for delivery (default: 10)")
+        # Internal: run as the sending process.
+        parser.add_argument("--send-to-ticket", type=int, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["send_to_ticket"]:
+            for i in range(options["messages"]):
+                realtime.broadcast_ticket_reply(
+                    options["send_to_ticket"], {"id": -1 - i, "body": "layer check", "pid": os.getpid(), "sent_at": time.time()}
+                )
+            realtime.flush()
+            return
+
+        layer = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+        owner = User.objects.create_user(username="layer-check@joody.local", email="layer-check@joody.local")
+        category = TicketCategory.objects.create(name="layer-check")
+        try:
+            ticket = Ticket.objects.create(user=owner, category=category, title="layer check", body="layer check")
+            token = Token.objects.create(user=owner).key
+            received, sender_pid = asyncio.run(self._check(ticket.id, token, options))
+        finally:
+            Ticket.objects.filter(user=owner).delete()
+            owner.delete()
+            category.delete()
+
+        self.stdout.write(f"layer: {layer}")
+        self.stdout.write(f"receiver pid {os.getpid()}, sender pid {sender_pid}")
+        self.stdout.write(f"delivered {len(received)}/{options['messages']} replies")
+        if received:
+            latencies = sorted(received)
+            self.stdout.write(f"latency ms: median {statistics.median(latencies):.1f}, max {latencies[-1]:.1f}")
+        if len(received) < options["messages"]:
+            raise CommandError("Replies broadcast by another process did not all reach this process's socket.")
+        self.stdout.write(self.style.SUCCESS("Cross-process delivery works."))
+
+    async def _check(self, ticket_id, token, options):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/tickets/{ticket_id}/?token={token}")
+        connected, _code = await communicator.connect()
+        if not connected:
+            raise CommandError("The ticket socket was refused.")
+        received, sender_pid, timed_out = [], None, False
+        try:
+            # `python -m django` from BASE_DIR: same settings module, same PYTHONPATH, a separate interpreter.
+            child = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "django",
+                "check_channel_layer",
+                f"--send-to-ticket={ticket_id}",
+                f"--messages={options['messages']}",
+                cwd=settings.BASE_DIR,
+            )
+            sender_pid = child.pid
+            deadline = time.monotonic() + options["timeout"]
+            while len(received) < options["messages"]:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = await communicator.receive_json_from(timeout=remaining)
+                except asyncio.TimeoutError:
+                    timed_out = True
+                    break
+                reply = event.get("reply") or {}
+                if event.get("type") == "reply" and reply.get("pid") == sender_pid:
+                    received.append((time.time() - reply["sent_at"]) * 1000)
+            if await child.wait() != 0:
+                raise CommandError("The sending process failed.")
+        finally:
+            if not timed_out:  # a receive timeout has already stopped the consumer
+                await communicator.disconnect()
+        return received, sender_pid
@@ -0,0 +1,195 @@
+import os
+import traceback
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from support.models import (
+    FAQ,
+    AiLibraryItem,
+    AppSettings,
+    FAQCategory,
+    Ticket,
+    TicketCategory,
+    TicketNote,
+    TicketReply,
+    TicketTag,
+    VocEntry,
+)
+
+User = get_user_model()
+
+# (label, method, path, actor, payload, budget)
+# - path may contain {ticket} / {faq} / {customer}; actor is "user" (ticket owner) or "staff"
+# - budget: max queries per request, auth included (a token cache hit after warm-up: support/auth.py);
+#   it must also stay flat across seed sizes
+# - every persisted broadcast (support/realtime.py) adds one RealtimeEvent INSERT
+ENDPOINTS = [
+    ("faq categories", "get", "/api/faq-categories/", "user", None, 1),
+    ("faq list", "get", "/api/faqs/", "user", None, 2),
+    ("faq detail", "get", "/api/faqs/{faq}/", "user", None, 2),
+    ("ticket categories", "get", "/api/ticket-categories/", "user", None, 1),
+    ("settings", "get", "/api/settings/", "user", None, 1),
+    ("my tickets", "get", "/api/tickets/", "user", None, 8),
+    ("my ticket detail", "get", "/api/tickets/{ticket}/", "user", None, 7),
+    ("my ticket newest page", "get", "/api/tickets/{ticket}/?replies_limit=50", "user", None, 5),
+    ("my reply timeline", "get", "/api/tickets/{ticket}/replies/?limit=50", "user", None, 3),
+    ("my unread", "get", "/api/tickets/unread/", "user", None, 1),
+    ("me", "get", "/api/me/", "user", None, 1),
+    ("user reply", "post", "/api/tickets/{ticket}/replies/", "user", {"body": "budget"}, 13),
+    ("user seen", "post", "/api/tickets/{ticket}/seen/", "user", None, 4),
+    ("admin inbox rows", "get", "/api/admin/tickets/", "staff", None, 3),
+    ("admin inbox cursor", "get", "/api/admin/tickets/?cursor=", "staff", None, 2),
+    ("admin inbox counts", "get", "/api/admin/tickets/counts/", "staff", None, 1),
+    ("admin inbox search", "get", "/api/admin/tickets/search/?q=budget", "staff", None, 2),
+    ("admin inbox changes", "get", "/api/admin/tickets/changes/?since=0", "staff", None, 4),
+    ("admin ticket detail", "get", "/api/admin/tickets/{ticket}/", "staff", None, 9),
+    ("admin duplicates", "get", "/api/admin/tickets/{ticket}/duplicates/", "staff", None, 3),
+    ("admin reply timeline", "get", "/api/admin/tickets/{ticket}/replies/?limit=50", "staff", None, 3),
+    ("admin notes", "get", "/api/admin/tickets/{ticket}/notes/", "staff", None, 3),
+    ("admin staff reply", "post", "/api/admin/tickets/{ticket}/staff_reply/", "staff", {"body": "budget"}, 16),
+    ("admin set status", "patch", "/api/admin/tickets/{ticket}/set_status/", "staff", {"status": "ANSWERED"}, 12),
+    ("admin ticket categories", "get", "/api/admin/ticket-categories/", "staff", None, 1),
+    ("admin ticket tags", "get", "/api/admin/ticket-tags/", "staff", None, 1),
+    ("admin agents", "get", "/api/admin/agents/", "staff", None, 1),
+    ("admin faq categories", "get", "/api/admin/faq-categories/", "staff", None, 1),
+    ("admin faqs", "get", "/api/admin/faqs/", "staff", None, 2),
+    ("admin customers", "get", "/api/admin/customers/", "staff", None, 1),
+    ("admin customer detail", "get", "/api/admin/customers/{customer}/", "staff", None, 3),
+    ("admin ai library", "get", "/api/admin/ai-library/", "staff", None, 1),
+    ("admin voc", "get", "/api/admin/voc/", "staff", None, 1),
+    ("admin voc dashboard", "get", "/api/admin/voc/dashboard/", "staff", None, 10),
+    ("admin settings", "get", "/api/admin/settings/", "staff", None, 1),
+    ("admin analytics", "get", "/api/admin/analytics/", "staff", None, 11),
+    ("admin me", "get", "/api/admin/me/", "staff", None, 1),
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _QuerySources:
+    """execute_wrapper that attributes each query to the innermost support/ function on the stack."""
+
+    def __init__(self):
+        self.sources = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.sources[self._source()] += 1
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def _source() -> str:
+        for frame in reversed(traceback.extract_stack()[:-3]):
+            path = frame.filename.replace("\\", "/")
+            if "/support/" in path and "/management/" not in path:
+                return f"{os.path.basename(path)[:-3]}.{frame.name}"
+        return "(framework)"
+
+
+class Command(BaseCommand):
+    help = "Seed 1/10/200 tickets in a rolled-back transaction and assert a flat query budget for every API endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="1,10,200", help="Comma-separated ticket counts (default: 1,10,200)")
+        parser.add_argument(
+            "--replies", type=int, default=20, help="Max replies per ticket; scales with size so reply N+1s show (default: 20)"
+        )
+        parser.add_argument("--only", default="", help="Only endpoints whose label contains this text")
+
+    def handle(self, *args, **options):
+        sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        endpoints = [e for e in ENDPOINTS if options["only"] in e[0]]
+        counts = {e[0]: {} for e in endpoints}
+        sources = {}
+
+        for size in sizes:
+            try:
+                with transaction.atomic():
+                    ctx = self._seed(size, max(2, min(size, options["replies"])))
+                    for label, method, path, actor, payload, _budget in endpoints:
+                        n, src = self._measure(ctx, method, path, actor, payload)
+                        counts[label][size] = n
+                        sources[label] = src
+                    raise _Rollback()
+            except _Rollback:
+                pass
+
+        failures = []
+        header = f"{'endpoint':<26}" + "".join(f"{f'@{s}':>7}" for s in sizes) + f"{'budget':>8}  status"
+        self.stdout.write(header)
+        for label, _method, _path, _actor, _payload, budget in endpoints:
+            row = counts[label]
+            worst = max(row.values())
+            flat = len(set(row.values())) == 1
+            ok = flat and worst <= budget
+            status = "ok" if ok else ("GROWS" if not flat else "OVER")
+            line = f"{label:<26}" + "".join(f"{row[s]:>7}" for s in sizes) + f"{budget:>8}  {status}"
+            self.stdout.write(line if ok else self.style.ERROR(line))
+            if not ok:
+                failures.append(label)
+                for source, n in sources[label].most_common(5):
+                    self.stdout.write(f"    {n:>5}  {source}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoints exceed or grow past their query budget.")
+        self.stdout.write(self.style.SUCCESS("All endpoints are within a flat query budget."))
+
+    def _measure(self, ctx, method, path, actor, payload):
+        client = ctx["clients"][actor]
+        url = path.format(ticket=ctx["ticket"].id, faq=ctx["faq"].id, customer=ctx["owner"].id)
+        call = getattr(client, method)
+        # Warm-up: first-touch caches (content types, lazily created rows) are not what we budget.
+        call(url, payload, format="multipart")
+        tracer = _QuerySources()
+        with connection.execute_wrapper(tracer), CaptureQueriesContext(connection) as captured:
+            resp = call(url, payload, format="multipart")
+        if resp.status_code >= 400:
+            raise CommandError(f"{method.upper()} {url} -> {resp.status_code}: {getattr(resp, 'data', '')}")
+        return len(captured.captured_queries), tracer.sources
+
+    def _seed(self, size: int, replies_per_ticket: int) -> dict:
+        staff = User.objects.create_user(username="budget-staff@joody.local", email="budget-staff@joody.local", is_staff=True)
+        owners = [
+            User.objects.create_user(username=f"budget-{i}@joody.local", email=f"budget-{i}@joody.local", first_name=f"u{i}")
+            for i in range(size)
+        ]
+        category = TicketCategory.objects.create(name="budget")
+        faq_cat = FAQCategory.objects.create(name="budget")
+        faq = FAQ.objects.create(category=faq_cat, title="budget", body="budget")
+        # A tag tree that deepens and widens with `size`: the tree endpoint must not pay per level or per tag.
+        tag = None
+        for i in range(min(size, TicketTag.MAX_DEPTH - 1)):
+            tag = TicketTag.objects.create(name=f"budget-tag-{i}", parent=tag)
+        for i in range(size):
+            TicketTag.objects.create(name=f"budget-leaf-{i}", parent=tag)
+        AppSettings.objects.create(key="budget", value="1")
+
+        tickets = [
+            Ticket.objects.create(user=owner, category=category, title=f"budget {i}", body="budget body", assignee=staff)
+            for i, owner in enumerate(owners)
+        ]
+        TicketReply.objects.bulk_create(
+            [
+                TicketReply(ticket=t, author=(staff if r % 2 else t.user), body=f"reply {r}")
+                for t in tickets
+                for r in range(replies_per_ticket)
+            ]
+        )
+        Ticket.objects.filter(id__in=[t.id for t in tickets]).update(**Ticket.conversation_counter_expressions())
+        TicketNote.objects.bulk_create([TicketNote(ticket=t, author=staff, body="note") for t in tickets])
+        VocEntry.objects.bulk_create([VocEntry(ticket=t, voc_type="BUG", keywords=["budget"]) for t in tickets])
+        AiLibraryItem.objects.bulk_create([AiLibraryItem(ticket=t, created_by=staff, title="budget") for t in tickets])
+
+        clients = {}
+        for actor, u in [("staff", staff), ("user", owners[0])]:
+            c = APIClient()
+            c.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=u).key}")
+            clients[actor] = c
+        return {"clients": clients, "ticket": tickets[0], "faq": faq, "owner": owners[0]}
@@ -0,0 +1,88 @@
+import re
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from support.models import FAQView, RealtimeEvent, Ticket, TicketChangeLog, TicketFingerprint, TicketReply, TicketTag, TicketTagAssignment, VocEntry
+
+# "SCAN support_ticket" (or "SCAN TABLE support_ticket" on older SQLite) without "USING ... INDEX"
+# means SQLite walks every row of the table.
+_FULL_SCAN = re.compile(r"\bSCAN (?:TABLE )?(support_\w+)(?!.*\bUSING\b)")
+
+
+def hot_queries():
+    """Hot ORM queries from views.py; each must be answerable from an index."""
+    now = timezone.now()
+    day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return [
+        ("TicketViewSet.list (my tickets)", Ticket.objects.filter(user_id=1).order_by("-created_at")[:10]),
+        ("inbox by status", Ticket.objects.filter(status="PENDING").order_by("-updated_at")[:20]),
+        ("inbox by assignee", Ticket.objects.filter(assignee_id=1, status="PENDING")[:20]),
+        (
+            "inbox keyset page",
+            Ticket.objects.filter(Q(updated_at__lt=now) | Q(updated_at=now, id__lt=100)).order_by("-updated_at", "-id")[:21],
+        ),
+        ("inbox updated_since", Ticket.objects.filter(updated_at__gte=now - timedelta(hours=1)).order_by("-updated_at")[:20]),
+        (
+            "inbox by tag",
+            Ticket.objects.filter(
+                id__in=TicketTagAssignment.objects.filter(tag__in=TicketTag.subtree([TicketTag(path="/1/")]).values("id")).values(
+                    "ticket_id"
+                )
+            ).order_by("-updated_at")[:20],
+        ),
+        ("tag by name", TicketTag.matching(["vip"])),
+        ("my unread tickets", Ticket.objects.filter(Ticket.unread_q(), user_id=1).order_by("-last_staff_reply_at")),
+        ("customer last ticket", Ticket.objects.filter(user_id=1).order_by("-created_at").values("created_at")[:1]),
+        ("ticket timeline", TicketReply.objects.filter(ticket_id=1).order_by("created_at")),
+        ("ticket replies by author", TicketReply.objects.filter(ticket_id=1, author_id=1).order_by("-created_at")[:1]),
+        (
+            "FAQ track_view dedup (user)",
+            FAQView.objects.filter(user_id=1, faq_id=1, viewed_at__gte=day, viewed_at__lt=day + timedelta(days=1)),
+        ),
+        ("FAQ track_view dedup (session)", FAQView.objects.filter(faq_id=1, viewed_at__gte=day, session_id="s")),
+        (
+            "VOC dashboard by type",
+            VocEntry.objects.filter(created_at__gte=now - timedelta(days=30)).values("voc_type").annotate(c=Count("id")),
+        ),
+        ("inbox change feed", TicketChangeLog.objects.filter(seq__gt=0).order_by("seq")[:500]),
+        (
+            "duplicate candidates",
+            TicketFingerprint.objects.filter(
+                Q(band0=1) | Q(band1=2) | Q(band2=3) | Q(band3=4), created_at__gte=now - timedelta(days=14), created_at__lte=now
+            ).values_list("ticket_id", "simhash")[:200],
+        ),
+        ("socket replay", RealtimeEvent.objects.filter(stream="ticket_1", seq__gt=100).order_by("seq").values_list("seq", "message")[:201]),
+        ("ticket ETag validator", TicketChangeLog.objects.filter(ticket_id=1).order_by("-seq").values("seq")[:1]),
+    ]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN QUERY PLAN every hot ORM query and fail if any falls back to a full table scan (SQLite)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not only failures")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError(f"check_query_plans understands SQLite plans only (got {connection.vendor}).")
+
+        failures = []
+        for label, qs in hot_queries():
+            plan = qs.explain()
+            scans = _FULL_SCAN.findall(plan)
+            if scans:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {label}: {', '.join(sorted(set(scans)))}"))
+                self.stdout.write(plan)
+            else:
+                self.stdout.write(f"ok         {label}")
+                if options["verbose_plans"]:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries fall back to a full table scan.")
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from support.idempotency import ttl
+from support.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "Delete Idempotency-Key records older than settings.SUPPORT_IDEMPOTENCY_TTL."
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - ttl()
+        deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} idempotency keys older than {ttl()}."))
@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from support.models import TicketChangeLog
+
+
+class Command(BaseCommand):
+    help = "Trim the admin inbox change log (TicketChangeLog). Clients with an older cursor get reset=true."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=7, help="Keep entries newer than N days (default: 7)")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        latest = TicketChangeLog.objects.order_by("-seq").values_list("seq", flat=True).first()
+        qs = TicketChangeLog.objects.filter(created_at__lt=cutoff)
+        if latest is not None:
+            # Always keep the newest entry so the feed cursor never goes backwards.
+            qs = qs.exclude(seq=latest)
+        deleted, _ = qs.delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} change log entries older than {options['days']} days."))
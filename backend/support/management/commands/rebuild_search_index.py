@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from support.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ticket full-text index (tickets, replies, notes) from the database."
+
+    def handle(self, *args, **options):
+        get_search_backend.cache_clear()
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} documents ({backend.name})."))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from support.models import InboxCounter, Ticket
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or --verify) Ticket's denormalized conversation counters from TicketReply."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verify", action="store_true", help="Only report tickets whose counters drifted")
+        parser.add_argument("--ticket", type=int, action="append", default=[], help="Limit to ticket id (repeatable)")
+
+    def handle(self, *args, **options):
+        qs = Ticket.objects.all()
+        if options["ticket"]:
+            qs = qs.filter(id__in=options["ticket"])
+
+        if not options["verify"]:
+            with transaction.atomic():
+                updated = qs.update(**Ticket.conversation_counter_expressions())
+                # Reply timestamps feed the "waiting" badge, which QuerySet.update() does not maintain.
+                InboxCounter.reconcile()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt conversation counters for {updated} tickets."))
+            return
+
+        expected = {f"expected_{k}": v for k, v in Ticket.conversation_counter_expressions().items()}
+        drifted = 0
+        for row in qs.annotate(**expected).values("id", *Ticket.COUNTER_FIELDS, *expected.keys()).iterator():
+            diffs = [f for f in Ticket.COUNTER_FIELDS if row[f] != row[f"expected_{f}"]]
+            if diffs:
+                drifted += 1
+                self.stdout.write(f"#{row['id']}: " + ", ".join(f"{f}={row[f]!r} (expected {row['expected_' + f]!r})" for f in diffs))
+        if drifted:
+            raise CommandError(f"{drifted} tickets have drifted counters; run without --verify to rebuild.")
+        self.stdout.write(self.style.SUCCESS("All conversation counters are consistent."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from support.duplicates import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute every ticket's duplicate-detection fingerprint (SimHash) from its body."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            stored = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Fingerprinted {stored} tickets."))
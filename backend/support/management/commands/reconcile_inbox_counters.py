@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from support.models import InboxCounter
+
+
+class Command(BaseCommand):
+    help = "Recompute the admin inbox badge counters (InboxCounter) from Ticket, or --check for drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true", help="Only report drifted counters; exit non-zero if any")
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            # reconcile() inside a rolled-back transaction: same comparison, nothing written.
+            with transaction.atomic():
+                drift = InboxCounter.reconcile()
+                transaction.set_rollback(True)
+        else:
+            drift = InboxCounter.reconcile()
+
+        for key in sorted(drift):
+            stored, actual = drift[key]
+            self.stdout.write(f"{key}: {stored} (actual {actual})")
+        if options["check"]:
+            if drift:
+                raise CommandError(f"{len(drift)} inbox counters drifted; run without --check to fix.")
+            self.stdout.write(self.style.SUCCESS("All inbox counters are consistent."))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Reconciled inbox counters ({len(drift)} corrected)."))
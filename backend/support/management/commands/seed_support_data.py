@@ -32,9 +32,11 @@ class Command(BaseCommand):
 <path d="M54 88c6 6 14 6 20 0" stroke="#1F2937" stroke-width="5" stroke-linecap="round" fill="none"/>
 </svg>"""
         avatar_url = "data:image/svg+xml;utf8," + quote(svg)
-        Profile.objects.get_or_create(
-            user=user, defaults={"display_name": "test", "avatar_url": avatar_url, "phone_number": "+82 10-0000-0000"}
-        )
+        if created:
+            # Profile row itself comes from the User post_save hook.
+            Profile.objects.update_or_create(
+                user=user, defaults={"display_name": "test", "avatar_url": avatar_url, "phone_number": "+82 10-0000-0000"}
+            )
 
         # Admin (staff)
         admin_email = "admin@joody.local"
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0038_ticket_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketChangeLog",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("ticket_id", models.BigIntegerField()),
+                ("kind", models.CharField(choices=[("UPSERT", "변경"), ("DELETE", "삭제")], default="UPSERT", max_length=10)),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "ordering": ["seq"],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Substr
+
+
+def backfill_counters(apps, schema_editor):
+    Ticket = apps.get_model("support", "Ticket")
+    TicketReply = apps.get_model("support", "TicketReply")
+    replies = TicketReply.objects.filter(ticket=OuterRef("pk"), is_internal=False)
+    latest = replies.order_by("-created_at", "-id")
+    staff = replies.filter(author__is_staff=True)
+    Ticket.objects.update(
+        last_reply_at=Subquery(latest.values("created_at")[:1]),
+        last_staff_reply_at=Subquery(staff.order_by("-created_at").values("created_at")[:1]),
+        first_staff_reply_at=Subquery(staff.order_by("created_at").values("created_at")[:1]),
+        last_user_reply_at=Subquery(replies.filter(author_id=OuterRef("user_id")).order_by("-created_at").values("created_at")[:1]),
+        reply_count=Coalesce(Subquery(replies.order_by().values("ticket").annotate(c=Count("id")).values("c")[:1]), 0),
+        last_message_preview=Coalesce(Subquery(latest.annotate(p=Substr("body", 1, 120)).values("p")[:1]), Value("")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0039_ticketchangelog"),
+    ]
+
+    operations = [
+        migrations.AddField(model_name="ticket", name="last_reply_at", field=models.DateTimeField(blank=True, null=True)),
+        migrations.AddField(model_name="ticket", name="last_staff_reply_at", field=models.DateTimeField(blank=True, null=True)),
+        migrations.AddField(model_name="ticket", name="first_staff_reply_at", field=models.DateTimeField(blank=True, null=True)),
+        migrations.AddField(model_name="ticket", name="last_user_reply_at", field=models.DateTimeField(blank=True, null=True)),
+        migrations.AddField(model_name="ticket", name="reply_count", field=models.IntegerField(default=0)),
+        migrations.AddField(
+            model_name="ticket", name="last_message_preview", field=models.CharField(blank=True, default="", max_length=200)
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
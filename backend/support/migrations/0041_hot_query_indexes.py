@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0040_ticket_conversation_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(model_name="ticket", index=models.Index(fields=["user", "-created_at"], name="ticket_user_created_idx")),
+        migrations.AddIndex(model_name="ticket", index=models.Index(fields=["status", "updated_at"], name="ticket_status_updated_idx")),
+        migrations.AddIndex(model_name="ticket", index=models.Index(fields=["assignee", "status"], name="ticket_assignee_status_idx")),
+        migrations.AddIndex(model_name="ticketreply", index=models.Index(fields=["ticket", "created_at"], name="reply_ticket_created_idx")),
+        migrations.AddIndex(model_name="ticketreply", index=models.Index(fields=["ticket", "author"], name="reply_ticket_author_idx")),
+        migrations.AddIndex(model_name="faqview", index=models.Index(fields=["faq", "viewed_at"], name="faqview_faq_viewed_idx")),
+        migrations.AddIndex(
+            model_name="faqview", index=models.Index(fields=["user", "faq", "viewed_at"], name="faqview_user_faq_viewed_idx")
+        ),
+        migrations.AddIndex(model_name="vocentry", index=models.Index(fields=["created_at", "voc_type"], name="voc_created_type_idx")),
+    ]
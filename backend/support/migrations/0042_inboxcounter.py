@@ -0,0 +1,46 @@
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+
+
+def backfill_counters(apps, schema_editor):
+    # Same rules as InboxCounter.compute(); historical models have no custom methods.
+    Ticket = apps.get_model("support", "Ticket")
+    InboxCounter = apps.get_model("support", "InboxCounter")
+    counts = Counter()
+    tickets = Ticket.objects.order_by()
+    counts["all"] = tickets.count()
+    for status, n in tickets.values_list("status").annotate(n=Count("id")):
+        counts[f"status:{status}"] = n
+    open_tickets = tickets.exclude(status="CLOSED")
+    counts["open"] = open_tickets.count()
+    for assignee_id, n in open_tickets.values_list("assignee_id").annotate(n=Count("id")):
+        counts[f"assignee:{assignee_id or 'none'}"] = n
+    for team, n in open_tickets.exclude(team="").values_list("team").annotate(n=Count("id")):
+        counts[f"team:{team}"] = n
+    counts["waiting"] = open_tickets.filter(
+        Q(last_staff_reply_at__isnull=True) | Q(last_user_reply_at__gt=F("last_staff_reply_at"))
+    ).count()
+    InboxCounter.objects.bulk_create([InboxCounter(key=k, value=v) for k, v in counts.items() if v])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0041_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InboxCounter",
+            fields=[
+                ("key", models.CharField(max_length=80, primary_key=True, serialize=False)),
+                ("value", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["key"],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
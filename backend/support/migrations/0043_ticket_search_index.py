@@ -0,0 +1,75 @@
+import re
+
+from django.db import OperationalError, migrations, transaction
+
+# Frozen copies of support.search's table name and tokenizer as of this migration; later changes to the
+# live ones apply through `manage.py rebuild_search_index`, not by re-running history.
+FTS_TABLE = "support_ticket_fts"
+_CJK = "\u3040-\u30ff\u3131-\u318e\u4e00-\u9fff\uac00-\ud7a3"
+_RUN_RE = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def ngram_text(text: str) -> str:
+    terms = []
+    for run in _RUN_RE.findall(text or ""):
+        if _CJK_RE.match(run) and len(run) > 1:
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return " ".join(terms)
+
+
+# rowid = doc_id * 4 + kind code (ticket=1, reply=2, note=3); see support/search.py.
+CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, body, ticket_id UNINDEXED, raw UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')"
+)
+
+
+def create_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other databases use the LIKE fallback backend.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    Ticket = apps.get_model("support", "Ticket")
+    TicketReply = apps.get_model("support", "TicketReply")
+    TicketNote = apps.get_model("support", "TicketNote")
+    sql = f"INSERT INTO {FTS_TABLE} (rowid, title, body, ticket_id, raw) VALUES (%s, %s, %s, %s, %s)"
+    with schema_editor.connection.cursor() as cur:
+        try:
+            with transaction.atomic(using=schema_editor.connection.alias):
+                cur.execute(CREATE_SQL)
+        except OperationalError:
+            # SQLite built without FTS5 ("no such module: fts5"): no table, so search uses the LIKE fallback.
+            return
+        cur.executemany(
+            sql,
+            [
+                [tid * 4 + 1, ngram_text(title), ngram_text(body), tid, f"{title}\n{body}" if title else body]
+                for tid, title, body in Ticket.objects.values_list("id", "title", "body")
+            ],
+        )
+        for model, code in ((TicketReply, 2), (TicketNote, 3)):
+            cur.executemany(
+                sql,
+                [
+                    [doc_id * 4 + code, "", ngram_text(body), tid, body]
+                    for doc_id, tid, body in model.objects.values_list("id", "ticket_id", "body")
+                ],
+            )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0042_inboxcounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
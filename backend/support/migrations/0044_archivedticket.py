@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("support", "0043_ticket_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTicket",
+            fields=[
+                ("ticket_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=200)),
+                ("closed_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                ("data", models.BinaryField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_tickets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-closed_at"],
+                "indexes": [models.Index(fields=["user", "-closed_at"], name="archived_user_closed_idx")],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedAttachment",
+            fields=[
+                ("public_id", models.UUIDField(primary_key=True, serialize=False)),
+                ("file", models.FileField(upload_to="")),
+                ("original_name", models.CharField(blank=True, default="", max_length=255)),
+                ("content_type", models.CharField(blank=True, default="", max_length=120)),
+                (
+                    "archived_ticket",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="attachments",
+                        to="support.archivedticket",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0045_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="ticketchangelog",
+            index=models.Index(fields=["ticket_id", "seq"], name="changelog_ticket_seq_idx"),
+        ),
+    ]
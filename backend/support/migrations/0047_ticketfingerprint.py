@@ -0,0 +1,52 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Schema only: existing tickets are fingerprinted by `manage.py rebuild_ticket_fingerprints`, which
+# always runs the current support.duplicates.simhash().
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("support", "0046_changelog_ticket_seq_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TicketFingerprint",
+            fields=[
+                (
+                    "ticket",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="fingerprint",
+                        serialize=False,
+                        to="support.ticket",
+                    ),
+                ),
+                ("simhash", models.BigIntegerField()),
+                ("band0", models.IntegerField()),
+                ("band1", models.IntegerField()),
+                ("band2", models.IntegerField()),
+                ("band3", models.IntegerField()),
+                ("created_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["band0", "created_at"], name="fingerprint_band0_idx"),
+                    models.Index(fields=["band1", "created_at"], name="fingerprint_band1_idx"),
+                    models.Index(fields=["band2", "created_at"], name="fingerprint_band2_idx"),
+                    models.Index(fields=["band3", "created_at"], name="fingerprint_band3_idx"),
+                ],
+            },
+        ),
+    ]
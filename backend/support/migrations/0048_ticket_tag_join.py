@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """TicketTagAssignment rows for the Ticket.tags entries that name an existing tag (like TicketTag.lookup)."""
+    Ticket = apps.get_model("support", "Ticket")
+    TicketTag = apps.get_model("support", "TicketTag")
+    TicketTagAssignment = apps.get_model("support", "TicketTagAssignment")
+
+    by_name = {}
+    for tag in TicketTag.objects.order_by(models.F("parent_id").asc(nulls_first=True), "order", "id"):
+        by_name.setdefault(tag.name.strip().casefold(), tag.id)
+    existing = set(TicketTagAssignment.objects.values_list("ticket_id", "tag_id"))
+    rows = []
+    for tid, tags in Ticket.objects.exclude(tags=[]).values_list("id", "tags").iterator():
+        if not isinstance(tags, list):
+            continue
+        for name in tags:
+            if not isinstance(name, str) or name.strip().casefold() not in by_name:
+                continue
+            pair = (tid, by_name[name.strip().casefold()])
+            if pair not in existing:
+                existing.add(pair)
+                rows.append(TicketTagAssignment(ticket_id=pair[0], tag_id=pair[1]))
+    TicketTagAssignment.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0047_ticketfingerprint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tickettagassignment",
+            index=models.Index(fields=["tag", "ticket"], name="tagassign_tag_ticket_idx"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
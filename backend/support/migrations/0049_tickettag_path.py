@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """Materialized paths, parents before children (TicketTag.save() is not available to migrations)."""
+    TicketTag = apps.get_model("support", "TicketTag")
+    tags = list(TicketTag.objects.only("id", "parent_id"))
+    children = {}
+    for tag in tags:
+        children.setdefault(tag.parent_id, []).append(tag)
+    level = [(tag, "/") for tag in children.get(None, [])]
+    changed = []
+    while level:
+        next_level = []
+        for tag, parent_path in level:
+            tag.path = f"{parent_path}{tag.id}/"
+            changed.append(tag)
+            next_level.extend((child, tag.path) for child in children.get(tag.id, []))
+        level = next_level
+    TicketTag.objects.bulk_update(changed, ["path"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0048_ticket_tag_join"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tickettag",
+            name="path",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="tickettag",
+            index=models.Index(fields=["path"], name="tickettag_path_idx"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
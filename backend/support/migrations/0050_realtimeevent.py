@@ -0,0 +1,24 @@
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0049_tickettag_path"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RealtimeEvent",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("stream", models.CharField(max_length=64)),
+                ("message", models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [models.Index(fields=["stream", "seq"], name="realtime_event_stream_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    """name_key = TicketTag.name_key_for(name) (save() is not available to migrations)."""
+    TicketTag = apps.get_model("support", "TicketTag")
+    tags = list(TicketTag.objects.only("id", "name"))
+    for tag in tags:
+        tag.name_key = tag.name.strip().casefold()
+    TicketTag.objects.bulk_update(tags, ["name_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("support", "0050_realtimeevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tickettag",
+            name="name_key",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name="tickettag",
+            index=models.Index(fields=["name_key"], name="tickettag_name_key_idx"),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
-from django.db import models
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Concat, Substr
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.core.serializers.json import DjangoJSONEncoder
 import uuid
 
 User = get_user_model()
@@ -92,15 +98,122 @@ class Ticket(models.Model):
     user_location = models.CharField(max_length=80, blank=True, default="")
     client_meta = models.JSONField(default=dict, blank=True)
     reopened_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized conversation facts, maintained by record_reply() and rebuild_ticket_counters.
+    # Public replies only (is_internal=False): the staff timestamps ignore internal notes, so they
+    # drive the owner's unread state and the first-response time without leaking them.
+    last_reply_at = models.DateTimeField(null=True, blank=True)
+    last_staff_reply_at = models.DateTimeField(null=True, blank=True)
+    first_staff_reply_at = models.DateTimeField(null=True, blank=True)
+    last_user_reply_at = models.DateTimeField(null=True, blank=True)
+    reply_count = models.IntegerField(default=0)
+    last_message_preview = models.CharField(max_length=200, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    PREVIEW_LENGTH = 120
+    COUNTER_FIELDS = [
+        "last_reply_at",
+        "last_staff_reply_at",
+        "first_staff_reply_at",
+        "last_user_reply_at",
+        "reply_count",
+        "last_message_preview",
+    ]
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination for the admin inbox: (updated_at, id) / (created_at, id)
+            models.Index(fields=["updated_at", "id"], name="ticket_updated_id_idx"),
+            models.Index(fields=["created_at", "id"], name="ticket_created_id_idx"),
+            # TicketViewSet (my tickets, newest first) / inbox status & assignee views
+            models.Index(fields=["user", "-created_at"], name="ticket_user_created_idx"),
+            models.Index(fields=["status", "updated_at"], name="ticket_status_updated_idx"),
+            models.Index(fields=["assignee", "status"], name="ticket_assignee_status_idx"),
+        ]
 
     def __str__(self):
         return f"#{self.id} {self.title or self.body[:50]}"
 
+    def save(self, *args, **kwargs):
+        # Keep InboxCounter in the same transaction as any write that can move the ticket between badges.
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not set(update_fields) & InboxCounter.TRACKED_FIELDS:
+            return super().save(*args, **kwargs)
+        with transaction.atomic(savepoint=False):
+            before = [] if self._state.adding else list(InboxCounter.states([self.pk]).values())
+            super().save(*args, **kwargs)
+            InboxCounter.move(before, [self.inbox_state()])
+
+    def inbox_state(self) -> tuple:
+        return tuple(getattr(self, f) for f in InboxCounter.STATE_FIELDS)
+
+    def record_reply(self, reply: "TicketReply") -> None:
+        """
+        Fold a newly created reply into the conversation counters with a single UPDATE.
+        Call inside the same transaction that created the reply.
+        """
+        if reply.is_internal:
+            return  # invisible to the owner; see the counter fields above
+        at = reply.created_at
+        fields = {
+            "reply_count": F("reply_count") + 1,
+            "last_reply_at": at,
+            "last_message_preview": (reply.body or "")[: self.PREVIEW_LENGTH],
+        }
+        if reply.author_id and reply.author.is_staff:
+            fields["last_staff_reply_at"] = at
+            fields["first_staff_reply_at"] = Coalesce(F("first_staff_reply_at"), Value(at, output_field=models.DateTimeField()))
+        if reply.author_id and reply.author_id == self.user_id:
+            fields["last_user_reply_at"] = at
+        # Reply timestamps decide the "waiting" badge.
+        with InboxCounter.track([self.id]):
+            Ticket.objects.filter(id=self.id).update(**fields)
+        self.refresh_from_db(fields=self.COUNTER_FIELDS)
+
+    @staticmethod
+    def unread_q() -> Q:
+        """Owner-side unread: the latest public staff reply is newer than the owner's read receipt."""
+        return Q(last_staff_reply_at__isnull=False) & (
+            Q(user_seen_at__isnull=True) | Q(last_staff_reply_at__gt=F("user_seen_at"))
+        )
+
+    def is_unread(self) -> bool:
+        """unread_q() for this instance's loaded values."""
+        return self.last_staff_reply_at is not None and (
+            self.user_seen_at is None or self.last_staff_reply_at > self.user_seen_at
+        )
+
+    @classmethod
+    def unread_summary(cls, user_id: int) -> dict:
+        """`/tickets/unread/` payload: one query on the denormalized reply / read-receipt columns."""
+        ids = list(
+            cls.objects.filter(cls.unread_q(), user_id=user_id).order_by("-last_staff_reply_at").values_list("id", flat=True)
+        )
+        return {"count": len(ids), "ticket_ids": ids}
+
+    @staticmethod
+    def conversation_counter_expressions() -> dict:
+        """Counter values recomputed from TicketReply, as expressions usable in annotate()/update()."""
+        replies = TicketReply.objects.filter(ticket=OuterRef("pk"), is_internal=False)
+        latest = replies.order_by("-created_at", "-id")
+        staff = replies.filter(author__is_staff=True)
+        return {
+            "last_reply_at": Subquery(latest.values("created_at")[:1]),
+            "last_staff_reply_at": Subquery(staff.order_by("-created_at").values("created_at")[:1]),
+            "first_staff_reply_at": Subquery(staff.order_by("created_at").values("created_at")[:1]),
+            "last_user_reply_at": Subquery(
+                replies.filter(author_id=OuterRef("user_id")).order_by("-created_at").values("created_at")[:1]
+            ),
+            "reply_count": Coalesce(
+                Subquery(replies.order_by().values("ticket").annotate(c=Count("id")).values("c")[:1]), 0
+            ),
+            "last_message_preview": Coalesce(
+                Subquery(latest.annotate(p=Substr("body", 1, Ticket.PREVIEW_LENGTH)).values("p")[:1]),
+                Value(""),
+            ),
+        }
+
 
 class TicketReply(models.Model):
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="replies")
@@ -113,6 +226,10 @@ class TicketReply(models.Model):
     class Meta:
         verbose_name_plural = "Ticket replies"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["ticket", "created_at"], name="reply_ticket_created_idx"),
+            models.Index(fields=["ticket", "author"], name="reply_ticket_author_idx"),
+        ]
 
     def __str__(self):
         return f"Reply to #{self.ticket_id}"
@@ -161,29 +278,451 @@ class TicketNote(models.Model):
 
 
 class TicketTag(models.Model):
+    """
+    Tag tree. `path` is the materialized "/<root id>/.../<own id>/" (maintained by save()), so the whole
+    tree loads with one query (build_tree) and a subtree is one index range (subtree_q).
+    """
+
     name = models.CharField(max_length=100)
+    # name_key_for(name), maintained by save(): names compare case-insensitively in one indexed lookup,
+    # the same way for every script (SQLite's lower() folds ASCII only).
+    name_key = models.CharField(max_length=255, blank=True, default="", editable=False)
     color = models.CharField(max_length=20, default="#6B7280")
     parent = models.ForeignKey("self", on_delete=models.CASCADE, null=True, blank=True, related_name="children")
     order = models.IntegerField(default=0)
+    path = models.CharField(max_length=255, blank=True, default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    MAX_DEPTH = 10  # keeps `path` within max_length and the nested serializer shallow
+
     class Meta:
         ordering = ["order", "name"]
         unique_together = [["name", "parent"]]
+        indexes = [
+            models.Index(fields=["name_key"], name="tickettag_name_key_idx"),
+            models.Index(fields=["path"], name="tickettag_path_idx"),
+        ]
 
     def __str__(self):
         if self.parent:
             return f"{self.parent.name} > {self.name}"
         return self.name
 
+    @staticmethod
+    def name_key_for(name: str) -> str:
+        return name.strip().casefold()
+
+    def save(self, *args, **kwargs):
+        self.name_key = self.name_key_for(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "name_key"}
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
+            path = f"{self.parent.path if self.parent_id else '/'}{self.pk}/"
+            if path == self.path:
+                return
+            if self.path:
+                # Re-parented: rewrite the prefix of every path in the moved subtree.
+                TicketTag.objects.filter(self.subtree_q(self.path)).update(
+                    path=Concat(Value(path), Substr("path", len(self.path) + 1), output_field=models.CharField())
+                )
+            else:
+                TicketTag.objects.filter(pk=self.pk).update(path=path)
+            self.path = path
+
+    def is_ancestor_of(self, other: "TicketTag") -> bool:
+        return bool(self.path) and other.path.startswith(self.path)
+
+    @property
+    def depth(self) -> int:
+        """1 for a root tag."""
+        return self.path.count("/") - 1
+
+    def height(self) -> int:
+        """Levels in this tag's subtree, itself included."""
+        paths = TicketTag.objects.filter(self.subtree_q(self.path)).values_list("path", flat=True)
+        return max((p.count("/") - 1 for p in paths), default=self.depth) - self.depth + 1
+
+    @staticmethod
+    def subtree_q(path: str) -> Q:
+        """
+        Paths at or below `path` as a range ("/1/5/" ≤ p < "/1/50"; "0" sorts right after "/"),
+        which SQLite answers from tickettag_path_idx, unlike LIKE 'x%'.
+        """
+        return Q(path__gte=path, path__lt=path[:-1] + "0")
+
+    @classmethod
+    def subtree(cls, tags):
+        """Every tag at or below one of `tags`."""
+        paths = [t.path for t in tags if t.path]
+        if not paths:
+            return cls.objects.none()
+        return cls.objects.filter(Q(*[cls.subtree_q(p) for p in paths], _connector=Q.OR))
+
+    @staticmethod
+    def build_tree(tags) -> list:
+        """Attach `tree_children` (in the given order) to each tag; returns the tags whose parent is not among them."""
+        tags = list(tags)
+        by_id = {t.id: t for t in tags}
+        roots = []
+        for t in tags:
+            t.tree_children = []
+        for t in tags:
+            parent = by_id.get(t.parent_id)
+            (parent.tree_children if parent else roots).append(t)
+        return roots
+
+    @classmethod
+    def name_keys(cls, names) -> set:
+        """name_key_for() of the string entries of `names` (legacy Ticket.tags may hold anything)."""
+        return {cls.name_key_for(n) for n in names if isinstance(n, str) and n.strip()}
+
+    @classmethod
+    def matching(cls, names):
+        """Tags (at any level) whose name case-insensitively equals one of `names`."""
+        return cls.objects.filter(name_key__in=cls.name_keys(names))
+
+    @classmethod
+    def lookup(cls, names) -> dict:
+        """
+        {name key: TicketTag} for the Ticket.tags entries that name an existing tag, in one query; other
+        names map to nothing (tags are created in the admin only). "결제/카드" (how the inbox labels child
+        tags) names 카드 under 결제 when that chain exists; otherwise the whole string is a plain name
+        ("A/S"). A plain name used at several levels maps to the root tag, then the lowest order/id.
+        """
+        keys = cls.name_keys(names)
+        segments = {seg.strip() for k in keys for seg in k.split("/") if "/" in k} - {""}
+        tags = list(cls.matching(keys | segments).order_by(F("parent_id").asc(nulls_first=True), "order", "id"))
+        by_id = {t.id: t for t in tags}
+        by_key = {}
+        for t in tags:
+            by_key.setdefault(t.name_key, t)
+            # Qualified name of t through the fetched ancestors (a chain stops at the first missing one).
+            chain, node = [t.name_key], by_id.get(t.parent_id)
+            while node is not None:
+                chain.insert(0, node.name_key)
+                qualified = "/".join(chain)
+                if qualified in keys:
+                    by_key.setdefault(qualified, t)
+                node = by_id.get(node.parent_id)
+        return {key: by_key[key] for key in keys if key in by_key}
+
 
 class TicketTagAssignment(models.Model):
+    """
+    Indexed ticket ↔ tag join, the source of truth for tag filters (`?tag=` on the admin lists).
+    Ticket.tags keeps the names as typed for display; names of existing tags (TicketTag.lookup) get a row.
+    signals.py calls sync() when a save writes them, bulk_update callers call it themselves.
+    """
+
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="tag_assignments")
     tag = models.ForeignKey(TicketTag, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("ticket", "tag")
+        indexes = [models.Index(fields=["tag", "ticket"], name="tagassign_tag_ticket_idx")]
+
+    @classmethod
+    def sync(cls, tickets):
+        """Make the assignments of `tickets` match their Ticket.tags. Call inside the writing transaction."""
+        tickets = [t for t in tickets if t.id]
+        if not tickets:
+            return
+        names = {t.id: TicketTag.name_keys(t.tags if isinstance(t.tags, list) else []) for t in tickets}
+        by_key = TicketTag.lookup(set().union(*names.values()))
+        wanted = {(t.id, by_key[key].id) for t in tickets for key in names[t.id] if key in by_key}
+        existing = set(cls.objects.filter(ticket_id__in=[t.id for t in tickets]).values_list("ticket_id", "tag_id"))
+        stale = existing - wanted
+        if stale:
+            # One OR branch per tag (a bulk removal touches a handful of tags, not one pair per ticket).
+            by_tag = defaultdict(list)
+            for tid, tag_id in stale:
+                by_tag[tag_id].append(tid)
+            cls.objects.filter(
+                Q(*[Q(tag_id=tag_id, ticket_id__in=tids) for tag_id, tids in by_tag.items()], _connector=Q.OR)
+            ).delete()
+        cls.objects.bulk_create([cls(ticket_id=tid, tag_id=tag_id) for tid, tag_id in wanted - existing])
+
+
+class TicketChangeLog(models.Model):
+    """
+    Monotonic change sequence for the admin inbox (`/admin/tickets/changes/?since=<seq>`).
+    One row per Ticket / TicketReply / TicketNote / TicketTagAssignment write (see signals.py),
+    so polling and WS-reconnect catch-up cost O(changes) instead of O(inbox).
+    `ticket_id` is a plain column (not a FK) so DELETE tombstones outlive the ticket.
+    """
+
+    KIND_CHOICES = [
+        ("UPSERT", "변경"),
+        ("DELETE", "삭제"),
+    ]
+
+    seq = models.BigAutoField(primary_key=True)
+    ticket_id = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, default="UPSERT")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["seq"]
+        indexes = [
+            # Per-ticket version for conditional GET (support/conditional.py)
+            models.Index(fields=["ticket_id", "seq"], name="changelog_ticket_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.seq} {self.kind} ticket {self.ticket_id}"
+
+    @classmethod
+    def record(cls, ticket_ids, kind: str = "UPSERT"):
+        rows = [cls(ticket_id=tid, kind=kind) for tid in dict.fromkeys(ticket_ids) if tid]
+        if rows:
+            cls.objects.bulk_create(rows)
+
+
+class RealtimeEvent(models.Model):
+    """
+    Bounded outbox of the broadcasts a reconnecting socket may have missed (realtime.py). `seq` orders
+    every stream; a stream is the channel-layer group ("ticket_<id>", "admin_inbox"). Sockets opened with
+    `?last_seq=` replay their stream's events after it before live ones (consumers.py).
+    """
+
+    MAX_EVENTS = 20000  # newest rows kept; record() trims every PRUNE_EVERY events
+    PRUNE_EVERY = 500
+
+    seq = models.BigAutoField(primary_key=True)
+    stream = models.CharField(max_length=64)
+    message = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["stream", "seq"], name="realtime_event_stream_idx")]
+
+    def __str__(self):
+        return f"#{self.seq} {self.stream} {self.message.get('type')}"
+
+    @classmethod
+    def record(cls, stream: str, message: dict) -> int:
+        """Store `message` and return its seq. Call inside the transaction that makes the change."""
+        event = cls.objects.create(stream=stream, message=message)
+        if event.seq % cls.PRUNE_EVERY == 0:
+            cls.objects.filter(seq__lte=event.seq - cls.MAX_EVENTS).delete()
+        return event.seq
+
+    @classmethod
+    def replay(cls, stream: str, last_seq: int, limit: int) -> list[dict] | None:
+        """
+        Messages of `stream` after `last_seq` (with their "seq"), oldest first. None when the client must
+        refetch instead: `last_seq` predates the retained outbox, or more than `limit` events are missing.
+        """
+        oldest = cls.objects.order_by("seq").values_list("seq", flat=True).first()
+        if oldest is not None and last_seq < oldest - 1:
+            return None
+        rows = list(cls.objects.filter(stream=stream, seq__gt=last_seq).order_by("seq").values_list("seq", "message")[: limit + 1])
+        if len(rows) > limit:
+            return None
+        return [{**message, "seq": seq} for seq, message in rows]
+
+
+class TicketFingerprint(models.Model):
+    """
+    SimHash of a ticket body for near-duplicate lookup (support/duplicates.py), maintained by signals.py.
+    band0..band3 are the hash's 16-bit slices: candidates share at least one band with the probe.
+    """
+
+    ticket = models.OneToOneField(Ticket, primary_key=True, on_delete=models.CASCADE, related_name="fingerprint")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")  # ticket.user, for the same-user scope
+    simhash = models.BigIntegerField()  # signed storage of the unsigned 64-bit hash
+    band0 = models.IntegerField()
+    band1 = models.IntegerField()
+    band2 = models.IntegerField()
+    band3 = models.IntegerField()
+    created_at = models.DateTimeField()  # ticket.created_at, for the time window
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["band0", "created_at"], name="fingerprint_band0_idx"),
+            models.Index(fields=["band1", "created_at"], name="fingerprint_band1_idx"),
+            models.Index(fields=["band2", "created_at"], name="fingerprint_band2_idx"),
+            models.Index(fields=["band3", "created_at"], name="fingerprint_band3_idx"),
+        ]
+
+    def __str__(self):
+        return f"ticket {self.ticket_id} simhash {self.simhash & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+class InboxCounter(models.Model):
+    """
+    Admin sidebar badge counts (`/admin/tickets/counts/`), maintained incrementally in the same
+    transaction as the ticket write: Ticket.save(), record_reply() and the bulk inbox actions go
+    through move()/track(); Ticket deletes through signals.py. `reconcile_inbox_counters` rebuilds.
+    Keys:
+    - all, status:<STATUS>
+    - open (non-CLOSED), and for open tickets only: assignee:<id|none>, team:<name>, waiting
+    - waiting = open and no staff reply yet, or the customer replied after the last staff reply
+    """
+
+    STATE_FIELDS = ("status", "assignee_id", "team", "last_user_reply_at", "last_staff_reply_at")
+    # Ticket.save(update_fields=...) only needs counter bookkeeping when one of these is written.
+    TRACKED_FIELDS = {"status", "assignee", "assignee_id", "team", "last_user_reply_at", "last_staff_reply_at"}
+
+    key = models.CharField(max_length=80, primary_key=True)
+    value = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self):
+        return f"{self.key}={self.value}"
+
+    @staticmethod
+    def keys_for(status, assignee_id, team, last_user_reply_at, last_staff_reply_at) -> list[str]:
+        keys = ["all", f"status:{status}"]
+        if status == "CLOSED":
+            return keys
+        keys += ["open", f"assignee:{assignee_id or 'none'}"]
+        if team:
+            keys.append(f"team:{team}")
+        if last_staff_reply_at is None or (last_user_reply_at is not None and last_user_reply_at > last_staff_reply_at):
+            keys.append("waiting")
+        return keys
+
+    @staticmethod
+    def waiting_q() -> Q:
+        """keys_for()'s "waiting" rule as a Ticket filter (used by reconcile)."""
+        return ~Q(status="CLOSED") & (
+            Q(last_staff_reply_at__isnull=True) | Q(last_user_reply_at__gt=F("last_staff_reply_at"))
+        )
+
+    @classmethod
+    def states(cls, ticket_ids) -> dict:
+        return {
+            row[0]: row[1:]
+            for row in Ticket.objects.filter(id__in=list(ticket_ids)).values_list("id", *cls.STATE_FIELDS)
+        }
+
+    @classmethod
+    def move(cls, before, after):
+        """Apply the difference between ticket states (tuples in STATE_FIELDS order) to the counters."""
+        deltas = Counter()
+        for state in before:
+            deltas.subtract(cls.keys_for(*state))
+        for state in after:
+            deltas.update(cls.keys_for(*state))
+        cls.apply(deltas)
+
+    @classmethod
+    def apply(cls, deltas):
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return
+        cls.objects.bulk_create([cls(key=k) for k in deltas], ignore_conflicts=True)
+        by_amount = defaultdict(list)
+        for key, amount in deltas.items():
+            by_amount[amount].append(key)
+        for amount, keys in by_amount.items():
+            cls.objects.filter(key__in=keys).update(value=F("value") + amount)
+
+    @classmethod
+    @contextmanager
+    def track(cls, ticket_ids):
+        """For QuerySet.update() writes: snapshot states before and after, apply the difference."""
+        ticket_ids = list(ticket_ids)
+        with transaction.atomic(savepoint=False):
+            before = cls.states(ticket_ids)
+            yield
+            cls.move(before.values(), cls.states(ticket_ids).values())
+
+    @classmethod
+    def compute(cls) -> Counter:
+        """Counts from scratch with a handful of GROUP BYs (reconcile / backfill)."""
+        counts = Counter()
+        tickets = Ticket.objects.order_by()
+        counts["all"] = tickets.count()
+        for status, n in tickets.values_list("status").annotate(n=Count("id")):
+            counts[f"status:{status}"] = n
+        open_tickets = tickets.exclude(status="CLOSED")
+        counts["open"] = open_tickets.count()
+        for assignee_id, n in open_tickets.values_list("assignee_id").annotate(n=Count("id")):
+            counts[f"assignee:{assignee_id or 'none'}"] = n
+        for team, n in open_tickets.exclude(team="").values_list("team").annotate(n=Count("id")):
+            counts[f"team:{team}"] = n
+        counts["waiting"] = tickets.filter(cls.waiting_q()).count()
+        return counts
+
+    @classmethod
+    def reconcile(cls) -> dict:
+        """Overwrite the table with compute(); returns {key: (stored, actual)} for keys that drifted."""
+        with transaction.atomic():
+            actual = cls.compute()
+            stored = dict(cls.objects.select_for_update().values_list("key", "value"))
+            drift = {
+                k: (stored.get(k, 0), actual.get(k, 0))
+                for k in set(stored) | set(actual)
+                if stored.get(k, 0) != actual.get(k, 0)
+            }
+            cls.objects.all().delete()
+            cls.objects.bulk_create([cls(key=k, value=v) for k, v in actual.items() if v])
+        return drift
+
+
+class ArchivedTicket(models.Model):
+    """
+    Cold storage for long-CLOSED tickets (`archive_tickets`, support/archive.py): the ticket and all of
+    its dependent rows as one zlib-compressed JSON document, keyed by the original ticket id.
+    The hot tables (and every inbox / customer query) no longer carry it; detail reads rehydrate it
+    in memory and a user reply restores it.
+    """
+
+    ticket_id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="archived_tickets")
+    title = models.CharField(max_length=200)
+    closed_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.BinaryField()
+
+    class Meta:
+        ordering = ["-closed_at"]
+        indexes = [models.Index(fields=["user", "-closed_at"], name="archived_user_closed_idx")]
+
+    def __str__(self):
+        return f"#{self.ticket_id} {self.title} (archived)"
+
+
+class ArchivedAttachment(models.Model):
+    """public_id → stored file for attachments of archived tickets, so `/attachments/<uuid>/` keeps working."""
+
+    public_id = models.UUIDField(primary_key=True)
+    archived_ticket = models.ForeignKey(ArchivedTicket, on_delete=models.CASCADE, related_name="attachments")
+    file = models.FileField()
+    original_name = models.CharField(max_length=255, blank=True, default="")
+    content_type = models.CharField(max_length=120, blank=True, default="")
+
+    def __str__(self):
+        return self.original_name or str(self.public_id)
+
+
+class IdempotencyKey(models.Model):
+    """
+    `Idempotency-Key` records for retried POSTs (support/idempotency.py). The first request claims
+    (user, key); duplicates replay the stored response, or get 409 while the first is still running.
+    Rows expire after settings.SUPPORT_IDEMPOTENCY_TTL (see prune_idempotency_keys).
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="idempotency_keys")
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=200)  # "POST /api/tickets/12/replies/"
+    fingerprint = models.CharField(max_length=64)  # sha256 of the request payload
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # null while in progress
+    response_data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        unique_together = ("user", "key")
+
+    def __str__(self):
+        return f"{self.key} ({self.scope})"
 
 
 class FAQCategory(models.Model):
@@ -240,6 +779,11 @@ class FAQView(models.Model):
 
     class Meta:
         ordering = ["-viewed_at"]
+        indexes = [
+            # track_view dedup + analytics date ranges
+            models.Index(fields=["faq", "viewed_at"], name="faqview_faq_viewed_idx"),
+            models.Index(fields=["user", "faq", "viewed_at"], name="faqview_user_faq_viewed_idx"),
+        ]
 
 
 class FAQAttachment(models.Model):
@@ -384,6 +928,9 @@ class VocEntry(models.Model):
     class Meta:
         verbose_name_plural = "VOC entries"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "voc_type"], name="voc_created_type_idx"),
+        ]
 
     def __str__(self):
         return f"VOC #{self.id} [{self.voc_type}] {self.summary[:50] if self.summary else ''}"
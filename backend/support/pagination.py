@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import base64
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TicketKeysetPagination(PageNumberPagination):
+    """
+    Admin inbox pagination.
+    - default: page-number (count/next/previous/results), kept for existing clients
+    - `?cursor=` present (empty for the first page): opaque keyset cursor ordered by
+      (updated_at, id) or, with `?order=created`, (created_at, id). No COUNT(*) and no OFFSET,
+      so every page costs the same regardless of table size.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    cursor_query_param = "cursor"
+    order_query_param = "order"
+    order_fields = {"updated": "updated_at", "created": "created_at"}
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request) or 20
+        order_key = request.query_params.get(self.order_query_param) or "updated"
+        if order_key not in self.order_fields:
+            order_key = "updated"
+        field = self.order_fields[order_key]
+
+        queryset = queryset.order_by(f"-{field}", "-id")
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param) or "", order_key)
+        if position is not None:
+            value, last_id = position
+            queryset = queryset.filter(Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": last_id}))
+
+        rows = list(queryset[: page_size + 1])
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = None
+        if self.has_next and rows:
+            last = rows[-1]
+            self.next_cursor = self.encode_cursor(order_key, getattr(last, field), last.id)
+        return rows
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "use_cursor", False):
+            return super().get_paginated_response(data)
+        next_url = None
+        if self.next_cursor:
+            next_url = replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+        return Response({"next": next_url, "next_cursor": self.next_cursor, "results": data})
+
+    @staticmethod
+    def encode_cursor(order_key: str, value, last_id: int) -> str:
+        raw = json.dumps({"o": order_key, "v": value.isoformat(), "id": last_id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, token: str, order_key: str):
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+            value = parse_datetime(data["v"])
+            last_id = int(data["id"])
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only valid for the ordering it was issued for.
+        if value is None or data.get("o") != order_key:
+            raise NotFound(self.invalid_cursor_message)
+        return value, last_id
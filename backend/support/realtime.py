@@ -1,25 +1,137 @@
 from __future__ import annotations
 
-from asgiref.sync import async_to_sync
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from functools import partial
 
+from asgiref.sync import SyncToAsync
+from django.db import transaction
 
-def broadcast_ticket_reply(ticket_id: int, reply_payload: dict):
+from .models import RealtimeEvent
+
+logger = logging.getLogger(__name__)
+
+
+try:
+    from channels.layers import InMemoryChannelLayer, get_channel_layer
+except Exception:  # channels not installed: broadcasts are no-ops
+    InMemoryChannelLayer = get_channel_layer = None
+
+
+def _layer():
+    return get_channel_layer() if get_channel_layer else None
+
+
+class _Dispatcher:
     """
-    Best-effort broadcast. If channels isn't fully configured, do nothing.
+    Sends broadcasts from an event loop, off the request path: callers only enqueue. Each loop drains its
+    buffer with one task, sending a batch's groups concurrently and each group's messages in order.
+    The loop is a daemon thread's. InMemoryChannelLayer's queues belong to the server's loop and are not
+    thread-safe, so with it the caller's running loop (or, from sync views, asgiref's main loop) is used.
     """
-    try:
-        from channels.layers import get_channel_layer
-    except Exception:
-        return
 
-    layer = get_channel_layer()
-    if not layer:
-        return
+    def __init__(self):
+        self._buffers: dict = {}
+        self._draining: dict = {}
+        self._thread_loop = None
+        self._lock = threading.Lock()
+
+    def submit(self, batch: list):
+        loop = self._target_loop()
+        loop.call_soon_threadsafe(self._enqueue, loop, batch)
+
+    def flush(self, timeout: float = 5.0):
+        """Wait until the background thread's loop has sent everything queued."""
+        loop = self._thread_loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._idle(loop), loop).result(timeout)
+        except Exception:
+            logger.warning("realtime: pending broadcasts were not sent within %ss", timeout)
+
+    def _target_loop(self):
+        if isinstance(_layer(), InMemoryChannelLayer):
+            try:
+                return asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+            # Set by asgiref in the threads that run sync code for the ASGI server (views, database_sync_to_async).
+            local = SyncToAsync.threadlocal
+            loop = getattr(local, "main_event_loop", None)
+            if loop is not None and getattr(local, "main_event_loop_pid", None) == os.getpid() and loop.is_running():
+                return loop
+        with self._lock:
+            if self._thread_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="realtime-dispatcher", daemon=True).start()
+                self._thread_loop = loop
+                atexit.register(self.flush)
+        return self._thread_loop
+
+    def _enqueue(self, loop, batch):
+        self._buffers.setdefault(loop, []).extend(batch)
+        if loop not in self._draining:
+            self._draining[loop] = loop.create_task(self._drain(loop))
+
+    async def _drain(self, loop):
+        try:
+            while True:
+                batch = self._buffers.pop(loop, None)
+                if not batch:
+                    return
+                layer = _layer()
+                if not layer:
+                    continue
+                by_group = {}
+                for group, message in batch:
+                    by_group.setdefault(group, []).append(message)
+                results = await asyncio.gather(
+                    *(self._send_group(layer, group, messages) for group, messages in by_group.items()), return_exceptions=True
+                )
+                for group, result in zip(by_group, results):
+                    if isinstance(result, Exception):
+                        logger.warning("realtime: group_send to %s failed: %r", group, result)
+        finally:
+            self._draining.pop(loop, None)
+
+    @staticmethod
+    async def _send_group(layer, group, messages):
+        for message in messages:
+            await layer.group_send(group, message)
+
+    async def _idle(self, loop):
+        while loop in self._draining:
+            await asyncio.wait({self._draining[loop]})
+
+
+_dispatcher = _Dispatcher()
+
+
+def _send(group: str, message: dict, persist: bool = False):
+    """
+    Queue a group message for after the current transaction commits (right away outside one).
+    persist: also store it in the RealtimeEvent outbox, so reconnecting sockets can replay it, and tag it
+    with its "seq".
+    """
+    if persist:
+        message = {**message, "seq": RealtimeEvent.record(group, message)}
+    transaction.on_commit(partial(_dispatcher.submit, [(group, message)]))
 
-    async_to_sync(layer.group_send)(
-        f"ticket_{ticket_id}",
-        {"type": "ticket.reply", "ticket_id": ticket_id, "reply": reply_payload},
-    )
+
+def flush(timeout: float = 5.0):
+    """Block until queued broadcasts are sent; for code that exits right after broadcasting."""
+    _dispatcher.flush(timeout)
+
+
+def broadcast_ticket_reply(ticket_id: int, reply_payload: dict):
+    """
+    Best-effort broadcast. If channels isn't fully configured, do nothing.
+    """
+    _send(f"ticket_{ticket_id}", {"type": "ticket.reply", "ticket_id": ticket_id, "reply": reply_payload}, persist=True)
 
 
 def broadcast_ticket_seen(ticket_id: int, payload: dict):
@@ -27,40 +139,30 @@ def broadcast_ticket_seen(ticket_id: int, payload: dict):
     Best-effort broadcast when ticket read receipt changes.
     Payload example: {"user_seen_at": "..."}
     """
-    try:
-        from channels.layers import get_channel_layer
-    except Exception:
-        return
+    _send(f"ticket_{ticket_id}", {"type": "ticket.seen", "ticket_id": ticket_id, "payload": payload}, persist=True)
 
-    layer = get_channel_layer()
-    if not layer:
-        return
 
-    async_to_sync(layer.group_send)(
-        f"ticket_{ticket_id}",
-        {"type": "ticket.seen", "ticket_id": ticket_id, "payload": payload},
-    )
+def broadcast_user_unread(user_id: int, summary: dict):
+    """
+    Ticket owner's unread summary (Ticket.unread_summary) to every ticket socket they have open.
+    Not persisted: every connect sends a fresh summary.
+    """
+    _send(f"user_{user_id}", {"type": "user.unread", **summary})
 
 
 def broadcast_inbox_ticket_created(ticket_payload: dict):
-    try:
-        from channels.layers import get_channel_layer
-    except Exception:
-        return
-    layer = get_channel_layer()
-    if not layer:
-        return
-    async_to_sync(layer.group_send)("admin_inbox", {"type": "inbox.ticket_created", "ticket": ticket_payload})
+    _send("admin_inbox", {"type": "inbox.ticket_created", "ticket": ticket_payload}, persist=True)
 
 
 def broadcast_inbox_ticket_updated(ticket_id: int, delta: dict):
-    try:
-        from channels.layers import get_channel_layer
-    except Exception:
-        return
-    layer = get_channel_layer()
-    if not layer:
-        return
-    async_to_sync(layer.group_send)("admin_inbox", {"type": "inbox.ticket_updated", "ticket_id": ticket_id, "delta": delta})
+    _send("admin_inbox", {"type": "inbox.ticket_updated", "ticket_id": ticket_id, "delta": delta}, persist=True)
 
 
+def broadcast_inbox_tickets_updated(updates: list[dict]):
+    """
+    One inbox event for a bulk action instead of one group_send per ticket.
+    updates: [{"ticket_id": int, "delta": {...}}, ...]
+    """
+    if not updates:
+        return
+    _send("admin_inbox", {"type": "inbox.tickets_updated", "updates": updates}, persist=True)
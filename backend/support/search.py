@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+# Ticket full-text search (`/admin/tickets/search/`, TicketAdmin).
+# Documents are the ticket itself (title + body), each TicketReply and each TicketNote.
+# Hangul / kana / CJK runs are indexed as overlapping bigrams so "환불" matches "환불요청합니다"
+# without a morphological analyzer; other words are indexed as-is (unicode61 case-folds them).
+
+FTS_TABLE = "support_ticket_fts"
+DOC_KINDS = {"ticket": 1, "reply": 2, "note": 3}
+_KIND_BY_CODE = {code: kind for kind, code in DOC_KINDS.items()}
+
+# kana, Hangul compatibility jamo, CJK ideographs, Hangul syllables
+_CJK = "\u3040-\u30ff\u3131-\u318e\u4e00-\u9fff\uac00-\ud7a3"
+_RUN_RE = re.compile(rf"[{_CJK}]+|[^\W{_CJK}]+")
+_CJK_RE = re.compile(rf"[{_CJK}]")
+
+
+def ngram_terms(text: str) -> list[str]:
+    """Index terms: CJK runs → overlapping bigrams (a lone syllable is kept), other words unchanged."""
+    terms = []
+    for run in _RUN_RE.findall(text or ""):
+        if _CJK_RE.match(run) and len(run) > 1:
+            terms.extend(run[i : i + 2] for i in range(len(run) - 1))
+        else:
+            terms.append(run)
+    return terms
+
+
+def ngram_text(text: str) -> str:
+    return " ".join(ngram_terms(text))
+
+
+def fts_query(q: str) -> str:
+    """
+    User query → FTS5 MATCH expression (every term required).
+    - CJK run: phrase of its bigrams, so syllable order is kept ("환불요청" ≠ "요청환불")
+    - single syllable / other words: prefix match ("refun" → "refund")
+    Terms only ever contain word characters, so nothing needs escaping.
+    """
+    parts = []
+    for run in _RUN_RE.findall(q or ""):
+        if _CJK_RE.match(run) and len(run) > 1:
+            parts.append('"' + " ".join(ngram_terms(run)) + '"')
+        else:
+            parts.append(f'"{run}"*')
+    return " AND ".join(parts)
+
+
+def highlight(text: str, q: str, width: int = 80) -> str:
+    """HTML-escaped snippet of `text` around the first query term, terms wrapped in <mark>."""
+    text = " ".join((text or "").split())
+    needles = sorted({run.lower() for run in _RUN_RE.findall(q or "")}, key=len, reverse=True)
+    pattern = re.compile("|".join(re.escape(n) for n in needles), re.IGNORECASE) if needles else None
+    first = pattern.search(text) if pattern else None
+    start = max(0, first.start() - width // 3) if first else 0
+    window = text[start : start + width]
+
+    out, pos = [], 0
+    for m in pattern.finditer(window) if pattern else []:
+        out.append(html.escape(window[pos : m.start()]))
+        out.append(f"<mark>{html.escape(m.group(0))}</mark>")
+        pos = m.end()
+    out.append(html.escape(window[pos:]))
+    return ("…" if start > 0 else "") + "".join(out) + ("…" if start + width < len(text) else "")
+
+
+@dataclass
+class SearchHit:
+    ticket_id: int
+    score: float  # lower is better (bm25)
+    kind: str  # "ticket" | "reply" | "note": the best-matching document
+    text: str  # that document's text, for highlight()
+
+
+class SearchBackend:
+    """
+    Pluggable search backend (settings.SUPPORT_SEARCH_BACKEND, dotted path).
+    Index hooks are called from signals.py inside the writing transaction; backends without
+    an index (the LIKE fallback) simply ignore them.
+    """
+
+    name = "base"
+
+    def is_available(self) -> bool:
+        return True
+
+    def index(self, kind: str, doc_id: int, ticket_id: int, title: str, body: str, created: bool = False) -> None:
+        pass
+
+    def remove(self, kind: str, doc_id: int) -> None:
+        pass
+
+    def rebuild(self) -> int:
+        return 0
+
+    def search(self, q: str, limit: int) -> list[SearchHit]:
+        return []
+
+
+class LikeSearchBackend(SearchBackend):
+    """Unindexed icontains fallback (any database). Unranked: newest activity first."""
+
+    name = "like"
+
+    def search(self, q: str, limit: int) -> list[SearchHit]:
+        from .models import Ticket
+
+        q = (q or "").strip()
+        if not q:
+            return []
+        match = Q(title__icontains=q) | Q(body__icontains=q) | Q(replies__body__icontains=q) | Q(notes__body__icontains=q)
+        rows = Ticket.objects.filter(match).distinct().order_by("-updated_at", "-id").values_list("id", "title", "body")
+        return [SearchHit(ticket_id=tid, score=0.0, kind="ticket", text=f"{title}\n{body}") for tid, title, body in rows[:limit]]
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    """
+    SQLite FTS5 table (created by migration 0043): indexed `title`/`body` hold ngram_text(),
+    `raw` keeps the original text for snippets. rowid = doc_id * 4 + kind code, so updates and
+    deletes are rowid lookups rather than scans over UNINDEXED columns.
+    """
+
+    name = "sqlite_fts5"
+    title_weight = 5.0
+
+    def __init__(self):
+        self._available = None
+
+    def is_available(self) -> bool:
+        if self._available is None:
+            self._available = connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names()
+        return self._available
+
+    @staticmethod
+    def rowid(kind: str, doc_id: int) -> int:
+        return int(doc_id) * 4 + DOC_KINDS[kind]
+
+    def index(self, kind, doc_id, ticket_id, title, body, created=False):
+        rowid = self.rowid(kind, doc_id)
+        raw = f"{title}\n{body}" if title else (body or "")
+        with connection.cursor() as cur:
+            if not created:
+                cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [rowid])
+            cur.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, body, ticket_id, raw) VALUES (%s, %s, %s, %s, %s)",
+                [rowid, ngram_text(title), ngram_text(body), ticket_id, raw],
+            )
+
+    def remove(self, kind, doc_id):
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [self.rowid(kind, doc_id)])
+
+    def rebuild(self) -> int:
+        self._available = None
+        if not self.is_available():
+            return 0
+        sql = f"INSERT INTO {FTS_TABLE} (rowid, title, body, ticket_id, raw) VALUES (%s, %s, %s, %s, %s)"
+        total, batch = 0, []
+        with connection.cursor() as cur:
+            cur.execute(f"DELETE FROM {FTS_TABLE}")
+            for kind, doc_id, ticket_id, title, body in _documents():
+                raw = f"{title}\n{body}" if title else body
+                batch.append([self.rowid(kind, doc_id), ngram_text(title), ngram_text(body), ticket_id, raw])
+                if len(batch) >= 2000:
+                    cur.executemany(sql, batch)
+                    total, batch = total + len(batch), []
+            if batch:
+                cur.executemany(sql, batch)
+                total += len(batch)
+        return total
+
+    def search(self, q, limit):
+        match = fts_query(q)
+        if not match:
+            return []
+        # Best document per ticket: SQLite returns the bare columns of the row that produced MIN().
+        # MATERIALIZED keeps bm25() in the MATCH query (it cannot run in a flattened subquery).
+        sql = (
+            f"WITH hits AS MATERIALIZED ("
+            f"  SELECT rowid AS doc, ticket_id, raw, bm25({FTS_TABLE}, %s, 1.0) AS score"
+            f"  FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+            f") SELECT ticket_id, doc, raw, MIN(score) FROM hits GROUP BY ticket_id ORDER BY MIN(score) LIMIT %s"
+        )
+        with connection.cursor() as cur:
+            cur.execute(sql, [self.title_weight, match, limit])
+            rows = cur.fetchall()
+        return [
+            SearchHit(ticket_id=int(tid), score=float(score), kind=_KIND_BY_CODE[int(doc) % 4], text=raw or "")
+            for tid, doc, raw, score in rows
+        ]
+
+
+def _documents():
+    """(kind, doc_id, ticket_id, title, body) for every searchable row."""
+    from .models import Ticket, TicketNote, TicketReply
+
+    for tid, title, body in Ticket.objects.order_by().values_list("id", "title", "body").iterator(chunk_size=2000):
+        yield "ticket", tid, tid, title or "", body or ""
+    for model, kind in ((TicketReply, "reply"), (TicketNote, "note")):
+        for doc_id, tid, body in model.objects.order_by().values_list("id", "ticket_id", "body").iterator(chunk_size=2000):
+            yield kind, doc_id, tid, "", body or ""
+
+
+@lru_cache(maxsize=1)
+def get_search_backend() -> SearchBackend:
+    backend = import_string(getattr(settings, "SUPPORT_SEARCH_BACKEND", "support.search.SQLiteFTS5Backend"))()
+    return backend if backend.is_available() else LikeSearchBackend()
+
+
+def index_ticket(ticket, created: bool = False) -> None:
+    get_search_backend().index("ticket", ticket.id, ticket.id, ticket.title or "", ticket.body or "", created)
+
+
+def index_child(kind: str, obj, created: bool = False) -> None:
+    """TicketReply / TicketNote."""
+    get_search_backend().index(kind, obj.id, obj.ticket_id, "", obj.body or "", created)
+
+
+def unindex(kind: str, doc_id: int) -> None:
+    get_search_backend().remove(kind, doc_id)
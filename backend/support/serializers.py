@@ -37,6 +37,18 @@ def _abs_url(request, url: str) -> str:
     return f"/{url}"
 
 
+def _profile_of(u) -> Profile:
+    """
+    Read-path profile access: never writes. Profiles are created by the User post_save hook
+    (and backfill_profiles for legacy rows); a missing one falls back to an unsaved blank Profile.
+    Load users with select_related/prefetch_related("...profile") to keep this query-free.
+    """
+    try:
+        return u.profile
+    except Profile.DoesNotExist:
+        return Profile(user_id=u.id)
+
+
 def _profile_avatar_url(request, p: Profile) -> str:
     try:
         if getattr(p, "avatar_file", None):
@@ -151,8 +163,7 @@ class TicketReplySerializer(serializers.ModelSerializer):
         if not obj.author:
             return {"id": None, "name": "운영자", "avatar_url": "", "is_staff": True}
         u = obj.author
-        Profile.objects.get_or_create(user=u)
-        p = u.profile
+        p = _profile_of(u)
         name = (p.display_name or u.get_full_name() or getattr(u, "email", "") or u.get_username()).strip() or "사용자"
         avatar = _profile_avatar_url(request, p)
         return {"id": u.id, "name": name, "avatar_url": avatar, "is_staff": bool(getattr(u, "is_staff", False))}
@@ -175,6 +186,16 @@ class TicketReplySerializer(serializers.ModelSerializer):
         return out
 
 
+class TicketTagsField(serializers.ListField):
+    """Ticket.tags: a list of at most 50 tag names (TicketTagAssignment.sync maps them to existing tags)."""
+
+    child = serializers.CharField(max_length=100)
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("max_length", 50)
+        super().__init__(**kwargs)
+
+
 class TicketSerializer(serializers.ModelSerializer):
     category = TicketCategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
@@ -183,7 +204,7 @@ class TicketSerializer(serializers.ModelSerializer):
     replies = TicketReplySerializer(many=True, read_only=True)
     status_label = serializers.CharField(source="get_status_display", read_only=True)
     attachments = serializers.SerializerMethodField()
-    tags = serializers.JSONField(required=False, default=list)
+    tags = TicketTagsField(required=False, default=list)
     priority = serializers.CharField(required=False, default="NORMAL")
     channel = serializers.CharField(required=False, default="inapp")
     team = serializers.CharField(required=False, allow_blank=True, default="")
@@ -313,38 +334,119 @@ class AdminTicketSerializer(TicketSerializer):
         ]
 
     def get_user_name(self, obj: Ticket) -> str:
-        try:
-            Profile.objects.get_or_create(user=obj.user)
-            p = obj.user.profile
-            return (p.display_name or obj.user.get_full_name() or obj.user.first_name or obj.user.get_username()).strip()
-        except Exception:
-            return (getattr(obj.user, "get_username", lambda: "")() or "").strip()
+        return _user_display_name(obj.user)
 
     def get_user_avatar_url(self, obj: Ticket) -> str:
         request = self.context.get("request")
-        try:
-            Profile.objects.get_or_create(user=obj.user)
-            return _profile_avatar_url(request, obj.user.profile)
-        except Exception:
-            return ""
+        return _profile_avatar_url(request, _profile_of(obj.user))
 
     def get_user_has_seen_latest_staff(self, obj: Ticket) -> bool:
         """
         관리자 UI에서만 사용: '운영자(스태프) 마지막 메시지'를 유저가 확인했는지 여부.
+        유저에게 보이는 공개 답변 기준이며 내부 메모(is_internal)는 제외합니다.
         """
         seen_at = obj.user_seen_at
-        if not seen_at:
+        if not seen_at or not obj.last_staff_reply_at:
             return False
-        last_staff = None
-        try:
-            last_staff = (
-                obj.replies.filter(author__is_staff=True).order_by("-created_at").values_list("created_at", flat=True).first()
-            )
-        except Exception:
-            last_staff = None
-        if not last_staff:
+        return seen_at >= obj.last_staff_reply_at
+
+
+def _user_display_name(u) -> str:
+    """Profile-aware display name without touching the DB (expects select_related("...profile"))."""
+    if not u:
+        return ""
+    return (_profile_of(u).display_name or u.get_full_name() or u.first_name or u.get_username()).strip()
+
+
+class AdminTicketRowSerializer(serializers.ModelSerializer):
+    """
+    Compact inbox row for admin ticket lists: no replies, attachments, notes or client_meta.
+    Built from Ticket's denormalized conversation columns plus select_related user/assignee profiles,
+    so a page is a fixed number of queries.
+    """
+
+    status_label = serializers.CharField(source="get_status_display", read_only=True)
+    assignee_id = serializers.IntegerField(read_only=True)
+    assignee_name = serializers.SerializerMethodField()
+    category_id = serializers.IntegerField(read_only=True)
+    category_name = serializers.CharField(source="category.name", read_only=True, default="")
+    user_id = serializers.IntegerField(read_only=True)
+    user_email = serializers.EmailField(source="user.email", read_only=True)
+    user_name = serializers.SerializerMethodField()
+    user_avatar_url = serializers.SerializerMethodField()
+    last_message_preview = serializers.SerializerMethodField()
+    last_message_at = serializers.SerializerMethodField()
+    last_user_message_at = serializers.SerializerMethodField()
+    last_staff_message_at = serializers.DateTimeField(source="last_staff_reply_at", read_only=True)
+    reply_count = serializers.IntegerField(read_only=True)
+    is_unread = serializers.SerializerMethodField()
+    user_has_seen_latest_staff = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Ticket
+        fields = [
+            "id",
+            "title",
+            "status",
+            "status_label",
+            "priority",
+            "assignee_id",
+            "assignee_name",
+            "team",
+            "tags",
+            "channel",
+            "entry_source",
+            "category_id",
+            "category_name",
+            "user_id",
+            "user_email",
+            "user_name",
+            "user_avatar_url",
+            "last_message_preview",
+            "last_message_at",
+            "last_user_message_at",
+            "last_staff_message_at",
+            "reply_count",
+            "is_unread",
+            "user_has_seen_latest_staff",
+            "reopened_at",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_assignee_name(self, obj: Ticket) -> str:
+        return _user_display_name(obj.assignee)
+
+    def get_user_name(self, obj: Ticket) -> str:
+        return _user_display_name(obj.user)
+
+    def get_user_avatar_url(self, obj: Ticket) -> str:
+        return _profile_avatar_url(self.context.get("request"), _profile_of(obj.user))
+
+    def get_last_message_preview(self, obj: Ticket) -> str:
+        if obj.reply_count:
+            return obj.last_message_preview
+        return (obj.body or "")[: Ticket.PREVIEW_LENGTH]
+
+    def get_last_message_at(self, obj: Ticket):
+        return serializers.DateTimeField().to_representation(obj.last_reply_at or obj.created_at)
+
+    def get_last_user_message_at(self, obj: Ticket):
+        return serializers.DateTimeField().to_representation(obj.last_user_reply_at or obj.created_at)
+
+    def get_is_unread(self, obj: Ticket) -> bool:
+        """고객의 마지막 메시지(또는 최초 문의)를 운영자가 아직 확인하지 않았는지 여부."""
+        last_user = obj.last_user_reply_at or obj.created_at
+        if not obj.staff_seen_at:
+            return True
+        return last_user > obj.staff_seen_at
+
+    def get_user_has_seen_latest_staff(self, obj: Ticket) -> bool:
+        seen_at = obj.user_seen_at
+        if not seen_at or not obj.last_staff_reply_at:
             return False
-        return seen_at >= last_staff
+        return seen_at >= obj.last_staff_reply_at
 
 
 class TicketNoteSerializer(serializers.ModelSerializer):
@@ -378,12 +480,28 @@ class TicketTagSerializer(serializers.ModelSerializer):
     class Meta:
         model = TicketTag
         fields = ["id", "name", "color", "parent", "order", "created_at", "children"]
-    
+
+    def validate_parent(self, parent):
+        if not parent:
+            return parent
+        if self.instance and self.instance.is_ancestor_of(parent):
+            raise serializers.ValidationError("A tag cannot be moved under itself or its own children.")
+        moved = 1
+        if self.instance and self.instance.path and parent.id != self.instance.parent_id:
+            moved = self.instance.height()
+        if parent.depth + moved > TicketTag.MAX_DEPTH:
+            raise serializers.ValidationError(f"Tags nest at most {TicketTag.MAX_DEPTH} levels deep.")
+        return parent
+
     def get_children(self, obj):
-        if hasattr(obj, "children"):
-            children = obj.children.all()
-            return TicketTagSerializer(children, many=True).data
-        return []
+        children = getattr(obj, "tree_children", None)
+        if children is None:
+            # Not assembled by the view (retrieve/create/update): load obj's subtree in one query.
+            if not obj.path:
+                return []
+            (node,) = TicketTag.build_tree(TicketTag.objects.filter(TicketTag.subtree_q(obj.path)))
+            children = node.tree_children
+        return TicketTagSerializer(children, many=True, context=self.context).data
 
 
 # class SupportChannelSerializer(serializers.ModelSerializer):
@@ -433,8 +551,7 @@ class AppSettingsSerializer(serializers.ModelSerializer):
     def get_created_by_name(self, obj: AiLibraryItem) -> str:
         try:
             u = obj.created_by
-            Profile.objects.get_or_create(user=u)
-            p = u.profile
+            p = _profile_of(u)
             return (p.display_name or u.get_full_name() or getattr(u, "email", "") or u.get_username()).strip() or "운영자"
         except Exception:
             return "운영자"
@@ -489,7 +606,9 @@ class MeSerializer(serializers.ModelSerializer):
         profile_data = validated_data.pop("profile", None)
         for k, v in validated_data.items():
             setattr(instance, k, v)
-        instance.save()
+        if validated_data:
+            # request.user may come from the token cache (auth.py): write only the columns being changed.
+            instance.save(update_fields=list(validated_data))
 
         if profile_data is not None:
             profile, _ = Profile.objects.get_or_create(user=instance)
@@ -521,7 +640,8 @@ class RegisterSerializer(serializers.Serializer):
 
         username = email
         user = User.objects.create_user(username=username, email=email, password=password, first_name=name)
-        Profile.objects.get_or_create(user=user, defaults={"display_name": name})
+        # Profile row is created by the User post_save hook.
+        Profile.objects.update_or_create(user=user, defaults={"display_name": name})
         token, _ = Token.objects.get_or_create(user=user)
         return user, token
 
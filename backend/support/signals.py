@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from . import auth, duplicates, search
+from .models import (
+    InboxCounter,
+    Profile,
+    Ticket,
+    TicketAttachment,
+    TicketChangeLog,
+    TicketNote,
+    TicketReply,
+    TicketReplyAttachment,
+    TicketTagAssignment,
+)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _user_created(sender, instance, created, raw=False, **kwargs):
+    # Every user gets a Profile at creation so read paths never have to get_or_create one.
+    # user_id (not user=) so the blank row is not cached on `instance` for callers that fill it in next.
+    if created and not raw:
+        Profile.objects.get_or_create(user_id=instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def _token_user_changed(sender, instance, created=False, raw=False, **kwargs):
+    # Cached token snapshots (auth.py) carry the User columns. A new user has no token yet.
+    if raw or created:
+        return
+    auth.evict_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def _token_deleted(sender, instance, **kwargs):
+    auth.evict_token(instance.key)
+
+
+@receiver(post_save, sender=Ticket)
+def _ticket_saved(sender, instance: Ticket, created=False, update_fields=None, raw=False, **kwargs):
+    TicketChangeLog.record([instance.id])
+    if not raw and (update_fields is None or {"title", "body"} & set(update_fields)):
+        search.index_ticket(instance, created)
+    if not raw and (update_fields is None or "body" in update_fields):
+        duplicates.fingerprint(instance, created)
+    if not raw and (update_fields is None or "tags" in update_fields) and (instance.tags or not created):
+        TicketTagAssignment.sync([instance])
+
+
+@receiver(post_delete, sender=Ticket)
+def _ticket_deleted(sender, instance: Ticket, **kwargs):
+    TicketChangeLog.record([instance.id], kind="DELETE")
+    # post_delete runs inside the deletion's transaction.
+    InboxCounter.move([instance.inbox_state()], [])
+    search.unindex("ticket", instance.id)
+
+
+@receiver(post_save, sender=TicketReply)
+@receiver(post_delete, sender=TicketReply)
+@receiver(post_save, sender=TicketNote)
+@receiver(post_delete, sender=TicketNote)
+@receiver(post_save, sender=TicketTagAssignment)
+@receiver(post_delete, sender=TicketTagAssignment)
+@receiver(post_save, sender=TicketAttachment)
+@receiver(post_delete, sender=TicketAttachment)
+def _ticket_child_changed(sender, instance, **kwargs):
+    TicketChangeLog.record([instance.ticket_id])
+
+
+@receiver(post_save, sender=TicketReplyAttachment)
+@receiver(post_delete, sender=TicketReplyAttachment)
+def _reply_attachment_changed(sender, instance, **kwargs):
+    # Attachments are written after their reply; the ETag validators must see them too.
+    TicketChangeLog.record([instance.reply.ticket_id])
+
+
+@receiver(post_save, sender=TicketReply)
+@receiver(post_save, sender=TicketNote)
+def _ticket_child_indexed(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    if not raw and (update_fields is None or "body" in update_fields):
+        search.index_child("reply" if sender is TicketReply else "note", instance, created)
+
+
+@receiver(post_delete, sender=TicketReply)
+@receiver(post_delete, sender=TicketNote)
+def _ticket_child_unindexed(sender, instance, **kwargs):
+    search.unindex("reply" if sender is TicketReply else "note", instance.id)
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import asyncify
+from .longpoll import ticket_wait
+
 from .views import (
     AdminAgentViewSet,
   AdminTicketCategoryViewSet,
@@ -66,9 +70,10 @@ urlpatterns = [
     path("admin/me/avatar/", MeAvatarView.as_view()),
     path("me/", MeView.as_view()),
     path("me/avatar/", MeAvatarView.as_view()),
+    path("tickets/<int:pk>/wait/", ticket_wait),
     path("attachments/<uuid:public_id>/", TicketAttachmentFileView.as_view(), name="support-ticket-attachment"),
 ]
 
 urlpatterns += router.urls
-
-
+# Hot ticket routes served by ASGI-native wrappers (support/async_views.py).
+urlpatterns = asyncify(urlpatterns, enabled=getattr(settings, "SUPPORT_ASYNC_VIEWS", False))
@@ -1,17 +1,21 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Count, OuterRef, Subquery
-from rest_framework import mixins, permissions, status, viewsets
+from django.db import transaction
+from django.db.models import Q, Count, OuterRef, Prefetch, Subquery
+from rest_framework import mixins, permissions, serializers, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.parsers import FormParser, MultiPartParser, JSONParser
 from rest_framework.pagination import PageNumberPagination
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.core.paginator import InvalidPage
 from django.http import FileResponse, Http404
 from django.core.files.uploadedfile import InMemoryUploadedFile
 import uuid as _uuid
+import datetime as _datetime
+from functools import partial
 import random as _random
 import json as _json
 import requests
@@ -233,14 +237,19 @@ def admin_translate(request):
 from .realtime import (
     broadcast_ticket_reply,
     broadcast_ticket_seen,
+    broadcast_user_unread,
     broadcast_inbox_ticket_created,
     broadcast_inbox_ticket_updated,
+    broadcast_inbox_tickets_updated,
 )
 from .models import (
     FAQ,
     FAQAttachment,
     FAQCategory,
+    ArchivedAttachment,
+    ArchivedTicket,
     FAQView,
+    InboxCounter,
     Profile,
     Ticket,
     TicketAttachment,
@@ -250,6 +259,7 @@ from .models import (
     TicketNote,
     TicketTag,
     TicketTagAssignment,
+    TicketChangeLog,
     SupportTeam,
     AiLibraryItem,
     ChatTemplate,
@@ -262,6 +272,7 @@ from .serializers import (
     FAQSerializer,
     VocEntrySerializer,
     AdminTicketSerializer,
+    AdminTicketRowSerializer,
     LoginSerializer,
     MeSerializer,
     RegisterSerializer,
@@ -271,6 +282,7 @@ from .serializers import (
     TicketSerializer,
     TicketNoteSerializer,
     TicketTagSerializer,
+    TicketTagsField,
     # AdminInboxViewSerializer,
     # SupportTagSerializer,
     # SupportChannelSerializer,
@@ -280,7 +292,13 @@ from .serializers import (
 )
 
 # NOTE: _profile_avatar_url is defined in serializers.py; import locally to avoid circulars.
-from .serializers import _profile_avatar_url
+from .serializers import _profile_avatar_url, _profile_of, _user_display_name
+from .pagination import TicketKeysetPagination
+from .search import get_search_backend, highlight
+from .duplicates import MAX_DISTANCE as DUPLICATE_MAX_DISTANCE, find_duplicates
+from . import archive
+from .idempotency import idempotent
+from .conditional import conditional, inbox_validator, ticket_validator, tickets_validator
 
 User = get_user_model()
 
@@ -379,11 +397,13 @@ class FAQViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, viewsets.Gene
         user = request.user if request.user.is_authenticated else None
         session_id = request.data.get("session_id", "")[:64] if not user else ""
 
-        # Deduplicate: only count one view per user/session per FAQ per day
-        today = timezone.now().date()
+        # Deduplicate: only count one view per user/session per FAQ per day.
+        # Range on viewed_at (not viewed_at__date) so the (faq, viewed_at) index is usable.
+        day_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
         existing = FAQView.objects.filter(
             faq=faq,
-            viewed_at__date=today
+            viewed_at__gte=day_start,
+            viewed_at__lt=day_start + _datetime.timedelta(days=1),
         )
         if user:
             existing = existing.filter(user=user)
@@ -466,8 +486,7 @@ class AdminCustomerViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mix
         )
         out = []
         for u in qs[:200]:
-            Profile.objects.get_or_create(user=u)
-            p = u.profile
+            p = _profile_of(u)
             pi = p.payment_info if isinstance(getattr(p, "payment_info", None), dict) else {}
             last_purchase_at = ""
             try:
@@ -506,8 +525,7 @@ class AdminCustomerViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mix
 
     def retrieve(self, request, pk=None):
         u = self.get_queryset().get(pk=pk)
-        Profile.objects.get_or_create(user=u)
-        p = u.profile
+        p = _profile_of(u)
         pi = p.payment_info if isinstance(getattr(p, "payment_info", None), dict) else {}
         ticket_count = Ticket.objects.filter(user=u).count()
         last_ticket = Ticket.objects.filter(user=u).order_by("-created_at").first()
@@ -576,6 +594,93 @@ class AdminTicketCategoryViewSet(viewsets.ModelViewSet):
     pagination_class = None
 
 
+REPLY_PAGE_DEFAULT = 50
+REPLY_PAGE_MAX = 200
+
+
+def _reply_limit(raw, default=REPLY_PAGE_DEFAULT) -> int:
+    try:
+        return max(1, min(REPLY_PAGE_MAX, int(raw)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _newest_replies_prefetch(ticket_id, limit: int) -> Prefetch:
+    """
+    Newest `limit + 1` replies (newest first) of one ticket for detail responses; the extra row only
+    signals has_more. The slice lives in an id__in subquery because prefetch querysets can't be sliced.
+    `ticket_id` is the raw URL kwarg: a non-numeric one matches nothing and get_object() answers 404.
+    """
+    newest_ids = TicketReply.objects.filter(ticket_id=_int_or_none(ticket_id)).order_by("-created_at", "-id").values("id")[: limit + 1]
+    qs = (
+        TicketReply.objects.filter(id__in=Subquery(newest_ids))
+        .select_related("author__profile")
+        .prefetch_related("attachments")
+        .order_by("-created_at", "-id")
+    )
+    return Prefetch("replies", queryset=qs)
+
+
+def _trim_reply_page(data: dict, limit: int) -> dict:
+    """Turn the newest-first prefetched replies in serialized detail data into a chronological page."""
+    newest_first = list(data.get("replies") or [])
+    has_more = len(newest_first) > limit
+    page = list(reversed(newest_first[:limit]))
+    data["replies"] = page
+    data["replies_has_more"] = has_more
+    data["replies_next_before"] = page[0]["id"] if has_more and page else None
+    return data
+
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _archived_detail_response(archived: ArchivedTicket, serializer_class, context) -> Response:
+    """Detail payload for an archived ticket, rehydrated in memory (read-only; see support/archive.py)."""
+    newest_first = "replies_limit" in context["request"].query_params
+    data = serializer_class(archive.rehydrate(archived, newest_first=newest_first), context=context).data
+    data["archived_at"] = archived.archived_at.isoformat()
+    return Response(data)
+
+
+def _reply_page_response(request, ticket: Ticket, include_internal: bool):
+    """
+    Reply timeline page, newest first by (created_at, id) keyset, returned in chronological order.
+    Query: before=<reply_id> (exclusive), limit=1..200 (default 50)
+    """
+    limit = _reply_limit(request.query_params.get("limit"))
+    qs = (
+        TicketReply.objects.filter(ticket=ticket)
+        .select_related("author__profile")
+        .prefetch_related("attachments")
+        .order_by("-created_at", "-id")
+    )
+    if not include_internal:
+        qs = qs.filter(is_internal=False)
+    before = request.query_params.get("before")
+    if before:
+        if not str(before).isdigit():
+            return Response({"before": "Invalid reply id"}, status=status.HTTP_400_BAD_REQUEST)
+        anchor = TicketReply.objects.filter(ticket=ticket, id=before).values_list("created_at", flat=True).first()
+        if anchor is None:
+            return Response({"before": "Unknown reply"}, status=status.HTTP_400_BAD_REQUEST)
+        qs = qs.filter(Q(created_at__lt=anchor) | Q(created_at=anchor, id__lt=int(before)))
+    rows = list(qs[: limit + 1])
+    has_more = len(rows) > limit
+    rows = list(reversed(rows[:limit]))
+    return Response(
+        {
+            "results": TicketReplySerializer(rows, many=True, context={"request": request}).data,
+            "has_more": has_more,
+            "next_before": rows[0].id if has_more and rows else None,
+        }
+    )
+
+
 class TicketViewSet(viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     parser_classes = [MultiPartParser, FormParser]
@@ -604,11 +709,51 @@ class TicketViewSet(viewsets.ModelViewSet):
     pagination_class = Pagination
 
     def get_queryset(self):
-        return (
-            Ticket.objects.select_related("category")
-            .prefetch_related("attachments", "replies", "replies__author", "replies__attachments")
-            .filter(user=self.request.user)
-        )
+        qs = Ticket.objects.select_related("category").filter(user=self.request.user)
+        if self.action == "retrieve" and "replies_limit" in self.request.query_params:
+            limit = _reply_limit(self.request.query_params["replies_limit"])
+            qs = qs.prefetch_related("attachments", _newest_replies_prefetch(self.kwargs.get("pk"), limit))
+        elif self.action in ["list", "retrieve"]:
+            # Only full-payload reads need the conversation; write actions just need the row.
+            qs = qs.prefetch_related("attachments", "replies", "replies__author__profile", "replies__attachments")
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        """Conditional GET: `If-None-Match` → 304 while none of the caller's tickets changed."""
+        validator = tickets_validator(Ticket.objects.filter(user=request.user))
+        return conditional(request, validator, partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        `?replies_limit=N` returns only the newest N replies (+ replies_has_more / replies_next_before).
+        Conditional GET: `If-None-Match` → 304 while the ticket has not changed.
+        """
+        validator = ticket_validator(Ticket.objects.filter(user=request.user), kwargs.get("pk"))
+        return conditional(request, validator, partial(self._detail_response, request, *args, **kwargs))
+
+    def _detail_response(self, request, *args, **kwargs):
+        try:
+            response = super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived = ArchivedTicket.objects.filter(ticket_id=_int_or_none(kwargs.get("pk")), user=request.user).first()
+            if not archived:
+                raise
+            response = _archived_detail_response(archived, TicketSerializer, self.get_serializer_context())
+        if "replies_limit" in request.query_params:
+            _trim_reply_page(response.data, _reply_limit(request.query_params["replies_limit"]))
+        return response
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # A reply to an archived ticket brings it back to the hot tables.
+            if self.action == "replies" and self.request.method == "POST":
+                archived = ArchivedTicket.objects.filter(ticket_id=_int_or_none(self.kwargs.get("pk")), user=self.request.user).first()
+                if archived:
+                    archive.restore(archived)
+                    return super().get_object()
+            raise
 
     def perform_create(self, serializer):
         ticket: Ticket = serializer.save(user=self.request.user)
@@ -667,12 +812,22 @@ class TicketViewSet(viewsets.ModelViewSet):
                 content_type=getattr(optimized, "content_type", "") or getattr(f, "content_type", "") or "",
             )
 
-    @action(detail=True, methods=["post"])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @action(detail=True, methods=["get", "post"])
+    @idempotent
     def replies(self, request, pk=None):
+        """GET: paginated reply timeline (?before=<reply_id>&limit=50). POST: add a user reply."""
         ticket: Ticket = self.get_object()
+        if request.method == "GET":
+            return _reply_page_response(request, ticket, include_internal=False)
         ser = TicketReplyCreateSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
-        reply = TicketReply.objects.create(ticket=ticket, author=request.user, body=ser.validated_data["body"])
+        with transaction.atomic():
+            reply = TicketReply.objects.create(ticket=ticket, author=request.user, body=ser.validated_data["body"])
+            ticket.record_reply(reply)
 
         # Capture client_meta for replies as well (best-effort)
         try:
@@ -726,12 +881,20 @@ class TicketViewSet(viewsets.ModelViewSet):
         - admin UI에서만 '유저가 읽었는지' 확인할 수 있도록 서버에 저장한다.
         """
         ticket: Ticket = self.get_object()
+        was_unread = ticket.is_unread()
         ticket.user_seen_at = timezone.now()
         ticket.save(update_fields=["user_seen_at", "updated_at"])
         payload = {"user_seen_at": ticket.user_seen_at.isoformat()}
         broadcast_ticket_seen(ticket.id, payload)
+        if was_unread:
+            broadcast_user_unread(ticket.user_id, Ticket.unread_summary(ticket.user_id))
         return Response(payload)
 
+    @action(detail=False, methods=["get"])
+    def unread(self, request):
+        """{count, ticket_ids}: the caller's tickets with a staff reply newer than their last read receipt."""
+        return Response(Ticket.unread_summary(request.user.id))
+
 
 class TicketAttachmentFileView(APIView):
     """
@@ -755,6 +918,9 @@ class TicketAttachmentFileView(APIView):
                 .select_related("reply", "reply__ticket", "reply__ticket__user")
                 .first()
             )
+        if not a and not r:
+            # Attachments of archived tickets keep their public URL.
+            a = ArchivedAttachment.objects.filter(public_id=public_id).first()
         if not a and not r:
             raise Http404()
 
@@ -772,18 +938,154 @@ class TicketAttachmentFileView(APIView):
         return resp
 
 
+def _csv_param(params, key: str) -> list[str]:
+    raw = params.get(key)
+    if raw in [None, ""]:
+        return []
+    return [v.strip() for v in str(raw).split(",") if v.strip()]
+
+
+def _parse_since(raw: str):
+    """Accept ISO datetime (a '+' offset may arrive as a space in query strings) or YYYY-MM-DD."""
+    raw = (raw or "").strip()
+    dt = parse_datetime(raw) or parse_datetime(raw.replace(" ", "+"))
+    if dt is None:
+        d = parse_date(raw)
+        if d is None:
+            return None
+        dt = _datetime.datetime(d.year, d.month, d.day)
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def _filter_admin_tickets(qs, params):
+    """
+    Server-side inbox filters (comma-separated values are OR'ed):
+      status, assignee_id ("none" = unassigned), team, priority, channel, category, tag, updated_since
+    - tag matches tag names case-insensitively through the TicketTagAssignment join, not Ticket.tags,
+      at any level, and includes each matched tag's subtree (tag=결제 also finds tickets tagged 결제/카드)
+    """
+    statuses = _csv_param(params, "status")
+    if statuses:
+        qs = qs.filter(status__in=statuses)
+    assignees = _csv_param(params, "assignee_id")
+    if assignees:
+        cond = Q()
+        ids = [int(a) for a in assignees if a.isdigit() and a != "0"]
+        if ids:
+            cond |= Q(assignee_id__in=ids)
+        if any(a.lower() in ["none", "null", "0"] for a in assignees):
+            cond |= Q(assignee__isnull=True)
+        qs = qs.filter(cond) if cond else qs.none()
+    for key in ["team", "priority", "channel"]:
+        values = _csv_param(params, key)
+        if values:
+            qs = qs.filter(**{f"{key}__in": values})
+    categories = [int(c) for c in _csv_param(params, "category") if c.isdigit()]
+    if categories:
+        qs = qs.filter(category_id__in=categories)
+    tags = _csv_param(params, "tag")
+    if tags:
+        # A plain name matches that name at every level; "결제/카드" names one chain (TicketTag.lookup).
+        plain = [t for t in tags if "/" not in t]
+        matched = [*TicketTag.matching(plain), *TicketTag.lookup([t for t in tags if "/" in t]).values()]
+        tagged = TicketTagAssignment.objects.filter(tag__in=TicketTag.subtree(matched).values("id"))
+        qs = qs.filter(id__in=tagged.values("ticket_id"))
+    if params.get("updated_since"):
+        since = _parse_since(params.get("updated_since"))
+        if since is None:
+            raise ValidationError({"updated_since": "Invalid datetime"})
+        qs = qs.filter(updated_at__gte=since)
+    return qs
+
+
+SEARCH_CANDIDATES = 500
+
+
+def _inbox_rows_queryset():
+    """Queryset for AdminTicketRowSerializer: counters are Ticket columns, names come via select_related."""
+    return Ticket.objects.select_related("category", "user__profile", "assignee__profile")
+
+
 class AdminTicketViewSet(viewsets.ModelViewSet):
     """
     운영자(스태프) 전용: 전체 티켓 조회/상태변경/운영자 답변 등록
+    - list: compact inbox rows (AdminTicketRowSerializer)
+    - retrieve: full payload (replies/attachments/notes/client_meta)
     """
 
     serializer_class = AdminTicketSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = TicketKeysetPagination
+
+    # Actions that respond with the full AdminTicketSerializer payload (replies/attachments/notes).
+    full_payload_actions = {"retrieve", "update", "partial_update", "set_meta", "set_status"}
 
     def get_queryset(self):
-        return Ticket.objects.select_related("category", "user").prefetch_related(
-            "attachments", "replies", "replies__author", "replies__attachments", "notes", "notes__author"
-        ).all()
+        if self.action == "list":
+            return _inbox_rows_queryset()
+        qs = Ticket.objects.select_related("category", "user__profile")
+        if self.action == "retrieve" and "replies_limit" in self.request.query_params:
+            limit = _reply_limit(self.request.query_params["replies_limit"])
+            qs = qs.prefetch_related("attachments", _newest_replies_prefetch(self.kwargs.get("pk"), limit), "notes", "notes__author")
+        elif self.action in self.full_payload_actions:
+            qs = qs.prefetch_related(
+                "attachments", "replies", "replies__author__profile", "replies__attachments", "notes", "notes__author"
+            )
+        return qs
+
+    def list(self, request, *args, **kwargs):
+        """Conditional GET: `If-None-Match` → 304 while the inbox change log has not moved."""
+        return conditional(request, inbox_validator(), partial(super().list, request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        `?replies_limit=N` returns only the newest N replies (+ replies_has_more / replies_next_before).
+        Conditional GET: `If-None-Match` → 304 while the ticket has not changed.
+        """
+        validator = ticket_validator(Ticket.objects.all(), kwargs.get("pk"))
+        return conditional(request, validator, partial(self._detail_response, request, *args, **kwargs))
+
+    def _detail_response(self, request, *args, **kwargs):
+        try:
+            response = super().retrieve(request, *args, **kwargs)
+        except Http404:
+            archived = ArchivedTicket.objects.filter(ticket_id=_int_or_none(kwargs.get("pk"))).first()
+            if not archived:
+                raise
+            response = _archived_detail_response(archived, AdminTicketSerializer, self.get_serializer_context())
+        if "replies_limit" in request.query_params:
+            _trim_reply_page(response.data, _reply_limit(request.query_params["replies_limit"]))
+        return response
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            # Answering an archived ticket restores it, same as a user reply.
+            if self.action == "staff_reply":
+                archived = ArchivedTicket.objects.filter(ticket_id=_int_or_none(self.kwargs.get("pk"))).first()
+                if archived:
+                    archive.restore(archived)
+                    return super().get_object()
+            raise
+
+    @action(detail=True, methods=["get"])
+    def replies(self, request, pk=None):
+        """Paginated reply timeline incl. internal replies (?before=<reply_id>&limit=50)."""
+        return _reply_page_response(request, self.get_object(), include_internal=True)
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return AdminTicketRowSerializer
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action == "list":
+            queryset = _filter_admin_tickets(queryset, self.request.query_params)
+        return queryset
 
     @action(detail=True, methods=["post"])
     def ai_generate_reply(self, request, pk=None):
@@ -808,7 +1110,7 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
         conversation_history = []
         conversation_history.append(f"[고객 최초 문의]\n제목: {title}\n내용: {body}")
 
-        for r in ticket.replies.all().order_by("created_at"):
+        for r in ticket.replies.select_related("author").order_by("created_at"):
             is_staff = r.author and r.author.is_staff
             prefix = "[상담원 답변]" if is_staff else "[고객 추가 메시지]"
             conversation_history.append(f"{prefix}\n{r.body}")
@@ -874,13 +1176,16 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
         return Response({"reply": reply, "source": "heuristic"})
 
     @action(detail=True, methods=["post"])
+    @idempotent
     def staff_reply(self, request, pk=None):
         ticket: Ticket = self.get_object()
+        was_unread = ticket.is_unread()
         ser = TicketReplyCreateSerializer(data=request.data)
         ser.is_valid(raise_exception=True)
         # 운영자 답변도 실제 작성자(상담원) 정보를 저장해 ChannelTalk 스타일 UI(아바타/닉네임)를 지원
-        Profile.objects.get_or_create(user=request.user)
-        reply = TicketReply.objects.create(ticket=ticket, author=request.user, body=ser.validated_data["body"])
+        with transaction.atomic():
+            reply = TicketReply.objects.create(ticket=ticket, author=request.user, body=ser.validated_data["body"])
+            ticket.record_reply(reply)
         files = request.FILES.getlist("files")
         for f in files:
             # 이미지 최적화 (큰 이미지 자동 리사이즈)
@@ -909,6 +1214,8 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
 
         payload = TicketReplySerializer(reply, context={"request": request}).data
         broadcast_ticket_reply(ticket.id, payload)
+        if not was_unread and ticket.is_unread():
+            broadcast_user_unread(ticket.user_id, Ticket.unread_summary(ticket.user_id))
         return Response(payload, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["post"])
@@ -961,8 +1268,12 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
             ticket.team = data.get("team") or ""
             delta["team"] = ticket.team
         if "tags" in data:
-            old_tags = set(t.lower() for t in (ticket.tags or []))
-            ticket.tags = data.get("tags") or []
+            try:
+                tags = TicketTagsField().run_validation(data.get("tags") or [])
+            except serializers.ValidationError as e:
+                return Response({"tags": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+            old_tags = set(t.lower() for t in (ticket.tags or []) if isinstance(t, str))
+            ticket.tags = tags
             delta["tags"] = ticket.tags
             new_tags = set(t.lower() for t in ticket.tags)
             added_tags = new_tags - old_tags
@@ -985,24 +1296,297 @@ class AdminTicketViewSet(viewsets.ModelViewSet):
         broadcast_inbox_ticket_updated(ticket.id, {"status": status_value, "status_label": ticket.get_status_display()})
         return Response(AdminTicketSerializer(ticket).data)
 
+    BULK_MAX_IDS = 1000
+
+    def _bulk_ids(self, data):
+        """Parse `ids` for bulk actions → (ids, error Response or None)."""
+        ids = data.get("ids") or []
+        if not isinstance(ids, list) or not ids:
+            return None, Response({"ids": "Required"}, status=status.HTTP_400_BAD_REQUEST)
+        ids = list(dict.fromkeys(int(x) for x in ids if str(x).isdigit()))
+        if not ids:
+            return None, Response({"ids": "Required"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.BULK_MAX_IDS:
+            return None, Response({"ids": f"At most {self.BULK_MAX_IDS} tickets per request"}, status=status.HTTP_400_BAD_REQUEST)
+        return ids, None
+
+    def _bulk_update(self, ids, fields: dict, delta: dict):
+        """
+        One set-based UPDATE for every ticket in `ids`, then one batched inbox event.
+        Returns the ids that actually exist.
+        """
+        now = timezone.now()
+        with InboxCounter.track(ids):
+            qs = Ticket.objects.filter(id__in=ids)
+            found = list(qs.values_list("id", flat=True))
+            qs.update(**fields, updated_at=now)
+            # QuerySet.update() bypasses post_save, so feed the change log explicitly.
+            TicketChangeLog.record(found)
+        delta = {**delta, "updated_at": now.isoformat()}
+        broadcast_inbox_tickets_updated([{"ticket_id": tid, "delta": delta} for tid in found])
+        return found
+
     @action(detail=False, methods=["post"])
     def bulk_set_status(self, request):
         """
         Bulk status update for admin inbox actions (e.g., '일괄 종료').
         Body: { ids: number[], status: "PENDING"|"ANSWERED"|"CLOSED" }
+        - CLOSED tickets moved to another status get reopened_at=now (same as a user reply on a closed ticket)
         """
         data = request.data or {}
-        ids = data.get("ids") or []
         status_value = data.get("status")
         allowed = {"PENDING", "ANSWERED", "CLOSED"}
         if status_value not in allowed:
             return Response({"status": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST)
-        if not isinstance(ids, list) or not ids:
-            return Response({"ids": "Required"}, status=status.HTTP_400_BAD_REQUEST)
-        ids = [int(x) for x in ids if str(x).isdigit()]
-        qs = Ticket.objects.filter(id__in=ids)
-        updated = qs.update(status=status_value, updated_at=timezone.now())
-        return Response({"updated": updated, "status": status_value})
+        ids, error = self._bulk_ids(data)
+        if error:
+            return error
+
+        now = timezone.now()
+        reopened = []
+        with InboxCounter.track(ids):
+            qs = Ticket.objects.filter(id__in=ids)
+            found = list(qs.values_list("id", flat=True))
+            if status_value != "CLOSED":
+                reopened = list(qs.filter(status="CLOSED").values_list("id", flat=True))
+                if reopened:
+                    Ticket.objects.filter(id__in=reopened).update(reopened_at=now)
+            qs.update(status=status_value, updated_at=now)
+            TicketChangeLog.record(found)
+
+        delta = {"status": status_value, "status_label": dict(Ticket.STATUS_CHOICES)[status_value], "updated_at": now.isoformat()}
+        reopened_set = set(reopened)
+        broadcast_inbox_tickets_updated([
+            {"ticket_id": tid, "delta": {**delta, "reopened_at": now.isoformat()} if tid in reopened_set else delta}
+            for tid in found
+        ])
+        return Response({"updated": len(found), "status": status_value, "ids": found, "reopened": reopened})
+
+    @action(detail=False, methods=["post"])
+    def bulk_assign(self, request):
+        """
+        Body: { ids: number[], assignee_id: number|null }  (null/0 → unassign)
+        """
+        data = request.data or {}
+        ids, error = self._bulk_ids(data)
+        if error:
+            return error
+        if "assignee_id" not in data:
+            return Response({"assignee_id": "Required"}, status=status.HTTP_400_BAD_REQUEST)
+        assignee_id = data.get("assignee_id")
+        if assignee_id in [None, "", 0, "0"]:
+            assignee_id = None
+        else:
+            try:
+                assignee_id = int(assignee_id)
+            except (TypeError, ValueError):
+                return Response({"assignee_id": "Invalid staff user"}, status=status.HTTP_400_BAD_REQUEST)
+            if not User.objects.filter(id=assignee_id, is_staff=True).exists():
+                return Response({"assignee_id": "Invalid staff user"}, status=status.HTTP_400_BAD_REQUEST)
+        found = self._bulk_update(ids, {"assignee_id": assignee_id}, {"assignee_id": assignee_id})
+        return Response({"updated": len(found), "assignee_id": assignee_id, "ids": found})
+
+    @action(detail=False, methods=["post"])
+    def bulk_set_team(self, request):
+        """
+        Body: { ids: number[], team: string }  ("" → no team)
+        """
+        data = request.data or {}
+        ids, error = self._bulk_ids(data)
+        if error:
+            return error
+        team = (data.get("team") or "").strip()
+        if len(team) > Ticket._meta.get_field("team").max_length:
+            return Response({"team": "Too long"}, status=status.HTTP_400_BAD_REQUEST)
+        found = self._bulk_update(ids, {"team": team}, {"team": team})
+        return Response({"updated": len(found), "team": team, "ids": found})
+
+    @action(detail=False, methods=["post"])
+    def bulk_set_priority(self, request):
+        """
+        Body: { ids: number[], priority: "LOW"|"NORMAL"|"HIGH"|"URGENT" }
+        """
+        data = request.data or {}
+        ids, error = self._bulk_ids(data)
+        if error:
+            return error
+        priority = data.get("priority") or "NORMAL"
+        if priority not in dict(Ticket.PRIORITY_CHOICES):
+            return Response({"priority": "Invalid priority"}, status=status.HTTP_400_BAD_REQUEST)
+        found = self._bulk_update(ids, {"priority": priority}, {"priority": priority})
+        return Response({"updated": len(found), "priority": priority, "ids": found})
+
+    @action(detail=False, methods=["post"])
+    def bulk_tags(self, request):
+        """
+        Body: { ids: number[], add?: string[], remove?: string[] }  (case-insensitive, like set_meta)
+        - only tickets whose tag list actually changes are written (one bulk UPDATE) and broadcast
+        - added VOC tags create VocEntry rows the same way set_meta does
+        """
+        data = request.data or {}
+        ids, error = self._bulk_ids(data)
+        if error:
+            return error
+        add = data.get("add") or []
+        remove = data.get("remove") or []
+        if not isinstance(add, list) or not isinstance(remove, list) or not (add or remove):
+            return Response({"add": "add and/or remove must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        add = list(dict.fromkeys(str(t).strip() for t in add if str(t).strip()))
+        remove_lower = {str(t).strip().lower() for t in remove}
+
+        now = timezone.now()
+        changed = []
+        added_by_ticket = {}
+        with transaction.atomic():
+            for ticket in Ticket.objects.filter(id__in=ids).only("id", "title", "body", "tags"):
+                old = list(ticket.tags) if isinstance(ticket.tags, list) else []
+                new = [t for t in old if str(t).lower() not in remove_lower]
+                seen = {str(t).lower() for t in new}
+                for tag in add:
+                    if tag.lower() not in seen:
+                        new.append(tag)
+                        seen.add(tag.lower())
+                if new == old:
+                    continue
+                ticket.tags = new
+                ticket.updated_at = now
+                changed.append(ticket)
+                added_by_ticket[ticket.id] = seen - {str(t).lower() for t in old}
+            if changed:
+                Ticket.objects.bulk_update(changed, ["tags", "updated_at"])
+                TicketTagAssignment.sync(changed)
+                TicketChangeLog.record([t.id for t in changed])
+                _auto_create_voc_bulk([(t, added_by_ticket[t.id]) for t in changed], request.user)
+
+        broadcast_inbox_tickets_updated([
+            {"ticket_id": t.id, "delta": {"tags": t.tags, "updated_at": now.isoformat()}} for t in changed
+        ])
+        return Response({"updated": len(changed), "ids": [t.id for t in changed]})
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Ranked full-text search over ticket title/body, replies and internal notes (support/search.py).
+        Query: q (required), limit=1..100 (default 20), plus the list filters (status, assignee_id, team, ...)
+        Response: { query, backend, results: [inbox row + { score, match: "ticket"|"reply"|"note", highlight }] }
+        - highlight is an HTML-escaped snippet with the query terms wrapped in <mark>
+        """
+        q = (request.query_params.get("q") or "").strip()
+        if not q:
+            return Response({"q": "Required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = max(1, min(100, int(request.query_params.get("limit") or 20)))
+        except ValueError:
+            return Response({"limit": "Invalid"}, status=status.HTTP_400_BAD_REQUEST)
+
+        backend = get_search_backend()
+        # Over-fetch so the list filters below can still fill a page.
+        hits = {h.ticket_id: h for h in backend.search(q, SEARCH_CANDIDATES)}
+        rows = _filter_admin_tickets(_inbox_rows_queryset().filter(id__in=list(hits)), request.query_params)
+        rank = {tid: i for i, tid in enumerate(hits)}
+        tickets = sorted(rows, key=lambda t: rank[t.id])[:limit]
+
+        results = []
+        for ticket, row in zip(tickets, AdminTicketRowSerializer(tickets, many=True, context={"request": request}).data):
+            hit = hits[ticket.id]
+            results.append({**row, "score": hit.score, "match": hit.kind, "highlight": highlight(hit.text, q)})
+        return Response({"query": q, "backend": backend.name, "results": results})
+
+    @action(detail=True, methods=["get"])
+    def duplicates(self, request, pk=None):
+        """
+        Likely duplicates of this ticket by body SimHash (support/duplicates.py).
+        Query: scope=all|user (default all; user = same customer only), days=1..90 (default 14,
+        around the ticket's creation), max_distance=0..3 differing bits (default 3)
+        Response: { results: [inbox row + { distance, same_user }] }, closest first
+        """
+        ticket: Ticket = self.get_object()
+        scope = request.query_params.get("scope") or "all"
+        if scope not in ("all", "user"):
+            return Response({"scope": "Invalid"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            days = max(1, min(90, int(request.query_params.get("days") or 14)))
+            max_distance = int(request.query_params.get("max_distance") or DUPLICATE_MAX_DISTANCE)
+        except ValueError:
+            return Response({"days": "Invalid"}, status=status.HTTP_400_BAD_REQUEST)
+        max_distance = max(0, min(DUPLICATE_MAX_DISTANCE, max_distance))
+
+        hits = dict(find_duplicates(ticket, days, same_user=(scope == "user"), max_distance=max_distance))
+        tickets = sorted(_inbox_rows_queryset().filter(id__in=list(hits)), key=lambda t: (hits[t.id], -t.id))
+        results = [
+            {**row, "distance": hits[t.id], "same_user": t.user_id == ticket.user_id}
+            for t, row in zip(tickets, AdminTicketRowSerializer(tickets, many=True, context={"request": request}).data)
+        ]
+        return Response({"results": results})
+
+    @action(detail=False, methods=["get"])
+    def counts(self, request):
+        """
+        Sidebar badge counts from InboxCounter (one indexed read, no GROUP BY over tickets).
+        Response: { all, open, waiting, unassigned, status: {STATUS: n}, assignee: {id: n}, team: {name: n} }
+        - assignee/team/waiting/unassigned count open (non-CLOSED) tickets only
+        """
+        data = {
+            "all": 0,
+            "open": 0,
+            "waiting": 0,
+            "unassigned": 0,
+            "status": {value: 0 for value, _label in Ticket.STATUS_CHOICES},
+            "assignee": {},
+            "team": {},
+        }
+        for key, value in InboxCounter.objects.filter(value__gt=0).values_list("key", "value"):
+            group, _, name = key.partition(":")
+            if not name:
+                data[group] = value
+            elif group == "assignee" and name == "none":
+                data["unassigned"] = value
+            elif group in ("status", "assignee", "team"):
+                data[group][name] = value
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        Incremental inbox feed: tickets changed after `since` (a seq from a previous response).
+        Query: since=<seq> (omit to just fetch the current cursor), limit=1..1000 (default 500)
+        Response: { cursor, has_more, reset, changed: [inbox rows], deleted: [ticket ids] }
+        - reset=true: `since` predates the retained log (see prune_ticket_changes) → refetch the list
+        """
+        try:
+            limit = max(1, min(1000, int(request.query_params.get("limit") or 500)))
+        except ValueError:
+            limit = 500
+        raw_since = request.query_params.get("since")
+        latest = TicketChangeLog.objects.order_by("-seq").values_list("seq", flat=True).first() or 0
+        if raw_since in [None, ""]:
+            return Response({"cursor": latest, "has_more": False, "reset": False, "changed": [], "deleted": []})
+        if not str(raw_since).isdigit():
+            return Response({"since": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+        since = int(raw_since)
+
+        oldest = TicketChangeLog.objects.order_by("seq").values_list("seq", flat=True).first()
+        if oldest is not None and since < oldest - 1:
+            return Response({"cursor": latest, "has_more": False, "reset": True, "changed": [], "deleted": []})
+
+        entries = list(TicketChangeLog.objects.filter(seq__gt=since).order_by("seq").values_list("seq", "ticket_id", "kind")[:limit])
+        last_kind = {}
+        for _seq, ticket_id, kind in entries:
+            last_kind[ticket_id] = kind
+        cursor = entries[-1][0] if entries else latest
+        changed_ids = [tid for tid, kind in last_kind.items() if kind != "DELETE"]
+        rows = list(_inbox_rows_queryset().filter(id__in=changed_ids))
+        found = {t.id for t in rows}
+        deleted = [tid for tid, kind in last_kind.items() if kind == "DELETE" or tid not in found]
+        return Response(
+            {
+                "cursor": cursor,
+                "has_more": len(entries) == limit and cursor < latest,
+                "reset": False,
+                "changed": AdminTicketRowSerializer(rows, many=True, context={"request": request}).data,
+                "deleted": deleted,
+            }
+        )
 
 
 class AdminAgentViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
@@ -1011,14 +1595,13 @@ class AdminAgentViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
     def list(self, request, *args, **kwargs):
         out = []
-        for u in User.objects.filter(is_staff=True).order_by("id")[:200]:
-            Profile.objects.get_or_create(user=u)
-            p = u.profile
+        for u in User.objects.filter(is_staff=True).select_related("profile").order_by("id")[:200]:
+            p = _profile_of(u)
             out.append(
                 {
                     "id": u.id,
                     "email": getattr(u, "email", "") or "",
-                    "name": (p.display_name or u.get_full_name() or u.first_name or u.username).strip(),
+                    "name": _user_display_name(u),
                     "avatar_url": _profile_avatar_url(request, p),
                     "status_message": getattr(p, "status_message", "") or "",
                 }
@@ -1057,10 +1640,19 @@ class AdminAgentViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
 
 
 class AdminTicketTagViewSet(viewsets.ModelViewSet):
+    """
+    - list: the whole tree (root tags with nested children), loaded with one query
+    - retrieve/update/destroy work on any tag, children included
+    """
+
     permission_classes = [permissions.IsAdminUser]
     serializer_class = TicketTagSerializer
     pagination_class = None
-    queryset = TicketTag.objects.filter(parent__isnull=True).prefetch_related('children')
+    queryset = TicketTag.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        roots = TicketTag.build_tree(self.get_queryset())
+        return Response(self.get_serializer(roots, many=True).data)
 
 
 # class AdminSupportChannelViewSet(viewsets.ModelViewSet):
@@ -1195,7 +1787,6 @@ class MeView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        Profile.objects.get_or_create(user=request.user)
         return Response(MeSerializer(request.user, context={"request": request}).data)
 
     def patch(self, request):
@@ -1326,7 +1917,8 @@ def test_login(request):
 
     # Create user
     user = User.objects.create_user(username=email, email=email, password=password, first_name=nickname)
-    Profile.objects.get_or_create(
+    # Profile row is created by the User post_save hook; fill in the test account details.
+    Profile.objects.update_or_create(
         user=user,
         defaults={
             "display_name": nickname,
@@ -1383,7 +1975,8 @@ def admin_test_login(request):
         user.is_superuser = True
     user.save()
 
-    Profile.objects.get_or_create(user=user, defaults={"display_name": nickname})
+    # Profile row is created by the User post_save hook; only fill an empty display name.
+    Profile.objects.filter(user=user, display_name="").update(display_name=nickname)
 
     from rest_framework.authtoken.models import Token
 
@@ -1433,15 +2026,16 @@ def admin_analytics(request):
     closed_tickets = tickets.filter(status="CLOSED").count()
     unassigned_tickets = tickets.filter(assignee__isnull=True).count()
 
-    # Average response time (first staff reply)
+    # Average response time (first staff reply, denormalized on Ticket).
+    # Only public replies count: an internal staff note is not a response to the customer. Before the
+    # counters existed any staff-authored reply did, so tickets whose first staff reply was internal
+    # now measure to their first public one (or drop out), which can raise this average.
     response_times = []
-    for ticket in tickets.prefetch_related("replies"):
-        first_staff_reply = ticket.replies.filter(
-            author__is_staff=True
-        ).order_by("created_at").first()
-        if first_staff_reply:
-            diff = (first_staff_reply.created_at - ticket.created_at).total_seconds() / 60  # minutes
-            response_times.append(diff)
+    for created_at, first_staff_reply_at in tickets.filter(first_staff_reply_at__isnull=False).values_list(
+        "created_at", "first_staff_reply_at"
+    ):
+        diff = (first_staff_reply_at - created_at).total_seconds() / 60  # minutes
+        response_times.append(diff)
 
     avg_response_time_min = round(sum(response_times) / len(response_times)) if response_times else 0
 
@@ -1561,6 +2155,34 @@ def _auto_create_voc(ticket, added_tags: set, user):
         )
 
 
+def _auto_create_voc_bulk(pairs, user):
+    """_auto_create_voc for many tickets at once: one lookup for existing entries, one bulk INSERT."""
+    wanted = {}
+    for ticket, added_tags in pairs:
+        for tag_lower in added_tags:
+            voc_type = _VOC_TAG_MAP.get(tag_lower)
+            if voc_type:
+                wanted.setdefault((ticket.id, voc_type), ticket)
+    if not wanted:
+        return
+    existing = set(
+        VocEntry.objects.filter(
+            ticket_id__in={tid for tid, _ in wanted}, voc_type__in={vt for _, vt in wanted}
+        ).values_list("ticket_id", "voc_type")
+    )
+    VocEntry.objects.bulk_create([
+        VocEntry(
+            ticket=ticket,
+            voc_type=voc_type,
+            created_by=user,
+            summary=f"[{ticket.title}] {(ticket.body or '')[:200]}",
+            severity="HIGH" if voc_type == "BUG" else "MEDIUM",
+        )
+        for (tid, voc_type), ticket in wanted.items()
+        if (tid, voc_type) not in existing
+    ])
+
+
 class AdminVocViewSet(viewsets.ModelViewSet):
     """VOC Studio — 고객 의견 수집·분석·관리"""
     serializer_class = VocEntrySerializer
@@ -9,11 +9,15 @@ function defaultApiBase() {
 const rawEnvBase = import.meta.env.VITE_API_BASE;
 const API_BASE = typeof rawEnvBase === "string" && rawEnvBase.trim().length > 0 ? rawEnvBase.trim() : defaultApiBase();
 
+// `seq` orders reply/seen (and admin inbox) events; pass the last one seen as `lastSeq` when reconnecting to get
+// the missed events replayed first. "resync": too much was missed, refetch instead.
 export type TicketRealtimeEvent =
   | { type: "hello"; ticket_id: number }
-  | { type: "reply"; ticket_id: number; reply: any }
+  | { type: "reply"; ticket_id: number; reply: any; seq?: number }
   | { type: "typing"; ticket_id: number; author: { id: number | null; name: string; avatar_url?: string; is_staff?: boolean }; is_typing: boolean }
-  | { type: "seen"; ticket_id: number; user_seen_at?: string };
+  | { type: "seen"; ticket_id: number; user_seen_at?: string; seq?: number }
+  | { type: "unread"; count: number; ticket_ids: number[] }
+  | { type: "resync" };
 
 function wsBaseFromApiBase(apiBase: string): string {
   // API_BASE is like http://host:8000/api -> ws://host:8000
@@ -23,22 +27,89 @@ function wsBaseFromApiBase(apiBase: string): string {
   return `${wsProto}//${u.host}`;
 }
 
-export function connectTicketWS(ticketId: number, tokenKey: "auth_token" | "admin_token"): WebSocket | null {
+function resumeParam(lastSeq?: number | null) {
+  return lastSeq ? `&last_seq=${lastSeq}` : "";
+}
+
+export function connectTicketWS(ticketId: number, tokenKey: "auth_token" | "admin_token", lastSeq?: number | null): WebSocket | null {
   const token = localStorage.getItem(tokenKey);
   if (!token) return null;
   const base = wsBaseFromApiBase(API_BASE);
-  const url = `${base}/ws/tickets/${ticketId}/?token=${encodeURIComponent(token)}`;
+  const url = `${base}/ws/tickets/${ticketId}/?token=${encodeURIComponent(token)}${resumeParam(lastSeq)}`;
   return new WebSocket(url);
 }
 
-export function connectAdminInboxWS(): WebSocket | null {
+export function connectAdminInboxWS(lastSeq?: number | null): WebSocket | null {
   const token = localStorage.getItem("admin_token");
   if (!token) return null;
   const base = wsBaseFromApiBase(API_BASE);
-  const url = `${base}/ws/admin/inbox/?token=${encodeURIComponent(token)}`;
+  const url = `${base}/ws/admin/inbox/?token=${encodeURIComponent(token)}${resumeParam(lastSeq)}`;
   return new WebSocket(url);
 }
 
+export type ResumableSocket = { close: () => void; current: () => WebSocket | null };
+
+// Keeps a socket open across drops: each reconnect passes the highest `seq` seen as `lastSeq`, so the server
+// replays what was missed. onResync runs when the server answers "resync", or on a reconnect before any
+// `seq` was seen; the caller refetches. onGiveUp: refused (4401/4403) or still down after maxRetries tries.
+export function resumableSocket(
+  connect: (lastSeq: number | null) => WebSocket | null,
+  handlers: { onMessage: (msg: any) => void; onResync: () => void; onOpen?: (ws: WebSocket) => void; onGiveUp?: () => void },
+  maxRetries = 5
+): ResumableSocket {
+  let ws: WebSocket | null = null;
+  let lastSeq: number | null = null;
+  let retries = 0;
+  let closed = false;
+  let timer: number | null = null;
+
+  const open = () => {
+    timer = null;
+    ws = connect(lastSeq);
+    if (!ws) {
+      handlers.onGiveUp?.();
+      return;
+    }
+    const socket = ws;
+    const resumed = retries > 0;
+    socket.onopen = () => {
+      if (resumed && lastSeq === null) handlers.onResync();
+      retries = 0;
+      handlers.onOpen?.(socket);
+    };
+    socket.onmessage = (ev) => {
+      let msg: any;
+      try {
+        msg = JSON.parse(ev.data);
+      } catch {
+        return;
+      }
+      if (typeof msg?.seq === "number") lastSeq = Math.max(lastSeq ?? 0, msg.seq);
+      if (msg?.type === "resync") handlers.onResync();
+      else handlers.onMessage(msg);
+    };
+    socket.onclose = (ev) => {
+      if (closed) return;
+      if (ev.code === 4401 || ev.code === 4403 || retries >= maxRetries) {
+        handlers.onGiveUp?.();
+        return;
+      }
+      retries += 1;
+      timer = window.setTimeout(open, Math.min(1000 * 2 ** (retries - 1), 15000));
+    };
+  };
+
+  open();
+  return {
+    close() {
+      closed = true;
+      if (timer) window.clearTimeout(timer);
+      ws?.close();
+    },
+    current: () => ws,
+  };
+}
+
 export function sendTyping(ws: WebSocket | null, isTyping: boolean) {
   try {
     if (!ws || ws.readyState !== WebSocket.OPEN) return;
@@ -1,5 +1,6 @@
 import { ApiError, apiFetch } from "./client";
 import type { Faq, FaqCategory, Me, Ticket, TicketCategory } from "./types";
+import type { TicketRealtimeEvent } from "./realtime";
 
 function getClientMeta() {
   try {
@@ -52,6 +53,11 @@ export function listTickets(params: { page?: number; page_size?: number } = {})
   return apiFetch<{ count: number; next: string | null; previous: string | null; results: Ticket[] }>(`/tickets/${suffix}`);
 }
 
+/** My tickets with a staff reply I have not seen yet (also pushed as `unread` on the ticket WebSocket). */
+export function getUnreadTickets() {
+  return apiFetch<{ count: number; ticket_ids: number[] }>("/tickets/unread/");
+}
+
 export function getTicket(ticketId: number) {
   return apiFetch<Ticket>(`/tickets/${ticketId}/`);
 }
@@ -121,6 +127,16 @@ export function markTicketSeen(ticketId: number) {
   return apiFetch<{ user_seen_at: string }>(`/tickets/${ticketId}/seen/`, { method: "POST" });
 }
 
+/**
+ * Long-poll fallback for the ticket WebSocket: resolves on the next reply/seen event
+ * (same shape as the WS messages) or with no events after `timeout` seconds.
+ */
+export function waitTicketEvents(ticketId: number, afterReplyId: number | null, opts?: { timeout?: number; signal?: AbortSignal }) {
+  const qs = new URLSearchParams({ timeout: String(opts?.timeout ?? 25) });
+  if (afterReplyId != null) qs.set("after_reply_id", String(afterReplyId));
+  return apiFetch<{ events: TicketRealtimeEvent[] }>(`/tickets/${ticketId}/wait/?${qs.toString()}`, { signal: opts?.signal });
+}
+
 export function getMe() {
   return apiFetch<Me>("/me/");
 }
@@ -186,12 +202,40 @@ export function register(input: { email: string; password: string; name?: string
 }
 
 // Admin APIs (IsAdminUser)
+
+// Compact inbox row (AdminTicketRowSerializer): no replies/notes/attachments; load those with adminGetTicket.
+export type AdminTicketRow = {
+  id: number;
+  title: string;
+  status: "PENDING" | "ANSWERED" | "CLOSED";
+  status_label: string;
+  priority: string;
+  assignee_id: number | null;
+  assignee_name: string;
+  team: string;
+  tags: string[];
+  channel: string;
+  entry_source: string;
+  category_id: number | null;
+  category_name: string;
+  user_id: number;
+  user_email: string;
+  user_name: string;
+  user_avatar_url: string;
+  last_message_preview: string;
+  last_message_at: string;
+  last_user_message_at: string;
+  last_staff_message_at: string | null;
+  reply_count: number;
+  is_unread: boolean;
+  user_has_seen_latest_staff: boolean;
+  reopened_at: string | null;
+  created_at: string;
+  updated_at: string;
+};
+
 export function adminListTickets() {
-  return apiFetch<{ count: number; next: string | null; previous: string | null; results: (Ticket & { user_email: string; user_name: string; user_id: number })[] }>(
-    "/admin/tickets/",
-    {},
-    "admin_token"
-  );
+  return apiFetch<{ count?: number; next: string | null; previous: string | null; results: AdminTicketRow[] }>("/admin/tickets/", {}, "admin_token");
 }
 
 export function adminGetTicket(ticketId: number) {
@@ -242,6 +286,22 @@ export function adminBulkSetTicketStatus(ids: number[], status: "PENDING" | "ANS
   );
 }
 
+export function adminBulkAssignTickets(ids: number[], assignee_id: number | null) {
+  return apiFetch<{ updated: number; assignee_id: number | null; ids: number[] }>(
+    `/admin/tickets/bulk_assign/`,
+    { method: "POST", headers: { "Content-Type": "application/json" }, body: JSON.stringify({ ids, assignee_id }) },
+    "admin_token"
+  );
+}
+
+export function adminBulkSetTicketTags(ids: number[], input: { add?: string[]; remove?: string[] }) {
+  return apiFetch<{ updated: number; ids: number[] }>(
+    `/admin/tickets/bulk_tags/`,
+    { method: "POST", headers: { "Content-Type": "application/json" }, body: JSON.stringify({ ids, ...input }) },
+    "admin_token"
+  );
+}
+
 export function adminSetTicketMeta(
   ticketId: number,
   input: Partial<{ assignee_id: number | null; priority: string; tags: string[]; channel: string; team: string }>
@@ -12,9 +12,9 @@ import {
   TextField,
   Typography,
 } from "@mui/material";
-import { useEffect, useMemo, useState } from "react";
+import { useEffect, useState } from "react";
 
-import { adminListTickets, adminSetTicketStatus, adminStaffReply, login } from "../api/support";
+import { adminGetTicket, adminListTickets, adminSetTicketStatus, adminStaffReply, login, type AdminTicketRow } from "../api/support";
 
 type AdminTicket = {
   id: number;
@@ -36,13 +36,14 @@ function statusColor(status: AdminTicket["status"]) {
 }
 
 export function AdminPage() {
-  const [data, setData] = useState<AdminTicket[] | null>(null);
+  const [data, setData] = useState<AdminTicketRow[] | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [success, setSuccess] = useState<string | null>(null);
   const [activeId, setActiveId] = useState<number | null>(null);
   const [replyBody, setReplyBody] = useState("");
   const [busy, setBusy] = useState(false);
-  const active = useMemo(() => data?.find((t) => t.id === activeId) ?? null, [data, activeId]);
+  // The list holds compact rows; the selected ticket's body and replies come from the detail endpoint.
+  const [active, setActive] = useState<AdminTicket | null>(null);
 
   async function ensureAdminToken() {
     if (localStorage.getItem("auth_token")) return;
@@ -56,8 +57,9 @@ export function AdminPage() {
     setData(null);
     await ensureAdminToken();
     const res = await adminListTickets();
-    setData(res.results as AdminTicket[]);
+    setData(res.results);
     if (!activeId && res.results.length) setActiveId(res.results[0].id);
+    else if (activeId) setActive(await adminGetTicket(activeId));
   }
 
   useEffect(() => {
@@ -65,6 +67,19 @@ export function AdminPage() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  useEffect(() => {
+    if (!activeId) return;
+    let cancelled = false;
+    adminGetTicket(activeId)
+      .then((t) => {
+        if (!cancelled) setActive(t as AdminTicket);
+      })
+      .catch((e) => setError(String(e?.message ?? e)));
+    return () => {
+      cancelled = true;
+    };
+  }, [activeId]);
+
   async function onSetStatus(next: AdminTicket["status"]) {
     if (!active) return;
     setBusy(true);
@@ -13,8 +13,8 @@ import { useEffect, useMemo, useRef, useState } from "react";
 import { useNavigate, useParams } from "react-router-dom";
 
 import type { Ticket } from "../api/types";
-import { getMe, getTicket, markTicketSeen } from "../api/support";
-import { connectTicketWS, type TicketRealtimeEvent } from "../api/realtime";
+import { getMe, getTicket, markTicketSeen, waitTicketEvents } from "../api/support";
+import { connectTicketWS, resumableSocket, type ResumableSocket, type TicketRealtimeEvent } from "../api/realtime";
 import { ChatThread, type ChatMessage } from "../ui/chat/ChatThread";
 import { useChatAutoScroll } from "../ui/chat/useChatAutoScroll";
 import { markSeen } from "../ui/chat/seen";
@@ -38,6 +38,7 @@ export function TicketDetailPage() {
   const [staffTyping, setStaffTyping] = useState<{ name: string; at: number } | null>(null);
   const wsRef = useRef<WebSocket | null>(null);
   const lastSeenSentAt = useRef<number>(0);
+  const lastReplyId = useRef<number | null>(null);
 
   const thread = useMemo(() => {
     if (!ticket) return [];
@@ -87,6 +88,7 @@ export function TicketDetailPage() {
       setError(null);
     }
     const data = await getTicket(ticketId);
+    lastReplyId.current = Math.max(lastReplyId.current ?? 0, ...(data.replies ?? []).map((r: any) => r.id ?? 0));
     setTicket(data);
   }
 
@@ -101,59 +103,74 @@ export function TicketDetailPage() {
       setError(t("ticketDetail.loginRequired"));
       return;
     }
+    lastReplyId.current = null;
     getMe().then(setMe).catch(() => setMe(null));
     refresh().catch((e) => setError(String(e?.message ?? e)));
     sendSeenIfNeeded("mount").catch(() => {});
-    let ws: WebSocket | null = null;
-    let poll: number | null = null;
+    let socket: ResumableSocket | null = null;
+    let polling = false;
+    const abort = new AbortController();
 
-    const startPolling = () => {
-      if (poll) return;
-      poll = window.setInterval(() => refresh({ silent: true }).catch(() => {}), 5000);
+    const onEvent = (msg: TicketRealtimeEvent) => {
+      if (msg.type === "reply" && msg.ticket_id === ticketId && msg.reply?.id) {
+        lastReplyId.current = Math.max(lastReplyId.current ?? 0, msg.reply.id);
+        setTicket((prev) => {
+          if (!prev) return prev;
+          const exists = (prev.replies ?? []).some((r: any) => r.id === msg.reply.id);
+          if (exists) return prev;
+          return { ...prev, replies: [...(prev.replies ?? []), msg.reply] } as any;
+        });
+        sendSeenIfNeeded("update").catch(() => {});
+      }
+      if (msg.type === "typing" && msg.ticket_id === ticketId) {
+        const isStaff = Boolean(msg.author?.is_staff);
+        if (!isStaff) return;
+        if (msg.is_typing) {
+          setStaffTyping({ name: msg.author?.name || t("ticketDetail.staff"), at: Date.now() });
+        } else {
+          setStaffTyping(null);
+        }
+      }
     };
 
-    try {
-      ws = connectTicketWS(ticketId, "auth_token");
-      wsRef.current = ws;
-      if (ws) {
-        ws.onmessage = (ev) => {
+    // WS fallback: long-poll /wait/ (returns as soon as a reply arrives) instead of interval polling.
+    const startPolling = () => {
+      if (polling) return;
+      polling = true;
+      (async () => {
+        await refresh({ silent: true }).catch(() => {});
+        while (!abort.signal.aborted) {
           try {
-            const msg = JSON.parse(ev.data) as TicketRealtimeEvent;
-            if (msg.type === "reply" && msg.ticket_id === ticketId && msg.reply?.id) {
-              setTicket((prev) => {
-                if (!prev) return prev;
-                const exists = (prev.replies ?? []).some((r: any) => r.id === msg.reply.id);
-                if (exists) return prev;
-                return { ...prev, replies: [...(prev.replies ?? []), msg.reply] } as any;
-              });
-              sendSeenIfNeeded("update").catch(() => {});
-            }
-            if (msg.type === "typing" && msg.ticket_id === ticketId) {
-              const isStaff = Boolean(msg.author?.is_staff);
-              if (!isStaff) return;
-              if (msg.is_typing) {
-                setStaffTyping({ name: msg.author?.name || t("ticketDetail.staff"), at: Date.now() });
-              } else {
-                setStaffTyping(null);
-              }
-            }
+            const { events } = await waitTicketEvents(ticketId, lastReplyId.current, { signal: abort.signal });
+            events.forEach(onEvent);
           } catch {
-            // ignore
+            if (abort.signal.aborted) return;
+            await new Promise((resolve) => window.setTimeout(resolve, 5000));
+            await refresh({ silent: true }).catch(() => {});
           }
-        };
-        ws.onclose = () => startPolling();
-        ws.onerror = () => startPolling();
-      } else {
-        startPolling();
-      }
+        }
+      })();
+    };
+
+    try {
+      // Reconnects resume from the last `seq` (missed replies are replayed); long-polling is the last resort.
+      socket = resumableSocket((lastSeq) => connectTicketWS(ticketId, "auth_token", lastSeq), {
+        onMessage: (msg) => onEvent(msg as TicketRealtimeEvent),
+        onResync: () => refresh({ silent: true }).catch(() => {}),
+        onOpen: (ws) => {
+          wsRef.current = ws;
+        },
+        onGiveUp: startPolling,
+      });
     } catch {
       startPolling();
     }
 
     return () => {
-      if (ws) ws.close();
+      const ws = socket?.current() ?? null;
+      socket?.close();
       if (wsRef.current === ws) wsRef.current = null;
-      if (poll) window.clearInterval(poll);
+      abort.abort();
     };
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [ticketId, hasToken]);
@@ -15,7 +15,7 @@ import {
 } from "@mui/material";
 import { useEffect, useState } from "react";
 import { useNavigate } from "react-router-dom";
-import { listTickets } from "../api/support";
+import { getUnreadTickets, listTickets } from "../api/support";
 import type { Ticket } from "../api/types";
 import ChevronRightIcon from "@mui/icons-material/ChevronRight";
 import SearchIcon from "@mui/icons-material/Search";
@@ -39,6 +39,7 @@ export function TicketsPage() {
   const [finder, setFinder] = useState("");
   const [finderMsg, setFinderMsg] = useState<string | null>(null);
   const [page, setPage] = useState(1);
+  const [unreadIds, setUnreadIds] = useState<Set<number>>(new Set());
   const hasToken = Boolean(localStorage.getItem("auth_token"));
 
   const statusLabels = {
@@ -57,6 +58,11 @@ export function TicketsPage() {
         cancelled = true;
       };
     }
+    getUnreadTickets()
+      .then((res) => {
+        if (!cancelled) setUnreadIds(new Set(res.ticket_ids));
+      })
+      .catch(() => {});
     listTickets({ page, page_size: 10 })
       .then((res) => {
         if (cancelled) return;
@@ -215,6 +221,9 @@ export function TicketsPage() {
                   <Box sx={{ display: "flex", alignItems: "flex-start", gap: 2 }}>
                     <Box sx={{ minWidth: 0, flex: 1 }}>
                       <Box sx={{ display: "flex", gap: 1, alignItems: "center", flexWrap: "wrap", mb: 1 }}>
+                        {unreadIds.has(tk.id) ? (
+                          <Box sx={{ width: 8, height: 8, borderRadius: "50%", bgcolor: "primary.main", flexShrink: 0 }} />
+                        ) : null}
                         <Chip
                           size="small"
                           label={`#${tk.id}`}
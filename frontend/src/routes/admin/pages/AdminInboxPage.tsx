@@ -64,6 +64,8 @@ import {
   adminPatchCustomer,
   adminPatchInboxView,
   adminSetTicketMeta,
+  adminBulkAssignTickets,
+  adminBulkSetTicketTags,
   adminSetTicketStatus,
   adminBulkSetTicketStatus,
   adminStaffReplyWithFiles,
@@ -71,6 +73,7 @@ import {
   adminAiGenerateReply,
   adminCreateAiLibraryItem,
   adminAiEnhanceLibraryItem,
+  type AdminTicketRow,
 } from "../../../api/support";
 import { apiFetch } from "../../../api/client";
 import { AdminInboxSidebar, type InboxSidebarPreset } from "../components/AdminInboxSidebar";
@@ -80,7 +83,14 @@ import { useChatAutoScroll } from "../../../ui/chat/useChatAutoScroll";
 import { AttachmentPreview } from "../../../ui/chat/AttachmentPreview";
 import { useDropFiles } from "../../../ui/chat/useDropFiles";
 import { getSeenAt, markSeen } from "../../../ui/chat/seen";
-import { connectTicketWS, connectAdminInboxWS, sendTyping, type TicketRealtimeEvent } from "../../../api/realtime";
+import {
+  connectTicketWS,
+  connectAdminInboxWS,
+  resumableSocket,
+  sendTyping,
+  type ResumableSocket,
+  type TicketRealtimeEvent,
+} from "../../../api/realtime";
 import { loadTemplates, type ReplyTemplate } from "./AdminTemplatesPage";
 
 type InboxView = {
@@ -156,14 +166,49 @@ type AdminTicket = {
   reopened_at?: string | null;
 };
 
+// Row fields that inbox events and list refreshes keep current; they win over the loaded detail.
+const LIVE_ROW_FIELDS = [
+  "status",
+  "status_label",
+  "priority",
+  "assignee_id",
+  "team",
+  "tags",
+  "channel",
+  "last_message_at",
+  "last_user_message_at",
+  "last_staff_message_at",
+] as const;
+
+// inbox.ticket_created carries the full AdminTicketSerializer payload; the list keeps compact rows.
+function rowFromTicket(t: any): AdminTicketRow {
+  const replies: any[] = t.replies ?? [];
+  const last = replies.length ? replies[replies.length - 1] : null;
+  return {
+    ...t,
+    assignee_name: t.assignee_name ?? "",
+    entry_source: t.entry_source ?? "",
+    category_id: t.category?.id ?? null,
+    category_name: t.category?.name ?? "",
+    last_message_preview: String(last?.body ?? t.body ?? "").slice(0, 120),
+    last_message_at: last?.created_at ?? t.created_at,
+    last_user_message_at: t.created_at,
+    last_staff_message_at: null,
+    reply_count: replies.length,
+    is_unread: true,
+  };
+}
+
 export function AdminInboxPage() {
   const theme = useTheme();
   const isXl = useMediaQuery(theme.breakpoints.up("xl"));
   const isMd = useMediaQuery(theme.breakpoints.up("md"));
   const [navOpen, setNavOpen] = useState(false);
   const [searchParams, setSearchParams] = useSearchParams();
-  const [items, setItems] = useState<AdminTicket[] | null>(null);
+  const [items, setItems] = useState<AdminTicketRow[] | null>(null);
   const [activeId, setActiveId] = useState<number | null>(null);
+  // Full payload (replies/attachments) of the open ticket; the list itself holds compact rows.
+  const [detail, setDetail] = useState<AdminTicket | null>(null);
   const [q, setQ] = useState("");
 
   // resizable columns (xl only)
@@ -357,7 +402,7 @@ export function AdminInboxPage() {
   const activeRef = useRef<AdminTicket | null>(null);
   const activeIdRef = useRef<number | null>(null);
   const adminUserIdRef = useRef<number | null>(null);
-  const filteredRef = useRef<AdminTicket[] | null>(null);
+  const filteredRef = useRef<AdminTicketRow[] | null>(null);
 
   useEffect(() => {
     const handleKeyboardShortcuts = (e: KeyboardEvent) => {
@@ -428,16 +473,14 @@ export function AdminInboxPage() {
   }, []);
 
   useEffect(() => {
-    let ws: WebSocket | null = null;
-    let closed = false;
+    let socket: ResumableSocket | null = null;
     try {
-      ws = connectAdminInboxWS();
-      if (!ws) return;
-      ws.onmessage = (ev) => {
-        try {
-          const msg = JSON.parse(ev.data);
+      // Reconnects resume from the last `seq`; "resync" (too much missed) reloads the list.
+      socket = resumableSocket((lastSeq) => connectAdminInboxWS(lastSeq), {
+        onResync: () => refresh().catch(() => {}),
+        onMessage: (msg) => {
           if (msg.type === "ticket_created") {
-            const ticket = msg.ticket as AdminTicket;
+            const ticket = rowFromTicket(msg.ticket);
             setItems((prev) => {
               const base = prev ?? [];
               if (base.some(t => t.id === ticket.id)) return base;
@@ -451,30 +494,32 @@ export function AdminInboxPage() {
               if (!prev) return prev;
               return prev.map(t => t.id === ticket_id ? { ...t, ...delta } : t);
             });
+          } else if (msg.type === "tickets_updated") {
+            // Bulk actions: one message carrying every ticket's delta
+            const deltas = new Map<number, any>((msg.updates ?? []).map((u: any) => [u.ticket_id, u.delta]));
+            setItems((prev) => {
+              if (!prev) return prev;
+              return prev.map(t => deltas.has(t.id) ? { ...t, ...deltas.get(t.id) } : t);
+            });
           } else if (msg.type === "new_reply") {
             // 새 답변 알림 소리 재생 (고객 답변만)
             if (msg.author_type !== "staff") {
               playNotificationSound();
             }
           }
-        } catch {
-          // ignore
-        }
-      };
+        },
+      });
     } catch {
       // ignore
     }
-    return () => {
-      closed = true;
-      if (ws) ws.close();
-    };
+    return () => socket?.close();
   }, []);
 
   async function refresh() {
     setError(null);
     try {
       const res = await adminListTickets();
-      const data = res.results as unknown as AdminTicket[];
+      const data = res.results;
       setItems(data);
       // IMPORTANT: never override user's current selection due to stale-closure polling.
       // If current selection is missing (e.g. deleted), fall back to the first ticket.
@@ -511,15 +556,19 @@ export function AdminInboxPage() {
 
   useEffect(() => {
     if (!activeId) return;
-    let ws: WebSocket | null = null;
-    let closed = false;
+    let socket: ResumableSocket | null = null;
     try {
-      ws = connectTicketWS(activeId, "admin_token");
-      wsRef.current = ws;
-      if (!ws) return;
-      ws.onmessage = (ev) => {
-        try {
-          const msg = JSON.parse(ev.data) as TicketRealtimeEvent;
+      // Reconnects resume from the last `seq`; "resync" reloads the open ticket and the list.
+      socket = resumableSocket((lastSeq) => connectTicketWS(activeId, "admin_token", lastSeq), {
+        onResync: () => {
+          loadDetail(activeId).catch(() => {});
+          refresh().catch(() => {});
+        },
+        onOpen: (ws) => {
+          wsRef.current = ws;
+        },
+        onMessage: (raw) => {
+          const msg = raw as TicketRealtimeEvent;
           if (msg.type === "reply" && msg.ticket_id === activeId && msg.reply?.id) {
             // If user replied, refresh customer info to update cumulative spend/tags
             if (!msg.reply.author_is_staff && msg.reply.author_name !== "운영자" && active) {
@@ -527,31 +576,35 @@ export function AdminInboxPage() {
                 .then((c) => setCustomer(c))
                 .catch(() => {});
             }
-            setItems((prev) => {
-              if (!prev) return prev;
-              return prev.map((t) => {
-                if (t.id !== activeId) return t;
-                const exists = (t.replies ?? []).some((r: any) => r.id === msg.reply.id);
-                if (exists) return t;
-                return { ...t, replies: [...(t.replies ?? []), msg.reply] } as any;
-              });
+            setDetail((prev) => {
+              if (!prev || prev.id !== activeId) return prev;
+              if ((prev.replies ?? []).some((r) => r.id === msg.reply.id)) return prev;
+              return { ...prev, replies: [...(prev.replies ?? []), msg.reply] };
             });
-          } else if (msg.type === "reply" && msg.ticket_id && msg.reply?.id) {
-            // update list item if reply belongs to another ticket
+          }
+          if (msg.type === "reply" && msg.ticket_id && msg.reply?.id) {
+            // Row summary: preview, counters and last user/staff message times
+            const at = msg.reply.created_at;
+            const isStaff = Boolean(msg.reply.author_is_staff);
             setItems((prev) => {
               if (!prev) return prev;
               return prev.map((t) => {
-                if (t.id !== msg.ticket_id) return t;
-                const exists = (t.replies ?? []).some((r: any) => r.id === msg.reply.id);
-                if (exists) return t;
-                return { ...t, replies: [...(t.replies ?? []), msg.reply] } as any;
+                if (t.id !== msg.ticket_id || t.last_message_at >= at) return t;
+                return {
+                  ...t,
+                  last_message_preview: String(msg.reply.body ?? "").slice(0, 120),
+                  last_message_at: at,
+                  reply_count: t.reply_count + 1,
+                  ...(isStaff ? { last_staff_message_at: at } : { last_user_message_at: at }),
+                };
               });
             });
           }
           if (msg.type === "seen" && msg.ticket_id && msg.user_seen_at) {
+            setDetail((prev) => (prev && prev.id === msg.ticket_id ? { ...prev, user_seen_at: msg.user_seen_at } : prev));
             setItems((prev) => {
               if (!prev) return prev;
-              return prev.map((t) => (t.id === msg.ticket_id ? ({ ...t, user_seen_at: msg.user_seen_at } as any) : t));
+              return prev.map((t) => (t.id === msg.ticket_id ? { ...t, user_has_seen_latest_staff: true } : t));
             });
           }
           if (msg.type === "typing" && msg.ticket_id === activeId) {
@@ -561,19 +614,14 @@ export function AdminInboxPage() {
             if (msg.is_typing) setUserTyping({ name: msg.author?.name || "사용자", at: Date.now() });
             else setUserTyping(null);
           }
-        } catch {
-          // ignore
-        }
-      };
-      ws.onclose = () => {
-        if (closed) return;
-      };
+        },
+      });
     } catch {
       // ignore
     }
     return () => {
-      closed = true;
-      if (ws) ws.close();
+      const ws = socket?.current() ?? null;
+      socket?.close();
       if (wsRef.current === ws) wsRef.current = null;
     };
   }, [activeId]);
@@ -669,16 +717,16 @@ export function AdminInboxPage() {
       });
     apiFetch<any[]>("/admin/ticket-tags/", {}, "admin_token")
       .then((t) => {
-        // Flatten parent + children tags
+        // Flatten the tag tree; nested tags are named by their path ("결제/카드/VISA")
         const allTags: any[] = [];
-        (t ?? []).forEach((parent: any) => {
-          allTags.push({ id: parent.id, name: parent.name, color: parent.color, is_active: true, order: parent.order });
-          if (parent.children) {
-            parent.children.forEach((child: any) => {
-              allTags.push({ id: child.id, name: `${parent.name}/${child.name}`, color: child.color, is_active: true, order: child.order });
-            });
-          }
-        });
+        const walk = (nodes: any[], prefix: string) => {
+          nodes.forEach((tag: any) => {
+            const name = prefix ? `${prefix}/${tag.name}` : tag.name;
+            allTags.push({ id: tag.id, name, color: tag.color, is_active: true, order: tag.order });
+            if (tag.children) walk(tag.children, name);
+          });
+        };
+        walk(t ?? [], "");
         setPresetTags(allTags.sort((a, b) => (a.order ?? 0) - (b.order ?? 0) || a.id - b.id));
       })
       .catch(() => setPresetTags([]));
@@ -807,9 +855,7 @@ export function AdminInboxPage() {
     setBusy(true);
     setError(null);
     try {
-      for (const id of selectedIds) {
-        await adminSetTicketMeta(id, { assignee_id: agentId });
-      }
+      await adminBulkAssignTickets(selectedIds, agentId);
       setItems((prev) => {
         if (!prev) return prev;
         const set = new Set(selectedIds);
@@ -832,20 +878,10 @@ export function AdminInboxPage() {
     setBusy(true);
     setError(null);
     try {
-      for (const id of selectedIds) {
-        const ticket = items?.find((t) => t.id === id);
-        if (!ticket) continue;
-        // Use tags array - the backend expects tags: string[]
-        const existingTags: string[] = Array.isArray(ticket.tags) ? ticket.tags : [];
-        if (!existingTags.includes(tagName)) {
-          const newTags = [...existingTags, tagName];
-          await adminSetTicketMeta(id, { tags: newTags });
-        }
-      }
+      await adminBulkSetTicketTags(selectedIds, { add: [tagName] });
       // Refresh items - adminListTickets returns { results: [...] }
       const res = await adminListTickets();
-      const data = (res as any).results ?? res;
-      setItems(data as AdminTicket[]);
+      setItems(res.results);
       setSelectedIds([]);
       setSelectionMode(false);
     } catch (e: any) {
@@ -913,7 +949,15 @@ export function AdminInboxPage() {
     return new Date(Date.now() - ms).toLocaleDateString("ko-KR");
   };
 
-  function ticketTimes(t: AdminTicket) {
+  function ticketTimes(t: Pick<AdminTicket, "created_at"> & Partial<Pick<AdminTicket, "replies"> & AdminTicketRow>) {
+    // Rows carry the denormalized message times; a detail without its row falls back to its replies.
+    if (t.last_message_at) {
+      return {
+        lastUserAt: new Date(t.last_user_message_at || t.created_at).getTime(),
+        lastStaffAt: t.last_staff_message_at ? new Date(t.last_staff_message_at).getTime() : 0,
+        lastAnyAt: new Date(t.last_message_at).getTime(),
+      };
+    }
     let lastUserAt = new Date(t.created_at).getTime();
     let lastStaffAt = 0;
     let lastAnyAt = new Date(t.created_at).getTime();
@@ -926,8 +970,29 @@ export function AdminInboxPage() {
     return { lastUserAt, lastStaffAt, lastAnyAt };
   }
 
+  async function loadDetail(id: number) {
+    const t = (await adminGetTicket(id)) as AdminTicket;
+    setDetail((prev) => (activeIdRef.current === id || prev?.id === id ? t : prev));
+  }
+
+  useEffect(() => {
+    if (!activeId) {
+      setDetail(null);
+      return;
+    }
+    loadDetail(activeId).catch((e) => setError(String(e?.message ?? e)));
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [activeId]);
+
   // Keep the conversation open even if current ticket is filtered out of the list.
-  const active = useMemo(() => items?.find((t) => t.id === activeId) ?? null, [items, activeId]);
+  const active = useMemo(() => {
+    if (!detail || detail.id !== activeId) return null;
+    const row = items?.find((t) => t.id === activeId);
+    if (!row) return detail;
+    const live: Record<string, unknown> = {};
+    for (const k of LIVE_ROW_FIELDS) live[k] = row[k];
+    return { ...detail, ...live } as AdminTicket & Partial<AdminTicketRow>;
+  }, [detail, items, activeId]);
 
   // 키보드 단축키용 refs 업데이트
   useEffect(() => {
@@ -1059,7 +1124,7 @@ export function AdminInboxPage() {
         setReplyFiles([]);
         setAiGeneratedDraft("");
         setAiSource(null);
-        await refresh();
+        await Promise.all([refresh(), loadDetail(active.id)]);
         setSnackMsg("메시지 전송 완료");
         // 메시지 전송 후 해당 티켓을 리스트 최상단으로 이동
         setItems((prev) => {
@@ -1693,11 +1758,7 @@ export function AdminInboxPage() {
                 {filtered && (() => {
                   const unreadCount = filtered.filter((t) => {
                     const seenAt = getSeenAt(t.id);
-                    let lastAnyAt = new Date(t.created_at).toISOString();
-                    for (const r of t.replies ?? []) {
-                      if (new Date(r.created_at).toISOString() > lastAnyAt) lastAnyAt = new Date(r.created_at).toISOString();
-                    }
-                    return !seenAt || new Date(lastAnyAt).getTime() > new Date(seenAt).getTime();
+                    return !seenAt || ticketTimes(t).lastAnyAt > new Date(seenAt).getTime();
                   }).length;
                   return unreadCount > 0 ? (
                     <Chip
@@ -1908,7 +1969,7 @@ export function AdminInboxPage() {
             filtered.map((t) => {
               const selected = t.id === activeId;
               const isChecked = selectedIds.includes(t.id);
-              const last = t.replies && t.replies.length ? t.replies[t.replies.length - 1]?.body : t.body;
+              const last = t.last_message_preview;
               const pri = (t.priority || "NORMAL").toUpperCase();
               const priColor =
                 pri === "URGENT"
@@ -1918,30 +1979,13 @@ export function AdminInboxPage() {
                   : pri === "LOW"
                   ? "#64748B"
                   : "rgba(255,255,255,0.7)";
-              const lastUserAt = (() => {
-                let ts = new Date(t.created_at).getTime();
-                for (const r of t.replies ?? []) {
-                  if (r.author_name !== "운영자") ts = Math.max(ts, new Date(r.created_at).getTime());
-                }
-                return ts;
-              })();
-              const lastStaffAt = (() => {
-                let ts = 0;
-                for (const r of t.replies ?? []) {
-                  if (r.author_name === "운영자") ts = Math.max(ts, new Date(r.created_at).getTime());
-                }
-                return ts;
-              })();
+              const times = ticketTimes(t);
+              const lastUserAt = times.lastUserAt;
+              const lastStaffAt = times.lastStaffAt;
               const seenAt = getSeenAt(t.id);
-              const lastAnyAt = (() => {
-                let ts = new Date(t.created_at).toISOString();
-                for (const r of t.replies ?? []) {
-                  if (new Date(r.created_at).toISOString() > ts) ts = new Date(r.created_at).toISOString();
-                }
-                return ts;
-              })();
+              const lastAnyAt = new Date(times.lastAnyAt).toISOString();
               const isUnread = !seenAt || new Date(lastAnyAt).getTime() > new Date(seenAt).getTime();
-              const tag = t.category?.name ?? "문의";
+              const tag = t.category_name || "문의";
               // 상담 태그 (첫번째만)
               const ticketTag = (t.tags && t.tags.length > 0) ? String(t.tags[0]) : null;
               const ticketTagColor = ticketTag ? (presetTags.find((pt) => pt.name === ticketTag)?.color || "") : "";